@@ -0,0 +1,35 @@
+"""hot path indexes
+
+Board columns filter on (project_id, status) ordered by order, the
+dashboard scans open tasks by due_date and the hierarchy CTE joins on
+parent_task_id. Plain project_id and owner_id lookups are served by the
+leading columns of ix_tasks_project_order / ix_tasks_project_status_order
+and ix_projects_owner_created.
+
+Revision ID: 0958674558cf
+Revises: b9eb674eec20
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0958674558cf'
+down_revision = 'b9eb674eec20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_project_status_order', 'tasks', ['project_id', 'status', 'order']
+    )
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'])
+    op.create_index('ix_tasks_parent_task_id', 'tasks', ['parent_task_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_parent_task_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_project_status_order', table_name='tasks')
@@ -0,0 +1,28 @@
+"""avatar digest
+
+Avatars moved to the content-addressed blob store; users keep the digest
+of theirs.
+
+Revision ID: 2d7f4c1a9e30
+Revises: 355bf503ba4d
+Create Date: 2026-10-18 09:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7f4c1a9e30'
+down_revision = '355bf503ba4d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('avatar_digest', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('avatar_digest')
@@ -0,0 +1,83 @@
+"""baseline
+
+Tables as originally created by Base.metadata.create_all. Databases that
+were set up that way should be stamped with this revision
+(``alembic stamp 355bf503ba4d``) and then upgraded.
+
+Revision ID: 355bf503ba4d
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = '355bf503ba4d'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+task_status = sa.Enum('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus')
+task_priority = sa.Enum('LOW', 'MEDIUM', 'HIGH', 'URGENT', name='taskpriority')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('bio', sa.String(), nullable=True),
+        sa.Column('profile_picture', sa.LargeBinary(), nullable=True),
+        sa.Column('profile_picture_type', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'projects',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('deadline', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('owner_id', GUID(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'tasks',
+        sa.Column('id', GUID(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', task_status, nullable=True),
+        sa.Column('priority', task_priority, nullable=True),
+        sa.Column('due_date', sa.Date(), nullable=True),
+        sa.Column('order', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('project_id', GUID(), nullable=True),
+        sa.Column('parent_task_id', GUID(), nullable=True),
+        sa.ForeignKeyConstraint(['parent_task_id'], ['tasks.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tasks')
+    op.drop_table('projects')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    task_priority.drop(op.get_bind(), checkfirst=True)
+    task_status.drop(op.get_bind(), checkfirst=True)
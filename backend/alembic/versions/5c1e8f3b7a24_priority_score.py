@@ -0,0 +1,33 @@
+"""stored priority score
+
+Revision ID: 5c1e8f3b7a24
+Revises: 2d7f4c1a9e30
+Create Date: 2026-10-18 09:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e8f3b7a24'
+down_revision = '2d7f4c1a9e30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stored priority score; app/jobs/priority_scores.py refreshes it daily
+    op.add_column(
+        'tasks',
+        sa.Column('priority_score', sa.Float(), server_default='0', nullable=False),
+    )
+    op.create_index(
+        'ix_tasks_priority_score_status', 'tasks', ['priority_score', 'status']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_priority_score_status', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('priority_score')
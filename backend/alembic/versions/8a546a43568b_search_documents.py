@@ -0,0 +1,117 @@
+"""search documents and text index
+
+search_documents holds the searchable text of every task and project.
+The text index over it depends on the dialect:
+
+* SQLite: an external-content FTS5 table ``search_index`` kept current by
+  triggers, ranked by bm25 with titles weighted 10x, and with the owner as
+  an indexed column so a MATCH can be scoped to one user.
+* PostgreSQL: a generated ``document`` tsvector column (title weight A,
+  body weight B) with a GIN index.
+
+Existing rows are backfilled from tasks and projects.
+
+Revision ID: 8a546a43568b
+Revises: 0958674558cf
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = '8a546a43568b'
+down_revision = '0958674558cf'
+branch_labels = None
+depends_on = None
+
+SQLITE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        title, body, owner_id,
+        content='search_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO search_index(search_index, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    """
+    CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_index(rowid, title, body, owner_id)
+        VALUES (new.id, new.title, new.body, new.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_index(search_index, rowid, title, body, owner_id)
+        VALUES ('delete', old.id, old.title, old.body, old.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_index(search_index, rowid, title, body, owner_id)
+        VALUES ('delete', old.id, old.title, old.body, old.owner_id);
+        INSERT INTO search_index(rowid, title, body, owner_id)
+        VALUES (new.id, new.title, new.body, new.owner_id);
+    END
+    """,
+]
+
+POSTGRESQL_INDEX = [
+    """
+    ALTER TABLE search_documents ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_search_documents_document ON search_documents USING gin (document)",
+]
+
+BACKFILL = [
+    """
+    INSERT INTO search_documents (kind, ref_id, owner_id, project_id, title, body)
+    SELECT 'project', id, owner_id, id, name, description
+    FROM projects WHERE owner_id IS NOT NULL
+    """,
+    """
+    INSERT INTO search_documents (kind, ref_id, owner_id, project_id, title, body)
+    SELECT 'task', tasks.id, projects.owner_id, tasks.project_id, tasks.title, tasks.description
+    FROM tasks JOIN projects ON projects.id = tasks.project_id
+    WHERE projects.owner_id IS NOT NULL
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_documents',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('ref_id', GUID(), nullable=False),
+        sa.Column('owner_id', GUID(), nullable=False),
+        sa.Column('project_id', GUID(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('ref_id'),
+    )
+    op.create_index('ix_search_documents_owner_id', 'search_documents', ['owner_id'])
+    op.create_index('ix_search_documents_project_id', 'search_documents', ['project_id'])
+
+    dialect = op.get_bind().dialect.name
+    statements = POSTGRESQL_INDEX if dialect == 'postgresql' else SQLITE_INDEX
+    for statement in statements + BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for trigger in ('search_documents_au', 'search_documents_ad', 'search_documents_ai'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS search_index")
+    op.drop_index('ix_search_documents_project_id', table_name='search_documents')
+    op.drop_index('ix_search_documents_owner_id', table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,53 @@
+"""task owner and owner-scoped priority index
+
+The prioritized task list filtered on the project's owner through a
+join, so the global (priority_score, status) index could not serve its
+ORDER BY ... LIMIT. Tasks now carry their owner, and a partial index
+over open tasks orders each owner's by score.
+
+Revision ID: a6d4e2f8c915
+Revises: f3c8d1a6b2e7
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d4e2f8c915'
+down_revision = 'f3c8d1a6b2e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('owner_id', GUID(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_tasks_owner_id_users', 'users', ['owner_id'], ['id'], ondelete='CASCADE'
+        )
+    op.execute(
+        "UPDATE tasks SET owner_id = "
+        "(SELECT projects.owner_id FROM projects WHERE projects.id = tasks.project_id)"
+    )
+    op.drop_index('ix_tasks_priority_score_status', table_name='tasks')
+    op.create_index(
+        'ix_tasks_owner_open_priority',
+        'tasks',
+        ['owner_id', 'priority_score'],
+        sqlite_where=sa.text("status != 'DONE'"),
+        postgresql_where=sa.text("status != 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_owner_open_priority', table_name='tasks')
+    op.create_index(
+        'ix_tasks_priority_score_status', 'tasks', ['priority_score', 'status']
+    )
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_constraint('fk_tasks_owner_id_users', type_='foreignkey')
+        batch_op.drop_column('owner_id')
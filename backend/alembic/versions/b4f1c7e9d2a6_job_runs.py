@@ -0,0 +1,34 @@
+"""job runs
+
+Scheduled jobs claim each day's run with a row here rather than a Redis
+key, so a day's run happens once with or without Redis and workers that
+start later that day don't repeat it.
+
+Revision ID: b4f1c7e9d2a6
+Revises: a6d4e2f8c915
+Create Date: 2026-10-18 16:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f1c7e9d2a6'
+down_revision = 'a6d4e2f8c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_runs',
+        sa.Column('job', sa.String(length=64), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('job', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_runs')
@@ -0,0 +1,31 @@
+"""listing indexes
+
+Keyset pagination of task and project listings.
+
+Revision ID: b9eb674eec20
+Revises: 5c1e8f3b7a24
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9eb674eec20'
+down_revision = '5c1e8f3b7a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_project_order', 'tasks', ['project_id', 'order', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_projects_owner_created', 'projects', ['owner_id', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_owner_created', table_name='projects')
+    op.drop_index('ix_tasks_project_order', table_name='tasks')
@@ -0,0 +1,38 @@
+"""owner open due index
+
+The dashboard's upcoming tasks (an owner's open tasks due up to a date,
+by due date) joined through projects, so ix_tasks_due_date went unused:
+SQLite read the owner's tasks through the project indexes and sorted
+them. The query now filters on tasks.owner_id, and a partial index over
+open tasks serves it as one range in due date order.
+
+Revision ID: c2f9a7d4e816
+Revises: d8e3f5a1c7b4
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f9a7d4e816'
+down_revision = 'd8e3f5a1c7b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+    op.create_index(
+        'ix_tasks_owner_open_due',
+        'tasks',
+        ['owner_id', 'due_date'],
+        sqlite_where=sa.text("status != 'DONE'"),
+        postgresql_where=sa.text("status != 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_owner_open_due', table_name='tasks')
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'])
@@ -0,0 +1,52 @@
+"""task completion time and daily task stats
+
+Adds tasks.completed_at and the per-user daily counters behind
+/dashboard/analytics. Tasks already done get their last update (or
+creation) time as completion time.
+
+The counters start empty; fill them after upgrading with
+``python -m app.jobs.analytics_rollup``.
+
+Revision ID: c41f7d2e9a10
+Revises: 8a546a43568b
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f7d2e9a10'
+down_revision = '8a546a43568b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE tasks SET completed_at = COALESCE(updated_at, created_at) "
+        "WHERE status = 'DONE'"
+    )
+
+    op.create_table(
+        'task_daily_stats',
+        sa.Column('owner_id', GUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('created', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_low', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_medium', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_high', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_urgent', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('owner_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_daily_stats')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('completed_at')
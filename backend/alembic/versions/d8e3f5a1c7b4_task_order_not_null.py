@@ -0,0 +1,37 @@
+"""task order not null
+
+Keyset cursors compare (order, created_at, id) as a row value, which
+never matches a row whose order is NULL, so such tasks dropped out of
+paged listings. NULL ranks become 0, the default.
+
+Revision ID: d8e3f5a1c7b4
+Revises: b4f1c7e9d2a6
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e3f5a1c7b4'
+down_revision = 'b4f1c7e9d2a6'
+branch_labels = None
+depends_on = None
+
+tasks = sa.table('tasks', sa.column('order', sa.Integer()))
+
+
+def upgrade() -> None:
+    op.execute(tasks.update().where(tasks.c.order.is_(None)).values(order=0))
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column(
+            'order', existing_type=sa.Integer(), nullable=False, server_default='0'
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column(
+            'order', existing_type=sa.Integer(), nullable=True, server_default=None
+        )
@@ -0,0 +1,48 @@
+"""change counters for conditional requests
+
+projects.version/changed_at and users.data_version/data_changed_at are
+bumped by every write to a project's (or user's) projects and tasks, and
+serve as ETag and Last-Modified validators.
+
+Revision ID: e7b2a9c4d5f3
+Revises: c41f7d2e9a10
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2a9c4d5f3'
+down_revision = 'c41f7d2e9a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Batch mode: SQLite can only add a column defaulting to CURRENT_TIMESTAMP
+    # by rebuilding the table
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(
+            sa.Column('version', sa.Integer(), server_default='0', nullable=False)
+        )
+        batch_op.add_column(
+            sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True)
+        )
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(
+            sa.Column('data_version', sa.Integer(), server_default='0', nullable=False)
+        )
+        batch_op.add_column(
+            sa.Column('data_changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('data_changed_at')
+        batch_op.drop_column('data_version')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('changed_at')
+        batch_op.drop_column('version')
@@ -6,16 +6,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.principal_cache import principal_cache
 from app.crud import user as user_crud
 from app.models.user import User
 from app.schemas.token import TokenPayload
+from app.schemas.user import Principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> Principal:
+    """
+    Resolve the bearer token to a principal, hitting the database only on a
+    principal cache miss.
+    """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         token_data = TokenPayload(**payload)
@@ -26,7 +32,11 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await user_crud.user.get(db, id=token_data.sub)
+    user = await principal_cache.get(token_data.sub)
+    if not user:
+        user = await user_crud.user.get_principal(db, id=token_data.sub)
+        if user:
+            await principal_cache.set(user)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,10 +53,27 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_current_user_record(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Load the full user row for endpoints that read or modify the profile.
+    """
+    user = await user_crud.user.get(db, id=current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
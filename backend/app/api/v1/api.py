@@ -7,6 +7,7 @@ from app.api.v1.endpoints import (
     dashboard, 
     profile, 
     settings, 
+    search,
     task_prioritization
 )
 
@@ -19,6 +20,7 @@ api_router.include_router(settings.router, prefix="/settings", tags=["settings"]
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
 
 # Add task prioritization with a unique prefix or tag
 api_router.include_router(task_prioritization.router, prefix="/tasks/prioritize", tags=["task_prioritization"])
\ No newline at end of file
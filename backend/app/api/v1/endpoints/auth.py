@@ -1,12 +1,11 @@
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
-from app.core.rate_limiting import ip_limiter, user_limiter
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from app.core.rate_limiting import ip_limiter
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user_record
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import create_access_token, verify_reset_token
@@ -42,7 +41,7 @@ async def create_user(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-@user_limiter.limit("2/minute")
+@ip_limiter.limit("2/minute")
 async def login_access_token(
     request: Request, 
     db: AsyncSession = Depends(get_db), 
@@ -63,7 +62,7 @@ async def login_access_token(
 
 @router.get("/me", response_model=UserSchema)
 def read_users_me(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ) -> Any:
     """
     Get current user.
@@ -72,15 +71,14 @@ def read_users_me(
 
 
 @router.post("/forgot-password")
-def forgot_password(
+async def forgot_password(
     request: PasswordResetRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Send a password reset email to the user.
     """
-    user = user_crud.user.get_by_email(db, email=request.email)
+    user = await user_crud.user.get_by_email(db, email=request.email)
     if not user:
         # Return a 200 even if user doesn't exist for security reasons
         return {"message": "If the email exists in our system, a password reset link has been sent."}
@@ -91,10 +89,10 @@ def forgot_password(
         user.id, expires_delta=reset_token_expires, reset_password=True
     )
     
-    # Send email with reset link
+    # Queue email with reset link; it's in the outbox once this returns
     reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-    background_tasks.add_task(
-        send_reset_password_email, 
+    await send_reset_password_email(
+        db,
         email_to=user.email,
         username=user.name,
         reset_url=reset_url
@@ -104,12 +102,12 @@ def forgot_password(
 
 
 @router.post("/reset-password")
-@user_limiter.limit("1/minute")
-def reset_password(
+@ip_limiter.limit("1/minute")
+async def reset_password(
     request: Request,
     token: str,
     new_password: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Reset the user's password using the reset token.
@@ -123,13 +121,13 @@ def reset_password(
         )
     
     # Update user's password
-    user = user_crud.user.get(db, id=user_id)
+    user = await user_crud.user.get(db, id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
-    user_crud.user.update_password(db, user=user, new_password=new_password)
+    await user_crud.user.update_password(db, user=user, new_password=new_password)
     
     return {"message": "Password has been reset successfully"}
\ No newline at end of file
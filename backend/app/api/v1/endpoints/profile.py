@@ -1,77 +1,149 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
+import uuid
+from typing import Optional
 
-from app.api.deps import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user_record
+from app.core.config import settings
 from app.core.database import get_db
 from app.crud import user as user_crud
 from app.models.user import User
 from app.schemas.user import UserOut, UserProfileUpdate
+from app.utils.blob_store import (
+    AVATAR_VARIANTS,
+    VARIANT_MEDIA_TYPE,
+    BlobTooLarge,
+    ImageTooLarge,
+    avatar_store,
+)
 
 router = APIRouter()
 
+# Avatar URLs carry the digest, so a matching ?v= can be cached for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def _profile_out(user: User) -> UserOut:
+    profile = UserOut.model_validate(user)
+    if user.avatar_digest:
+        profile.profile_picture_url = (
+            f"{settings.API_V1_STR}/profile/picture/{user.id}?v={user.avatar_digest}"
+        )
+    return profile
+
+
 @router.get("", response_model=UserOut)
-def get_user_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def get_user_profile(
+    current_user: User = Depends(get_current_user_record),
 ):
     """Get current user profile"""
-    db_user = user_crud.user.get(db, id=current_user.id)
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Generate profile picture URL if exists
-    profile_data = db_user.__dict__
-    if db_user.profile_picture:
-        profile_data["profile_picture_url"] = f"/api/v1/profile/picture/{db_user.id}"
-    return profile_data
+    return _profile_out(current_user)
 
 @router.put("", response_model=UserOut)
-def update_user_profile(
+async def update_user_profile(
     profile_update: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_record),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update user profile information"""
     update_data = profile_update.dict(exclude_unset=True)
-    
-    if update_data.get("remove_picture"):
+    # Pictures only arrive through POST /picture
+    update_data.pop("profile_picture", None)
+
+    if update_data.pop("remove_picture", False):
         update_data["profile_picture"] = None
         update_data["profile_picture_type"] = None
-    
-    db_user = user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
-    return db_user
+        update_data["avatar_digest"] = None
+
+    db_user = await user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
+    return _profile_out(db_user)
 
 @router.post("/picture", response_model=UserOut)
 async def upload_profile_picture(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_record),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Upload profile picture"""
-    if not file.content_type.startswith("image/"):
+    """Upload profile picture, streaming it into the avatar store"""
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
-    
-    contents = await file.read()
+
+    try:
+        digest = await run_in_threadpool(
+            avatar_store.save_stream, file.file, settings.AVATAR_MAX_BYTES
+        )
+    except BlobTooLarge:
+        raise HTTPException(status_code=413, detail="Image is too large")
+    try:
+        await run_in_threadpool(
+            avatar_store.make_variants, digest, AVATAR_VARIANTS, settings.AVATAR_MAX_PIXELS
+        )
+    except ImageTooLarge:
+        raise HTTPException(status_code=400, detail="Image dimensions are too large")
+
     update_data = {
-        "profile_picture": contents,
-        "profile_picture_type": file.content_type
+        "avatar_digest": digest,
+        "profile_picture": None,
+        "profile_picture_type": file.content_type,
     }
-    
-    db_user = user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
-    return db_user
+    db_user = await user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
+    return _profile_out(db_user)
 
 @router.get("/picture/{user_id}")
-def get_profile_picture(
-    user_id: str,
-    db: Session = Depends(get_db),
+async def get_profile_picture(
+    user_id: uuid.UUID,
+    request: Request,
+    size: str = Query("original"),
+    v: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get user profile picture"""
-    user = user_crud.user.get(db, id=user_id)
-    if not user or not user.profile_picture:
+    """Get user profile picture, honouring If-None-Match"""
+    if size != "original" and size not in AVATAR_VARIANTS:
+        raise HTTPException(status_code=400, detail="Unknown picture size")
+
+    avatar = await user_crud.user.get_avatar(db, id=user_id)
+    if not avatar:
+        raise HTTPException(status_code=404, detail="Profile picture not found")
+    digest, media_type = avatar.avatar_digest, avatar.profile_picture_type
+    if not digest:
+        digest = await user_crud.user.move_legacy_picture(db, id=user_id)
+        if not digest:
+            raise HTTPException(status_code=404, detail="Profile picture not found")
+
+    if not avatar_store.exists(digest):
         raise HTTPException(status_code=404, detail="Profile picture not found")
-    
-    return Response(
-        content=user.profile_picture,
-        media_type=user.profile_picture_type or "image/jpeg"
-    )
\ No newline at end of file
+    if size != "original":
+        if not avatar_store.exists(digest, size):
+            try:
+                await run_in_threadpool(
+                    avatar_store.make_variants,
+                    digest,
+                    {size: AVATAR_VARIANTS[size]},
+                    settings.AVATAR_MAX_PIXELS,
+                )
+            except ImageTooLarge:
+                # A picture stored before the cap; serve it as it is
+                pass
+        if avatar_store.exists(digest, size):
+            media_type = VARIANT_MEDIA_TYPE
+        else:
+            size = "original"
+
+    etag = f'"{digest}-{size}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if v == digest else REVALIDATE_CACHE_CONTROL,
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match == "*":
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        avatar_store.path(digest, size),
+        media_type=media_type or "image/jpeg",
+        headers=headers,
+    )
@@ -1,31 +1,49 @@
-from typing import Any, List
+import uuid
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from app.core.rate_limiting import ip_limiter
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.rate_limiting import user_limiter
+from app.core.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.crud.project import project_crud
-from app.models.user import User
+from app.crud.project import SORT_KEYS, project_crud
+from app.crud.task import HIERARCHY_MAX_DEPTH, task_crud
+from app.crud.versions import versions_crud
+from app.schemas.user import Principal
 from app.schemas.project import (
     Project,
     ProjectCreate,
     ProjectUpdate,
     ProjectWithTaskCount,
 )
+from app.services.change_stream import (
+    EVENT_STREAM_HEADERS,
+    EVENT_STREAM_MEDIA_TYPE,
+    stream_changes,
+)
+from app.services.task_export import EXPORT_MEDIA_TYPES, export_tasks
+from app.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.utils.pagination import NEXT_CURSOR_HEADER, InvalidCursor, split_page
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Project)
-@ip_limiter.limit("20/hour")
+@user_limiter.limit("20/hour")
 async def create_project(
     *,
     project_in: ProjectCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Create new project.
@@ -38,33 +56,154 @@ async def create_project(
 
 @router.get("/", response_model=List[ProjectWithTaskCount])
 async def read_projects(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
 ) -> Any:
     """
     Retrieve projects with task counts.
+    
+    Projects are ordered by (created_at, id). When more remain, the
+    X-Next-Cursor header holds the cursor for the next page; ``skip`` is
+    ignored once a cursor is given. Answers If-None-Match with 304 when
+    nothing changed; If-Modified-Since is ignored, as the ETag is sent.
     """
-    projects = await project_crud.get_projects_with_task_counts(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    version, changed_at = await versions_crud.get_owner(db, owner_id=current_user.id)
+    headers = validator_headers(
+        make_etag("projects", current_user.id, version, request.url.query), changed_at
     )
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    # One extra row tells whether another page follows
+    try:
+        projects = await project_crud.get_projects_with_task_counts(
+            db=db, owner_id=current_user.id, skip=skip, limit=limit + 1, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    projects, next_cursor = split_page(projects, limit, SORT_KEYS)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    # Important: Make sure each project dict matches your ProjectWithTaskCount schema
-    # Note that in your schema, you have "total_tasks" and "completed_tasks" fields
-    # which need to be present in each project dict
-    return projects
+    # Rows already have the ProjectWithTaskCount fields, in order
+    return ORJSONResponse(projects, headers=headers)
+
+
+@router.get("/changes")
+async def stream_project_changes(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Server-sent events for changes to any of the user's projects and tasks.
+
+    Each ``data`` line is a JSON event such as ``{"type": "task.updated",
+    "project_id": ..., "task_ids": [...]}``; ``resync`` means events were
+    lost and everything shown should be refetched.
+    """
+    # The stream outlives the request's dependencies; give the connection back
+    await db.close()
+    return StreamingResponse(
+        stream_changes(current_user.id),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers=EVENT_STREAM_HEADERS,
+    )
 
 
 @router.get("/{project_id}", response_model=Project)
 async def read_project(
     *,
     project_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
-    Get project by ID.
+    Get project by ID, answering conditional requests with 304.
+    """
+    validators = await versions_crud.get_project(db, project_id=project_id)
+    if not validators:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    if validators.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    headers = validator_headers(
+        make_etag("project", project_id, validators.version), validators.changed_at
+    )
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    project = await project_crud.get(db=db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    response.headers.update(headers)
+    return project
+
+
+@router.get("/{project_id}/changes")
+async def stream_task_changes(
+    *,
+    project_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Server-sent events for changes to one project and its tasks.
+
+    Access is checked once, when the stream opens. The stream ends after a
+    ``project.deleted`` event.
+    """
+    validators = await versions_crud.get_project(db, project_id=project_id)
+    if not validators:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    if validators.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+
+    # The stream outlives the request's dependencies; give the connection back
+    await db.close()
+    return StreamingResponse(
+        stream_changes(current_user.id, project_id),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers=EVENT_STREAM_HEADERS,
+    )
+
+
+@router.get("/{project_id}/export")
+@user_limiter.limit("30/hour")
+async def export_project_tasks(
+    *,
+    project_id: uuid.UUID,
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    root_task_id: Optional[uuid.UUID] = Query(None),
+    max_depth: Optional[int] = Query(None, ge=0, le=HIERARCHY_MAX_DEPTH),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Stream a project's tasks as NDJSON or CSV.
+
+    Pass ``root_task_id`` to export only that task and its subtasks, parents
+    first, with each row's ``depth``. The body is gzipped when the client
+    sends ``Accept-Encoding: gzip``.
     """
     project = await project_crud.get(db=db, id=project_id)
     if not project:
@@ -75,18 +214,44 @@ async def read_project(
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
-    return project
+    if root_task_id:
+        root = await task_crud.get(db=db, id=root_task_id)
+        if not root or root.project_id != project.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+
+    accepted = request.headers.get("accept-encoding", "")
+    compress = "gzip" in [e.split(";")[0].strip() for e in accepted.split(",")]
+    headers = {
+        "Content-Disposition": f'attachment; filename="project-{project_id}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_tasks(
+            project_id,
+            fmt=format,
+            root_task_id=root_task_id,
+            max_depth=max_depth,
+            compress=compress,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
 
 
 @router.put("/{project_id}", response_model=Project)
-@ip_limiter.limit("20/hour")
+@user_limiter.limit("20/hour")
 async def update_project(
     *,
     project_id: str,
     project_in: ProjectUpdate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Update a project.
@@ -109,7 +274,7 @@ async def delete_project(
     *,
     project_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Delete a project.
@@ -0,0 +1,31 @@
+from typing import Any, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.database import get_db
+from app.crud.search import search_crud
+from app.schemas.search import SearchResult
+from app.schemas.user import Principal
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[Literal["task", "project"]] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Search the current user's task and project titles and descriptions.
+
+    Results are ranked by relevance, best first.
+    """
+    return await search_crud.search(
+        db, owner_id=current_user.id, q=q, kind=kind, skip=skip, limit=limit
+    )
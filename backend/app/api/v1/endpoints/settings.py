@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user_record
 from app.core.database import get_db
 from app.crud import user as user_crud
 from app.models.user import User
@@ -10,9 +10,9 @@ from app.schemas.user import UserOut, UserUpdate  # Changed from User to UserOut
 router = APIRouter()
 
 @router.put("/account", response_model=UserOut)  # Changed response_model
-def update_account_settings(
+async def update_account_settings(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db),
 ):
     """Update account settings (email, password)"""
@@ -26,7 +26,7 @@ def update_account_settings(
                 detail="Current password is required to change password"
             )
         
-        if not user_crud.user.authenticate(
+        if not await user_crud.user.authenticate(
             db, email=current_user.email, password=user_update.current_password
         ):
             raise HTTPException(
@@ -34,12 +34,12 @@ def update_account_settings(
                 detail="Current password is incorrect"
             )
     
-    db_user = user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
+    db_user = await user_crud.user.update(db, db_obj=current_user, obj_in=update_data)
     return db_user
 
 @router.put("/notifications", response_model=dict)
 def update_notification_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db),
 ):
     """Update notification settings"""
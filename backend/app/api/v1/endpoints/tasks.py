@@ -1,29 +1,48 @@
 # app/api/v1/endpoints/tasks.py
-from typing import Any, List, Optional
+import uuid
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi import APIRouter, Depends, File, HTTPException, Query, status, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
 # Fix the imports to avoid circular references
-from app.crud.task import task_crud
+from app.crud.task import HIERARCHY_MAX_DEPTH, SORT_KEYS, NeighbourNotInColumn, task_crud
 from app.crud.project import project_crud
-from app.models.user import User
-from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskWithSubtasks
+from app.crud.versions import versions_crud
+from app.schemas.user import Principal
+from app.schemas.task import (
+    Task,
+    TaskCreate,
+    TaskImportResult,
+    TaskMove,
+    TaskReorder,
+    TaskUpdate,
+    TaskWithSubtasks,
+)
 from datetime import datetime
-from app.core.rate_limiting import ip_limiter
+from app.core.rate_limiting import user_limiter
+from app.core.responses import ORJSONResponse
+from app.services.task_import import ImportFormatError, TaskImporter, detect_format
+from app.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.utils.pagination import NEXT_CURSOR_HEADER, InvalidCursor, split_page
 
 router = APIRouter()
 
 @router.post("/", response_model=Task)
-@ip_limiter.limit("100/day")
+@user_limiter.limit("100/day")
 async def create_task(
     *,
     task_in: TaskCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Create new task with cache management.
@@ -51,20 +70,62 @@ async def create_task(
     return task
 
 
+@router.post("/import", response_model=TaskImportResult)
+@user_limiter.limit("10/hour")
+async def import_tasks(
+    *,
+    request: Request,
+    file: UploadFile = File(...),
+    project_id: Optional[uuid.UUID] = Query(None),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Bulk-create tasks from a CSV or NDJSON upload.
+
+    Records take the fields of a task; ``project_id`` fills in those that
+    omit theirs. A record may carry a ``ref`` that later records use as
+    their ``parent_task_id``. Invalid records are skipped and listed in the
+    response; everything else is imported.
+    """
+    try:
+        fmt = format or detect_format(file.filename, file.content_type)
+    except ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    importer = TaskImporter(
+        db, owner_id=current_user.id, default_project_id=project_id
+    )
+    return await importer.run(file.file, fmt)
+
+
 @router.get("/", response_model=List[Task])
 async def read_tasks(
-    project_id: Optional[str] = Query(None),
+    request: Request,
+    project_id: Optional[uuid.UUID] = Query(None),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
 ) -> Any:
     """
     Retrieve tasks with built-in caching.
+    
+    Tasks are ordered by (order, created_at, id). When more remain, the
+    X-Next-Cursor header holds the cursor for the next page; ``skip`` is
+    ignored once a cursor is given. Answers If-None-Match with 304 when
+    nothing changed; If-Modified-Since is ignored, as the ETag is sent.
+
+    Rows are sent as selected, without a second pass through the schema.
     """
     if project_id:
         # Check if project belongs to the user
-        project = await project_crud.get(db=db, id=project_id)
+        project = await versions_crud.get_project(db, project_id=project_id)
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, 
@@ -75,27 +136,56 @@ async def read_tasks(
                 status_code=status.HTTP_403_FORBIDDEN, 
                 detail="Not enough permissions"
             )
-        
-        # Uses cached method from CRUD layer
-        tasks = await task_crud.get_multi_by_project(
-            db=db, project_id=project_id, skip=skip, limit=limit
-        )
+        version, changed_at = project.version, project.changed_at
     else:
-        # Get all tasks for the user across all projects
-        tasks = await task_crud.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
+        version, changed_at = await versions_crud.get_owner(db, owner_id=current_user.id)
+
+    # Validators are read before the data, so a racing write can only make
+    # the next request miss, never pin a stale copy
+    headers = validator_headers(
+        make_etag("tasks", project_id or current_user.id, version, request.url.query),
+        changed_at,
+    )
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+        
+    # One extra row tells whether another page follows
+    try:
+        if project_id:
+            # Uses cached method from CRUD layer
+            tasks = await task_crud.get_multi_by_project(
+                db=db, project_id=project_id, skip=skip, limit=limit + 1, cursor=cursor
+            )
+        else:
+            # Get all tasks for the user across all projects
+            tasks = await task_crud.get_multi_by_owner(
+                db=db, owner_id=current_user.id, skip=skip, limit=limit + 1, cursor=cursor
+            )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
         )
-    return tasks
+
+    tasks, next_cursor = split_page(tasks, limit, SORT_KEYS)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return ORJSONResponse(tasks, headers=headers)
 
 
 @router.get("/hierarchy", response_model=List[TaskWithSubtasks])
 async def read_tasks_with_subtasks(
-    project_id: str = Query(...),
+    project_id: uuid.UUID = Query(...),
+    root_task_id: Optional[uuid.UUID] = Query(None),
+    max_depth: Optional[int] = Query(None, ge=0, le=HIERARCHY_MAX_DEPTH),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Retrieve tasks with their subtasks as a hierarchy with caching.
+    
+    Pass ``root_task_id`` to fetch only that task's subtree and
+    ``max_depth`` to limit how many subtask levels are returned.
     """
     # Check if project belongs to the user
     project = await project_crud.get(db=db, id=project_id)
@@ -111,60 +201,101 @@ async def read_tasks_with_subtasks(
         )
 
     # Uses cached method from CRUD layer
-    tasks = await task_crud.get_tasks_with_subtasks(db=db, project_id=project_id)
+    tasks = await task_crud.get_tasks_with_subtasks(
+        db=db, project_id=project_id, root_task_id=root_task_id, max_depth=max_depth
+    )
+    if root_task_id and not tasks:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    return ORJSONResponse(tasks)
+
+
+@router.put("/reorder", response_model=List[Task])
+@user_limiter.limit("60/minute")
+async def reorder_tasks(
+    *,
+    request: Request,
+    reorder_in: TaskReorder,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Apply a batch of board moves (status and order) in one transaction.
+    """
+    tasks = await task_crud.reorder(
+        db=db, moves=reorder_in.moves, owner_id=current_user.id
+    )
+    if tasks is None:
+        task_ids = {move.task_id for move in reorder_in.moves}
+        owners = await task_crud.get_owners(db=db, ids=list(task_ids))
+        if len(owners) != len(task_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, 
+                detail="Task not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="Not enough permissions"
+        )
     return tasks
 
 
 @router.get("/{task_id}", response_model=Task)
 async def read_task(
     task_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
-    Get task by ID with caching.
+    Get task by ID, answering conditional requests with 304.
     """
-    # Uses cached method from CRUD layer
-    task = await task_crud.get(db=db, id=task_id)
+    # One query for the task, its project's validators and its owner
+    task = await task_crud.get_with_owner(db, id=task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Task not found"
         )
-
-    # Check if project belongs to the user
-    project = await project_crud.get(db=db, id=task.project_id)
-    if project.owner_id != current_user.id:
+    if task["owner_id"] != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Not enough permissions"
         )
-    return task
+
+    headers = validator_headers(
+        make_etag("task", task_id, task["version"]), task["changed_at"]
+    )
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    response.headers.update(headers)
+    return dict(task)
 
 
 @router.put("/{task_id}", response_model=Task)
-@ip_limiter.limit("2/minute")
+@user_limiter.limit("2/minute")
 async def update_task(
     *,
     task_id: str,
     request: Request,
     task_in: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Update a task with cache management.
     """
-    task = await task_crud.get(db=db, id=task_id)
+    task = await task_crud.get_with_owner(db, id=task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Task not found"
         )
-
-    # Check if project belongs to the user
-    project = await project_crud.get(db=db, id=task.project_id)
-    if project.owner_id != current_user.id:
+    if task["owner_id"] != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Not enough permissions"
@@ -180,50 +311,102 @@ async def update_task(
             due_date_str = due_date_str[:-1]  # Remove the Z
         task_data["due_date"] = datetime.fromisoformat(due_date_str)
 
-    # If project_id is being updated, check if new project belongs to the user
-    if task_data.get("project_id") and task_data["project_id"] != task.project_id:
-        new_project = await project_crud.get(db=db, id=task_data["project_id"])
-        if not new_project:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, 
-                detail="New project not found"
-            )
-        if new_project.owner_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not enough permissions on new project",
-            )
-
-    # Uses update method from CRUD that handles cache invalidation
-    task = await task_crud.update(db=db, db_obj=task, obj_in=task_data)
-    return task
+    # Uses update method from CRUD that handles cache invalidation; it only
+    # updates the task if both it and any new project are the user's
+    updated = await task_crud.update_owned(
+        db, task=task, owner_id=current_user.id, obj_in=task_data
+    )
+    if updated is None:
+        # Work out why, if the task is to change project
+        new_project_id = task_data.get("project_id")
+        if new_project_id and new_project_id != task["project_id"]:
+            new_project = await versions_crud.get_project(db, project_id=new_project_id)
+            if not new_project:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, 
+                    detail="New project not found"
+                )
+            if new_project.owner_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not enough permissions on new project",
+                )
+        # Deleted or moved away since it was read
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="Task not found"
+        )
+    return updated
 
 
-@router.delete("/{task_id}", response_model=Task)
-async def delete_task(
+@router.post("/{task_id}/move", response_model=Task)
+@user_limiter.limit("60/minute")
+async def move_task(
     *,
     task_id: str,
+    request: Request,
+    move_in: TaskMove,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
-    Delete a task with cache management.
+    Move a task next to its new neighbours, updating only its own rank.
+
+    Answers 409 if a neighbour isn't in the target column any more, so the
+    client can reload the column rather than see the card land elsewhere.
     """
-    task = await task_crud.get(db=db, id=task_id)
+    task = await task_crud.get_with_owner(db, id=task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Task not found"
         )
-
-    # Check if project belongs to the user
-    project = await project_crud.get(db=db, id=task.project_id)
-    if project.owner_id != current_user.id:
+    if task["owner_id"] != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Not enough permissions"
         )
 
-    # Uses remove method from CRUD that handles cache invalidation
-    task = await task_crud.remove(db=db, id=task_id)
+    try:
+        moved = await task_crud.move(
+            db=db,
+            task=task,
+            owner_id=current_user.id,
+            status=move_in.status,
+            after_task_id=move_in.after_task_id,
+            before_task_id=move_in.before_task_id,
+        )
+    except NeighbourNotInColumn as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if moved is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="Task not found"
+        )
+    return moved
+
+
+@router.delete("/{task_id}", response_model=Task)
+async def delete_task(
+    *,
+    task_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Delete a task with cache management.
+    """
+    # Deletes only the user's own task; a refused delete then asks why
+    task = await task_crud.remove_owned(db, id=task_id, owner_id=current_user.id)
+    if task is None:
+        project = await versions_crud.get_task(db, task_id=task_id)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, 
+                detail="Task not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="Not enough permissions"
+        )
     return task
\ No newline at end of file
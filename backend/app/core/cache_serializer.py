@@ -0,0 +1,81 @@
+from typing import Any, Optional, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.responses import dump_json
+
+
+class SchemaSerializer:
+    """
+    Serialize cached results through a Pydantic schema.
+
+    ORM rows are reduced to the schema's fields and stored as compact JSON.
+    On a cache hit the payload is validated back into the schema and, when a
+    ``model`` is given, rebuilt as a detached ORM instance merged into the
+    caller's session without a SELECT, so it can be updated or deleted like
+    a freshly loaded row.
+    """
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        *,
+        many: bool = False,
+        model: Optional[type] = None,
+    ):
+        self.schema = schema
+        self.many = many
+        self.model = model
+        self._columns = (
+            {column.key for column in sa_inspect(model).column_attrs} if model else set()
+        )
+
+    def dumps(self, value: Any) -> str:
+        if self.many:
+            payload = [self._dump_one(item) for item in value]
+        else:
+            payload = self._dump_one(value)
+        return orjson.dumps(payload).decode()
+
+    async def loads(self, data: str, db: Optional[AsyncSession] = None) -> Any:
+        payload = orjson.loads(data)
+        if not self.many:
+            return await self._load_one(payload, db)
+        return [await self._load_one(item, db) for item in payload]
+
+    def _dump_one(self, item: Any) -> Any:
+        return self.schema.model_validate(item).model_dump(mode="json")
+
+    async def _load_one(self, payload: Any, db: Optional[AsyncSession]) -> Any:
+        item = self.schema.model_validate(payload)
+        if self.model is None or db is None:
+            return item
+
+        fields = {
+            key: value
+            for key, value in item.model_dump().items()
+            if key in self._columns
+        }
+        obj = self.model(**fields)
+        make_transient_to_detached(obj)
+        return await db.merge(obj, load=False)
+
+
+class RowSerializer:
+    """
+    Cache plain rows (lists and dicts of column values) as JSON.
+
+    Nothing is rebuilt on a hit: ids, enums and timestamps come back as the
+    strings they serialize to. Only suitable for results that go straight
+    out as JSON (see ``app.core.responses.ORJSONResponse``).
+    """
+
+    def dumps(self, value: Any) -> str:
+        return dump_json(value).decode()
+
+    async def loads(self, data: str, db: Optional[AsyncSession] = None) -> Any:
+        return orjson.loads(data)
@@ -0,0 +1,205 @@
+# app/core/change_feed.py
+"""
+Fan-out of compact change events to server-sent event streams.
+
+Writers publish one event per change on ``changes:<owner_id>:<project_id>``.
+With Redis every worker pattern-subscribes to ``changes:*`` on a single
+connection and hands each event to its local subscribers, so a write made
+on one worker reaches streams held by all of them. Without ``REDIS_URL``
+events are dispatched in-process, which only covers a single worker.
+
+A subscriber follows either one project or all of an owner's projects.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.core import redis_config
+from app.core.config import settings
+from app.core.responses import dump_json
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "changes"
+
+# Sent when events may have been lost (a full queue, a Redis reconnect);
+# clients refetch whatever they show
+RESYNC = dump_json({"type": "resync"}).decode()
+# Queued for every stream every CHANGE_FEED_KEEPALIVE seconds, so proxies
+# don't close idle ones; sent as an SSE comment
+KEEPALIVE = ""
+
+# (owner_id, project_id); project_id None follows all the owner's projects
+FeedKey = Tuple[str, Optional[str]]
+
+# Task events list at most this many ids; larger batches only give a count
+MAX_EVENT_TASK_IDS = 100
+
+
+def change_event(
+    event_type: str, project_id: Any, task_ids: Optional[Sequence[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build an event such as ``task.updated`` or ``project.deleted``.
+
+    Events say what changed, not how: clients refetch the tasks or project
+    they name (conditional GETs make unchanged ones cheap).
+    """
+    event: Dict[str, Any] = {"type": event_type, "project_id": project_id}
+    if task_ids is not None:
+        if len(task_ids) <= MAX_EVENT_TASK_IDS:
+            event["task_ids"] = list(task_ids)
+        else:
+            event["count"] = len(task_ids)
+    return event
+
+
+class Subscription:
+    """One stream's queue of serialized events."""
+
+    def __init__(self, key: FeedKey, queue_size: int):
+        self.key = key
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, payload: str) -> bool:
+        """Queue an event; a client that falls behind gets one resync instead."""
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+            return False
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+
+class ChangeBroker:
+    def __init__(self, queue_size: int, keepalive: float):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._subscribers: Dict[FeedKey, Set[Subscription]] = {}
+        self._heartbeat: Optional["asyncio.Task[None]"] = None
+        self._listener: Optional["asyncio.Task[None]"] = None
+        self._listener_client: Optional[redis.Redis] = None
+        self.stats: Dict[str, int] = dict.fromkeys(
+            ("published", "received", "delivered", "overflows"), 0
+        )
+
+    def subscribe(self, owner_id: Any, project_id: Optional[Any] = None) -> Subscription:
+        key = (str(owner_id), str(project_id) if project_id is not None else None)
+        subscription = Subscription(key, self.queue_size)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._beat())
+        self.start_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.key]
+
+    async def publish(self, owner_id: Any, project_id: Any, event: Dict[str, Any]) -> None:
+        """
+        Publish an event about one of ``owner_id``'s projects.
+
+        Called after the change is committed; failures are logged, never
+        raised, since the write itself has already succeeded.
+        """
+        if owner_id is None:
+            return
+        payload = dump_json(event).decode()
+        self.stats["published"] += 1
+        client = redis_config.redis_client
+        if client is None:
+            self.dispatch(str(owner_id), str(project_id), payload)
+            return
+        try:
+            await client.publish(f"{CHANNEL_PREFIX}:{owner_id}:{project_id}", payload)
+        except RedisError as e:
+            logger.error(f"Redis change feed publish error: {e}")
+
+    def dispatch(self, owner_id: str, project_id: str, payload: str) -> None:
+        """Hand an event to this worker's subscribers of the project or owner."""
+        self.stats["received"] += 1
+        for key in ((owner_id, project_id), (owner_id, None)):
+            for subscription in self._subscribers.get(key, ()):
+                if subscription.push(payload):
+                    self.stats["delivered"] += 1
+                else:
+                    self.stats["overflows"] += 1
+
+    def resync_all(self) -> None:
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.push(RESYNC)
+
+    async def _beat(self) -> None:
+        # One timer for every stream rather than a timeout per stream. Each
+        # round is spread over the interval in tenth-of-a-second slices:
+        # waking thousands of streams at once would stall the worker.
+        slices = max(1, int(self.keepalive * 10))
+        while self._subscribers:
+            subscriptions = [s for subs in self._subscribers.values() for s in subs]
+            for i in range(slices):
+                await asyncio.sleep(self.keepalive / slices)
+                for subscription in subscriptions[i::slices]:
+                    subscription.push(KEEPALIVE)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "redis" if redis_config.redis_client is not None else "local",
+            "feeds": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            **self.stats,
+        }
+
+    def start_listener(self) -> None:
+        """Relay events from Redis unless already doing so; a no-op without Redis."""
+        client = redis_config.redis_client
+        if client is None:
+            return
+        if self._listener and not self._listener.done() and self._listener_client is client:
+            return
+        if self._listener:
+            self._listener.cancel()
+        self._listener_client = client
+        self._listener = asyncio.create_task(self._listen(client))
+
+    async def _listen(self, client: redis.Redis) -> None:
+        """
+        Dispatch every event published by any worker.
+
+        Events published while the subscription was down (or not yet up)
+        are lost, so local subscribers are told to resync each time it is
+        established.
+        """
+        while True:
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}:*")
+                self.resync_all()
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    _, owner_id, project_id = message["channel"].split(":", 2)
+                    self.dispatch(owner_id, project_id, message["data"])
+            except RedisError as e:
+                logger.error(f"Redis change feed listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.reset()
+
+
+change_broker = ChangeBroker(
+    queue_size=settings.CHANGE_FEED_QUEUE_SIZE, keepalive=settings.CHANGE_FEED_KEEPALIVE
+)
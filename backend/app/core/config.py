@@ -16,18 +16,71 @@ class Settings(BaseSettings):
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 11520  # 8 days
     ALGORITHM: str = "HS256"
+    PRINCIPAL_CACHE_TTL: int = 60  # seconds an authenticated user is cached
+    PRINCIPAL_CACHE_SIZE: int = 10000
     
     # Reset token settings
     RESET_TOKEN_EXPIRE_MINUTES: int = 15
 
     # Redis settings
     REDIS_URL: str = os.getenv("REDIS_URL", "")
+    DASHBOARD_CACHE_TTL: int = 300  # seconds; writes invalidate snapshots sooner
+    CACHE_L1_TTL: int = 30  # seconds a worker keeps its in-process copy
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    
+    # Nightly priority score recompute (app/jobs/priority_scores.py)
+    PRIORITY_SCORE_SCHEDULER: bool = True
+    PRIORITY_SCORE_BATCH_SIZE: int = 50000
+
+    # Bulk task import (app/services/task_import.py)
+    TASK_IMPORT_CHUNK_SIZE: int = 1000  # rows validated and committed together
+    TASK_IMPORT_MAX_ERRORS: int = 1000  # row errors listed in the response
+
+    # Change feed streams (app/core/change_feed.py)
+    CHANGE_FEED_QUEUE_SIZE: int = 100  # events a stream may fall behind before a resync
+    CHANGE_FEED_KEEPALIVE: int = 15  # seconds between keep-alive comments on idle streams
+
+    # Password hashing (app/core/security.py)
+    BCRYPT_ROUNDS: int = 12  # cost factor; hashes at any other cost are redone on login
+    # Concurrent hashes per worker, off the event loop; more threads than
+    # spare cores only take CPU from the event loop
+    PASSWORD_HASH_THREADS: int = max(1, (os.cpu_count() or 1) - 1)
+
+    # Rate limits (app/core/rate_limiting.py); counted in Redis when configured
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # clients tracked per worker without Redis
+
+    # Outgoing mail (app/jobs/email_outbox.py): queued in the email_outbox
+    # table, sent by a delivery worker over SMTP sessions it keeps open
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_SMTP_CONNECTIONS: int = 4  # sessions per worker, one message at a time each
+    EMAIL_SMTP_TIMEOUT: int = 30  # seconds per SMTP command
+    EMAIL_SMTP_IDLE_TIMEOUT: int = 60  # seconds before unused sessions are closed
+    EMAIL_BATCH_SIZE: int = 100  # messages claimed and settled together
+    EMAIL_POLL_INTERVAL: int = 5  # seconds between checks for mail queued on other workers
+    EMAIL_CLAIM_TIMEOUT: int = 300  # seconds before an unsettled claimed message is due again
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_DELAY: int = 30  # seconds before the first retry, doubling after
+    EMAIL_RETRY_MAX_DELAY: int = 3600
     
     # Frontend URL for reset links
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+    # Avatar storage (content-addressed files, see app/utils/blob_store.py)
+    AVATAR_STORAGE_DIR: str = os.getenv("AVATAR_STORAGE_DIR", "media/avatars")
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    # Decoded size cap; a compressed file far under AVATAR_MAX_BYTES can
+    # declare dimensions that take gigabytes to decode
+    AVATAR_MAX_PIXELS: int = 25_000_000
+
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    DB_ECHO: bool = False
+    DB_USE_NULL_POOL: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
     
     # Email settings with updated field names
     MAIL_USERNAME: str = "test@example.com"
@@ -35,10 +88,11 @@ class Settings(BaseSettings):
     MAIL_FROM: str = "test@example.com"
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.example.com"
-    # Updated field names for fastapi-mail
+    # STARTTLS on a plain connection, or TLS from the start (port 465)
     MAIL_STARTTLS: bool = True
-    MAIL_SSL_TLS: bool = True
+    MAIL_SSL_TLS: bool = False
     MAIL_USE_CREDENTIALS: bool = True
+    MAIL_VALIDATE_CERTS: bool = True
 
     class Config:
         env_file = ".env"
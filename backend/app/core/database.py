@@ -2,8 +2,10 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.types import TypeDecorator, CHAR
 from sqlalchemy.dialects.postgresql import UUID
+import time
 import uuid
-from sqlalchemy.pool import NullPool
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.core.config import settings   
 
@@ -41,12 +43,52 @@ class GUID(TypeDecorator):
                 value = uuid.UUID(value)
             return value
 
-# Create async engine (remove check_same_thread as it's SQLite-specific)
-engine = create_async_engine(
-    settings.DATABASE_URL,  # Make sure this uses postgresql+asyncpg://
-    echo=True,  # Set to False in production
-    poolclass=NullPool  # Recommended for async SQLAlchemy
-)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+
+
+def _engine_options() -> dict:
+    """Build engine keyword arguments from the DB_* settings."""
+    options = {"echo": settings.DB_ECHO}
+    if settings.DB_USE_NULL_POOL:
+        options["poolclass"] = NullPool
+        return options
+
+    # In-memory SQLite needs the dialect's own single-connection pool
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+# Create async engine (pooled unless DB_USE_NULL_POOL is set)
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
 
 # Async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -60,4 +102,28 @@ Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of the connection pool for the health endpoints."""
+    pool = engine.sync_engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            total_wait_ms=round(pool.total_wait * 1000, 3),
+            avg_wait_ms=round(pool.total_wait * 1000 / pool.checkouts, 3)
+            if pool.checkouts
+            else 0.0,
+            max_wait_ms=round(pool.max_wait * 1000, 3),
+        )
+    return stats
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LocalCache:
+    """
+    In-process LRU with a per-entry TTL, used as the L1 tier in front of Redis.
+
+    Values are stored as-is; callers keep them immutable (the Redis caches
+    store serialized payloads) so they can be shared between requests.
+
+    A fill can race an invalidation: a reader fetches the old value, the key
+    is invalidated while the fetch is in flight, then the reader stores what
+    it fetched. Readers therefore note ``generation`` before fetching and pass
+    it to ``set``, which refuses the value if the key was deleted since.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        # Generation of each recent delete, at most max_size of them; fills
+        # begun before _floor are refused, whichever key they are for
+        self._deleted: "OrderedDict[str, int]" = OrderedDict()
+        self._floor = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter advanced by every delete and clear."""
+        return self._generation
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        *,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store ``value``; with ``generation`` (read before the value was
+        fetched) only if ``key`` has not been deleted since.
+        """
+        if self.max_size <= 0:
+            return
+        if generation is not None and generation < max(self._floor, self._deleted.get(key, 0)):
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._deleted[key] = self._generation
+        self._deleted.move_to_end(key)
+        while len(self._deleted) > max(self.max_size, 1):
+            _, forgotten = self._deleted.popitem(last=False)
+            self._floor = max(self._floor, forgotten)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._deleted.clear()
+        self._generation += 1
+        self._floor = self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one loader call.
+
+    The first caller (the leader) runs the loader; callers arriving while it
+    is in flight await the same result instead of running it again. If the
+    leader is cancelled, a follower that wasn't takes over and runs the
+    loader itself.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Return ``(value, shared)``; ``shared`` is True for followers."""
+        while (future := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Only the leader's request went away: lead a call of our own
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception with no followers is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            self._calls.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,72 @@
+import logging
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.local_cache import LocalCache
+from app.core.redis_config import (
+    get_cached_value,
+    invalidate_cache,
+    register_invalidation_listener,
+    set_cached_value,
+)
+from app.schemas.user import Principal
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "principal"
+
+
+class PrincipalCache:
+    """
+    Short-lived LRU of authenticated principals keyed by user id.
+
+    Entries live in-process for ``ttl`` seconds and, when Redis is
+    configured, are shared between workers under ``principal:<user_id>``.
+    CRUDUser writes invalidate both tiers, and the invalidation is
+    broadcast so other workers drop their in-process copy too.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self._local = LocalCache(max_size=max_size, ttl=ttl)
+        register_invalidation_listener(self._on_invalidation)
+
+    async def get(self, user_id: Any) -> Optional[Principal]:
+        key = str(user_id)
+        principal = self._local.get(key)
+        if principal is not None:
+            return principal
+
+        generation = self._local.generation
+        cached = await get_cached_value(f"{CACHE_PREFIX}:{key}")
+        if cached:
+            try:
+                principal = Principal.model_validate_json(cached)
+            except ValueError as e:
+                logger.error(f"Discarding unreadable cached principal: {e}")
+                return None
+            self._local.set(key, principal, generation=generation)
+            return principal
+        return None
+
+    async def set(self, principal: Principal) -> None:
+        key = str(principal.id)
+        self._local.set(key, principal)
+        await set_cached_value(
+            f"{CACHE_PREFIX}:{key}", principal.model_dump_json(), self.ttl
+        )
+
+    async def invalidate(self, user_id: Any) -> None:
+        key = str(user_id)
+        self._local.delete(key)
+        await invalidate_cache(CACHE_PREFIX, key)
+
+    def _on_invalidation(self, cache_key: str) -> None:
+        prefix, _, key = cache_key.partition(":")
+        if prefix == CACHE_PREFIX:
+            self._local.delete(key)
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL, max_size=settings.PRINCIPAL_CACHE_SIZE
+)
@@ -1,25 +1,221 @@
-from fastapi import Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
-# Create a more sophisticated limiter that can handle both 
-# authenticated and non-authenticated users
-def get_user_identifier(request: Request):
-    try:
-        # Attempt to get the current user
-        user = request.state.current_user
-        return f"user:{user.id}"
-    except AttributeError:
-        # Fallback to IP address for non-authenticated users
-        return get_remote_address(request)
-
-# Create limiter instances
-ip_limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["100/day"]  # Global IP-based limit
+# app/core/rate_limiting.py
+"""
+Sliding-window rate limits shared by every worker.
+
+Each check is a single EVALSHA of SLIDING_WINDOW_SCRIPT on the shared Redis
+client: the script drops hits older than the window, counts the rest and
+records the new hit in one atomic step, so concurrent requests on different
+workers can't both take the last slot. Without ``REDIS_URL``, or for
+REDIS_RETRY_AFTER seconds after a Redis error, each worker enforces the
+limits on its own.
+
+Limits are declared on endpoints, which must take a ``request: Request``::
+
+    @router.post("/")
+    @user_limiter.limit("20/hour")
+    async def create_project(*, request: Request, ...):
+
+A limit is counted per client and per URL path, so ``2/minute`` on
+``PUT /tasks/{task_id}`` allows two updates a minute to each task.
+"""
+import inspect
+import logging
+import math
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Deque
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.core import redis_config
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+# Seconds to count locally after a Redis error before trying Redis again,
+# rather than paying the client's connection retries on every request
+REDIS_RETRY_AFTER = 10
+
+# KEYS[1]: sorted set of hit timestamps; ARGV: limit, window (ms), hit id.
+# Returns 0 if the hit was counted, otherwise milliseconds until a slot frees.
+# Timestamps come from the Redis clock, so workers' clocks needn't agree.
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+now = now[1] * 1000 + math.floor(now[2] / 1000)
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tonumber(oldest[2]) + window - now
+"""
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_RE = re.compile(
+    r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$"
 )
 
-user_limiter = Limiter(
-    key_func=get_user_identifier,
-    default_limits=["200/hour"]  # More generous limit for authenticated users
-)
\ No newline at end of file
+
+@dataclass(frozen=True)
+class RateLimit:
+    amount: int
+    seconds: int
+
+    def __str__(self) -> str:
+        return f"{self.amount}/{self.seconds}s"
+
+
+def parse_limit(value: str) -> RateLimit:
+    """Parse ``"5/minute"``, ``"100 per day"`` or ``"10/5 minutes"``."""
+    match = _LIMIT_RE.match(value.lower())
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    amount, multiple, period = match.groups()
+    return RateLimit(int(amount), int(multiple or 1) * _PERIODS[period])
+
+
+class LocalWindows:
+    """
+    In-process sliding-window logs, used when Redis isn't available.
+
+    Keys are evicted least recently used first beyond ``max_keys``; an
+    evicted client simply starts a fresh window.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def hit(self, key: str, limit: RateLimit) -> float:
+        """Count a hit; returns 0, or seconds until one would be allowed."""
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+        while hits and hits[0] <= now - limit.seconds:
+            hits.popleft()
+        if len(hits) < limit.amount:
+            hits.append(now)
+            return 0.0
+        return hits[0] + limit.seconds - now
+
+    def clear(self) -> None:
+        self._hits.clear()
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+
+local_windows = LocalWindows(max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+_sliding_window = None
+_redis_retry_at = 0.0
+
+
+async def hit(key: str, limit: RateLimit) -> float:
+    """
+    Count a hit against ``limit`` for ``key``, in Redis when it's configured.
+
+    Returns 0 if the hit is allowed, otherwise the seconds to wait. Redis
+    errors are logged and the hit is counted locally instead.
+    """
+    global _sliding_window, _redis_retry_at
+    client = redis_config.redis_client
+    if client is not None and time.monotonic() >= _redis_retry_at:
+        if _sliding_window is None:
+            _sliding_window = client.register_script(SLIDING_WINDOW_SCRIPT)
+        try:
+            retry_ms = await _sliding_window(
+                keys=[f"{KEY_PREFIX}:{limit}:{key}"],
+                args=[limit.amount, limit.seconds * 1000, uuid.uuid4().hex],
+                client=client,
+            )
+            return int(retry_ms) / 1000
+        except RedisError as e:
+            logger.error(f"Redis rate limit error: {e}")
+            _redis_retry_at = time.monotonic() + REDIS_RETRY_AFTER
+    return local_windows.hit(key, limit)
+
+
+def get_remote_address(request: Request) -> str:
+    return request.client.host if request.client else "127.0.0.1"
+
+
+def get_ip_identifier(request: Request) -> str:
+    return f"ip:{get_remote_address(request)}"
+
+
+def get_user_identifier(request: Request) -> str:
+    """
+    The bearer token's subject, or the client address without a valid token.
+
+    The token's signature and expiry are checked but the user isn't looked
+    up, so keying a request costs no database or cache round trip.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+        except JWTError:
+            payload = {}
+        if payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return get_ip_identifier(request)
+
+
+class Limiter:
+    def __init__(self, key_func: Callable[[Request], str]):
+        self.key_func = key_func
+
+    def limit(self, value: str) -> Callable:
+        """Decorate an endpoint to allow ``value`` (e.g. ``"5/minute"``) per client."""
+        limit = parse_limit(value)
+
+        def decorator(func: Callable) -> Callable:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(
+                    f"{func.__name__} needs a 'request: Request' parameter to be rate limited"
+                )
+            is_async = inspect.iscoroutinefunction(func)
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                await self.check(kwargs["request"], limit, value)
+                if is_async:
+                    return await func(*args, **kwargs)
+                return await run_in_threadpool(func, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def check(self, request: Request, limit: RateLimit, value: str) -> None:
+        key = f"{self.key_func(request)}:{request.url.path}"
+        retry_after = await hit(key, limit)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {value}",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+# Public endpoints are limited per client address, authenticated ones per user
+ip_limiter = Limiter(key_func=get_ip_identifier)
+user_limiter = Limiter(key_func=get_user_identifier)
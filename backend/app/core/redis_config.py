@@ -1,14 +1,18 @@
+import asyncio
 import redis.asyncio as redis
 from redis.exceptions import RedisError
 from functools import wraps
+import inspect
 import json
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 # Configure logging
 import logging
 from urllib.parse import urlparse
 
+from app.core.cache_serializer import SchemaSerializer
 from app.core.config import settings
+from app.core.local_cache import LocalCache, SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,6 +20,34 @@ logger = logging.getLogger(__name__)
 # Initialize Redis client
 redis_client = None
 
+# In-process L1 tier in front of Redis; entries hold serialized payloads and
+# are dropped in every worker when a key is invalidated (see INVALIDATION_CHANNEL)
+local_cache = LocalCache(
+    max_size=settings.CACHE_L1_MAX_ENTRIES, ttl=settings.CACHE_L1_TTL
+)
+# Concurrent misses on one key share a single loader call
+single_flight = SingleFlight()
+
+cache_stats: Dict[str, int] = dict.fromkeys(
+    (
+        "l1_hits",
+        "l2_hits",
+        "misses",
+        "coalesced",
+        "invalidations_sent",
+        "invalidations_received",
+    ),
+    0,
+)
+
+# Generation counters for versioned key namespaces live under "ns:<name>"
+NAMESPACE_PREFIX = "ns"
+
+# Invalidated keys are published here so other workers drop their L1 copy
+INVALIDATION_CHANNEL = "cache:invalidate"
+_invalidation_listeners: List[Callable[[str], None]] = []
+_invalidation_task: Optional["asyncio.Task[None]"] = None
+
 async def initialize_redis():
     global redis_client
     try:
@@ -38,65 +70,299 @@ async def initialize_redis():
         # Ping to verify connection (properly awaited)
         await redis_client.ping()
         logger.info("Redis connection established successfully")
+        start_invalidation_listener()
         return redis_client
     except RedisError as e:
         logger.error(f"Redis connection error: {e}")
         return None
 
+def start_invalidation_listener():
+    """Subscribe this worker to invalidations published by the others"""
+    global _invalidation_task
+    if redis_client and (_invalidation_task is None or _invalidation_task.done()):
+        _invalidation_task = asyncio.create_task(listen_for_invalidations(redis_client))
+
+async def listen_for_invalidations(client: redis.Redis):
+    """
+    Drop L1 entries for every key published on INVALIDATION_CHANNEL
+    
+    Messages sent while the subscription was down are lost, so the whole
+    L1 tier is cleared each time the subscription is (re)established.
+    """
+    while True:
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            local_cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    handle_invalidation(message["data"])
+        except RedisError as e:
+            logger.error(f"Redis invalidation listener error: {e}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.reset()
+
+def handle_invalidation(message: str):
+    """
+    Drop a key from this worker's in-process caches
+    
+    Namespace bumps arrive as ``<key>=<generation>`` and store the new
+    generation in L1 instead.
+    """
+    cache_stats["invalidations_received"] += 1
+    key, _, version = message.rpartition("=")
+    if key.startswith(f"{NAMESPACE_PREFIX}:") and version.isdigit():
+        _store_namespace_version(key, int(version))
+    else:
+        key = message
+        local_cache.delete(key)
+    for listener in _invalidation_listeners:
+        listener(key)
+
+def register_invalidation_listener(listener: Callable[[str], None]):
+    """
+    Call ``listener(key)`` whenever a cache key is invalidated by any worker
+    
+    Used by caches that keep their own in-process copies, like PrincipalCache.
+    """
+    _invalidation_listeners.append(listener)
+
+async def _broadcast_invalidation(key: str, message: Optional[str] = None):
+    if message is None:
+        local_cache.delete(key)
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, message or key)
+        cache_stats["invalidations_sent"] += 1
+    except RedisError as e:
+        logger.error(f"Redis invalidation broadcast error: {e}")
+
+async def _read(key: str) -> Optional[str]:
+    """Read a payload from L1, falling back to Redis and filling L1"""
+    value = local_cache.get(key)
+    if value is not None:
+        cache_stats["l1_hits"] += 1
+        return value
+    # An invalidation during the GET means the value may already be stale
+    generation = local_cache.generation
+    value = await redis_client.get(key)
+    if value is not None:
+        cache_stats["l2_hits"] += 1
+        local_cache.set(key, value, generation=generation)
+    return value
+
+async def _write(key: str, value: str, timeout: int):
+    await redis_client.setex(key, timeout, value)
+    local_cache.set(key, value, timeout)
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit, miss and coalescing counters for this worker"""
+    return {
+        "enabled": is_cache_enabled(),
+        "l1_entries": len(local_cache),
+        "in_flight": len(single_flight),
+        **cache_stats,
+    }
+
+# Arguments that never take part in default cache keys
+KEY_EXCLUDED_ARGS = ("self", "cls", "db")
+
 def cache_with_timeout(
     prefix: str, 
     timeout: int = 3600,  # Default 1 hour cache
-    key_generator: Optional[Callable[[Any], str]] = None
+    key_generator: Optional[Callable[[Any], str]] = None,
+    serializer: Optional[SchemaSerializer] = None,
+    namespaces: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
 ):
     """
-    Decorator for caching function results in Redis
+    Decorator for caching function results in Redis with an in-process L1
+    
+    Lookups try the worker's L1 tier, then Redis. On a miss, concurrent
+    calls for the same key are coalesced: one caller runs the function and
+    stores the result, the others decode the stored payload into their own
+    session instead of querying the database again.
+    
+    Default keys are ``prefix:<arg>:<arg>...`` built from the bound call
+    arguments in signature order, leaving out ``self`` and the ``db``
+    session so that equal calls share a key. With ``namespaces`` the key
+    also embeds the current generation of each namespace (``prefix:v3:...``),
+    so ``bump_namespace`` invalidates every entry of the namespace at once.
     
     :param prefix: Prefix for the cache key
     :param timeout: Timeout in seconds for the cache
     :param key_generator: Optional function to generate custom cache keys
+    :param serializer: Optional SchemaSerializer used to store and rebuild
+        results (e.g. ORM rows), or RowSerializer for plain rows; plain JSON
+        is used otherwise
+    :param namespaces: Optional function mapping the bound arguments to the
+        namespaces (e.g. ``project:<id>``) the cached value belongs to
     """
     def decorator(func):
+        signature = inspect.signature(func)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Skip caching if Redis is not available
             if not redis_client:
                 return await func(*args, **kwargs)
             
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            
             # Generate cache key
             if key_generator:
                 cache_key = key_generator(*args, **kwargs)
             else:
-                # Default key generation using function name and args
-                key_parts = [prefix, func.__name__]
-                key_parts.extend(map(str, args))
-                key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
+                key_parts = [prefix]
+                key_parts.extend(
+                    str(value)
+                    for name, value in bound.arguments.items()
+                    if name not in KEY_EXCLUDED_ARGS
+                )
                 cache_key = ":".join(key_parts)
             
+            if namespaces:
+                try:
+                    versions = await get_namespace_versions(namespaces(bound.arguments))
+                except RedisError as e:
+                    logger.error(f"Redis namespace lookup error: {e}")
+                    return await func(*args, **kwargs)
+                tag = "v" + ".".join(map(str, versions))
+                head, sep, tail = cache_key.partition(":")
+                cache_key = f"{head}:{tag}{sep}{tail}"
+            
+            async def decode(payload: str):
+                if serializer:
+                    return await serializer.loads(payload, db=bound.arguments.get("db"))
+                return json.loads(payload)
+            
             # Try to get from cache
             try:
-                cached_result = await redis_client.get(cache_key)
+                cached_result = await _read(cache_key)
                 if cached_result:
-                    return json.loads(cached_result)
+                    return await decode(cached_result)
             except Exception as e:
                 logger.error(f"Redis cache retrieval error: {e}")
             
-            # Call the original function
-            result = await func(*args, **kwargs)
+            async def load():
+                cache_stats["misses"] += 1
+                result = await func(*args, **kwargs)
+                if result is None:
+                    return result, None
+                
+                # Cache the result before followers are released
+                payload = None
+                try:
+                    payload = (
+                        serializer.dumps(result)
+                        if serializer
+                        else json.dumps(result, default=str)
+                    )
+                    await _write(cache_key, payload, timeout)
+                except Exception as e:
+                    logger.error(f"Redis cache storage error: {e}")
+                return result, payload
             
-            # Cache the result
-            try:
-                await redis_client.setex(
-                    cache_key, 
-                    timeout, 
-                    json.dumps(result, default=str)
-                )
-            except Exception as e:
-                logger.error(f"Redis cache storage error: {e}")
+            (result, payload), shared = await single_flight.do(cache_key, load)
+            if not shared:
+                return result
             
-            return result
+            # The leader's result belongs to its session; rebuild our own copy
+            cache_stats["coalesced"] += 1
+            if payload is None:
+                return result if result is None else await func(*args, **kwargs)
+            return await decode(payload)
         return wrapper
     return decorator
 
+def is_cache_enabled() -> bool:
+    return redis_client is not None
+
+async def get_namespace_versions(names: List[str]) -> List[int]:
+    """
+    Current generation of each namespace, 0 for namespaces never bumped
+    
+    :param names: Namespace names such as ``project:<id>`` or ``user:<id>``
+    """
+    if not names:
+        return []
+    keys = [f"{NAMESPACE_PREFIX}:{name}" for name in names]
+    values = [local_cache.get(key) for key in keys]
+    missing = [key for key, value in zip(keys, values) if value is None]
+    if missing:
+        generation = local_cache.generation
+        fetched = dict(zip(missing, await redis_client.mget(missing)))
+        for key, value in fetched.items():
+            local_cache.set(key, value or "0", generation=generation)
+        values = [fetched.get(key, value) for key, value in zip(keys, values)]
+    return [int(value) if value else 0 for value in values]
+
+async def bump_namespace(name: str):
+    """
+    Invalidate every key built under a namespace with a single INCR
+    
+    Entries written under older generations are never read again and age
+    out through their own TTL.
+    
+    :param name: Namespace name such as ``project:<id>`` or ``user:<id>``
+    """
+    if not redis_client:
+        return
+    
+    key = f"{NAMESPACE_PREFIX}:{name}"
+    try:
+        version = await redis_client.incr(key)
+    except RedisError as e:
+        logger.error(f"Redis namespace bump error: {e}")
+        return
+    _store_namespace_version(key, version)
+    await _broadcast_invalidation(key, f"{key}={version}")
+
+def _store_namespace_version(key: str, version: int):
+    """
+    Put a namespace's new generation in L1, unless a newer one is there
+    
+    The delete stops reads of the old generation still in flight from
+    filling it back in.
+    """
+    current = local_cache.get(key)
+    local_cache.delete(key)
+    local_cache.set(key, str(max(version, int(current or 0))))
+
+async def get_cached_value(key: str) -> Optional[str]:
+    """
+    Read a raw cached value, returning None on a miss or when Redis is down
+    
+    :param key: Full cache key
+    """
+    if not redis_client:
+        return None
+    
+    try:
+        value = await _read(key)
+        if value is None:
+            cache_stats["misses"] += 1
+        return value
+    except RedisError as e:
+        logger.error(f"Redis cache retrieval error: {e}")
+        return None
+
+async def set_cached_value(key: str, value: str, timeout: int = 3600):
+    """
+    Store a raw value under a key with an expiry
+    
+    :param key: Full cache key
+    :param value: Serialized value to store
+    :param timeout: Timeout in seconds for the cache
+    """
+    if not redis_client:
+        return
+    
+    try:
+        await _write(key, value, timeout)
+    except RedisError as e:
+        logger.error(f"Redis cache storage error: {e}")
+
 async def invalidate_cache(prefix: str, key: str):
     """
     Invalidate a specific cache entry
@@ -112,6 +378,7 @@ async def invalidate_cache(prefix: str, key: str):
         await redis_client.delete(full_key)
     except RedisError as e:
         logger.error(f"Redis cache invalidation error: {e}")
+    await _broadcast_invalidation(full_key)
 
 async def clear_cache_by_pattern(pattern: str):
     """
@@ -0,0 +1,28 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Matches Pydantic's JSON output: UTC datetimes end in "Z", not "+00:00"
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dump_json(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from plain Python data with orjson.
+
+    Returning one from an endpoint bypasses its ``response_model``: nothing
+    is validated or filtered. Only use it for payloads already in the
+    schema's shape, such as column rows selected field by field; the
+    declared ``response_model`` still documents the endpoint.
+
+    Don't make it the app's ``default_response_class``: FastAPI then drops
+    its Pydantic fast path and typed responses render more slowly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
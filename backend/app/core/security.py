@@ -1,20 +1,35 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Union, Optional, Tuple
 from pydantic import ValidationError
 
+import anyio.to_thread
+from anyio import CapacityLimiter
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    # Hashes at any other cost are flagged by needs_update and replaced on login
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so hashing runs in worker threads instead of on the
+# event loop; its own limiter keeps a burst of logins from taking every thread
+# in the default pool that sync endpoints and file handling share
+password_hash_limiter = CapacityLimiter(settings.PASSWORD_HASH_THREADS)
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, reset_password: bool = False
 ) -> str:
     """
-    Create a JWT access token for a user
+    Create a JWT access token for a user; ``reset_password`` marks it as a
+    password reset token for verify_reset_token
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -23,22 +38,45 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    if reset_password:
+        to_encode["reset"] = True
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await anyio.to_thread.run_sync(
+        pwd_context.verify, plain_password, hashed_password, limiter=password_hash_limiter
+    )
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash is outdated, rehash it
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is None unless the stored
+    hash should be replaced with it.
+    """
+    return await anyio.to_thread.run_sync(
+        pwd_context.verify_and_update,
+        plain_password,
+        hashed_password,
+        limiter=password_hash_limiter,
+    )
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     Hash a password
     """
-    return pwd_context.hash(password)
+    return await anyio.to_thread.run_sync(
+        pwd_context.hash, password, limiter=password_hash_limiter
+    )
 
 
 
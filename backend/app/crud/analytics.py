@@ -0,0 +1,190 @@
+# app/crud/analytics.py
+import uuid
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Union
+
+from sqlalchemy import Date, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import TaskDailyStats
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.utils.priority import as_naive_utc
+
+COUNTER_COLUMNS = (
+    "created",
+    "completed",
+    "created_low",
+    "created_medium",
+    "created_high",
+    "created_urgent",
+)
+
+# (day, counter column) -> change
+Deltas = Counter
+
+
+class TaskFacts(NamedTuple):
+    """The parts of a task the daily rollup counts."""
+    created_day: date
+    priority: TaskPriority
+    completed_day: Optional[date]
+
+
+def _day(value: Optional[datetime]) -> Optional[date]:
+    return as_naive_utc(value).date() if value else None
+
+
+def task_facts(task: Union[Task, Mapping[str, Any]]) -> TaskFacts:
+    """
+    Facts of an ORM task or a row of task columns.
+
+    Rows not yet flushed have no created_at; they count as created today.
+    """
+    get = task.get if isinstance(task, Mapping) else lambda key: getattr(task, key)
+    completed_day = None
+    if get("status") == TaskStatus.DONE:
+        completed_day = _day(get("completed_at"))
+    return TaskFacts(
+        created_day=_day(get("created_at")) or datetime.utcnow().date(),
+        priority=TaskPriority(get("priority") or TaskPriority.MEDIUM),
+        completed_day=completed_day,
+    )
+
+
+def contribution(facts: TaskFacts) -> Deltas:
+    deltas = Deltas()
+    deltas[facts.created_day, "created"] += 1
+    deltas[facts.created_day, f"created_{facts.priority.value}"] += 1
+    if facts.completed_day:
+        deltas[facts.completed_day, "completed"] += 1
+    return deltas
+
+
+def change(before: Optional[TaskFacts], after: Optional[TaskFacts]) -> Deltas:
+    """Counter changes for a task going from ``before`` to ``after``."""
+    deltas = contribution(after) if after else Deltas()
+    if before:
+        deltas.subtract(contribution(before))
+    return deltas
+
+
+class CRUDAnalytics:
+    """
+    Maintain and read the per-user daily task counters.
+
+    Changes are applied as ``counter = counter + delta`` upserts inside the
+    caller's transaction, so concurrent writers never lose an increment.
+    """
+
+    def __init__(self, model: type):
+        self.model = model
+
+    async def apply(
+        self, db: AsyncSession, *, owner_id: Union[str, uuid.UUID], deltas: Deltas
+    ) -> None:
+        days: Dict[date, Dict[str, int]] = {}
+        for (day, column), delta in deltas.items():
+            if delta:
+                days.setdefault(day, dict.fromkeys(COUNTER_COLUMNS, 0))[column] += delta
+        if not days:
+            return
+
+        insert = postgresql.insert if self._dialect(db) == "postgresql" else sqlite.insert
+        stmt = insert(self.model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["owner_id", "day"],
+            set_={
+                column: self.model.__table__.c[column] + stmt.excluded[column]
+                for column in COUNTER_COLUMNS
+            },
+        )
+        await db.execute(
+            stmt,
+            [{"owner_id": owner_id, "day": day, **counts} for day, counts in days.items()],
+        )
+
+    async def record(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: Union[str, uuid.UUID],
+        before: Optional[TaskFacts] = None,
+        after: Optional[TaskFacts] = None,
+    ) -> None:
+        """Account for one task being created, changed or deleted."""
+        await self.apply(db, owner_id=owner_id, deltas=change(before, after))
+
+    async def aggregate(
+        self, db: AsyncSession, *, project_id: Optional[Any] = None
+    ) -> Dict[Any, Deltas]:
+        """
+        Count tasks straight from the tasks table, per owner.
+
+        Covers one project or, without ``project_id``, every task.
+        """
+        created_day = self._utc_day(db, Task.created_at)
+        completed_day = self._utc_day(db, Task.completed_at)
+        created = (
+            select(Project.owner_id, created_day, Task.priority, func.count())
+            .select_from(Task)
+            .join(Task.project)
+            .group_by(Project.owner_id, created_day, Task.priority)
+        )
+        completed = (
+            select(Project.owner_id, completed_day, func.count())
+            .select_from(Task)
+            .join(Task.project)
+            .where(Task.status == TaskStatus.DONE, Task.completed_at.is_not(None))
+            .group_by(Project.owner_id, completed_day)
+        )
+        if project_id is not None:
+            created = created.where(Task.project_id == project_id)
+            completed = completed.where(Task.project_id == project_id)
+
+        owners: Dict[Any, Deltas] = {}
+        for owner_id, day, priority, count in await db.execute(created):
+            priority = priority or TaskPriority.MEDIUM
+            deltas = owners.setdefault(owner_id, Deltas())
+            deltas[day, "created"] += count
+            deltas[day, f"created_{priority.value}"] += count
+        for owner_id, day, count in await db.execute(completed):
+            owners.setdefault(owner_id, Deltas())[day, "completed"] += count
+        return owners
+
+    async def remove_project(self, db: AsyncSession, *, project_id: Any) -> None:
+        """Take a project's tasks out of the counters before it is deleted."""
+        for owner_id, deltas in (await self.aggregate(db, project_id=project_id)).items():
+            await self.apply(
+                db, owner_id=owner_id, deltas=Deltas({k: -v for k, v in deltas.items()})
+            )
+
+    async def get_totals(
+        self, db: AsyncSession, *, owner_id: Union[str, uuid.UUID], since: date
+    ) -> Dict[str, int]:
+        """Sum the owner's counters from ``since`` through today."""
+        result = await db.execute(
+            select(
+                *(
+                    func.coalesce(func.sum(self.model.__table__.c[column]), 0).label(column)
+                    for column in COUNTER_COLUMNS
+                )
+            ).where(self.model.owner_id == owner_id, self.model.day >= since)
+        )
+        return dict(result.mappings().one())
+
+    def _utc_day(self, db: AsyncSession, column):
+        # SQLite stores naive UTC timestamps; PostgreSQL converts timestamptz
+        # with the session time zone unless told otherwise
+        if self._dialect(db) == "postgresql":
+            column = func.timezone("UTC", column)
+        return func.date(column, type_=Date)
+
+    @staticmethod
+    def _dialect(db: AsyncSession) -> str:
+        return db.bind.dialect.name
+
+
+analytics_crud = CRUDAnalytics(TaskDailyStats)
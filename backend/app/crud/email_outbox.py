@@ -0,0 +1,110 @@
+# app/crud/email_outbox.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import RowMapping, bindparam, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.email import FAILED, PENDING, OutboxEmail
+
+outbox_table = OutboxEmail.__table__
+
+_reschedule = (
+    update(outbox_table)
+    .where(outbox_table.c.id == bindparam("email_id"))
+    .values(next_attempt_at=bindparam("retry_at"), last_error=bindparam("error"))
+)
+_fail = (
+    update(outbox_table)
+    .where(outbox_table.c.id == bindparam("email_id"))
+    .values(status=FAILED, last_error=bindparam("error"))
+)
+
+
+class CRUDEmailOutbox:
+    """
+    The queue of outgoing mail between the requests that write it and the
+    delivery worker that sends it.
+    """
+
+    async def enqueue(
+        self, db: AsyncSession, *, recipient: str, subject: str, body: str
+    ) -> None:
+        """Queue a plain-text message, due at once, and commit it."""
+        await db.execute(
+            insert(outbox_table).values(
+                recipient=recipient,
+                subject=subject,
+                body=body,
+                next_attempt_at=datetime.utcnow(),
+            )
+        )
+        await db.commit()
+
+    async def claim(
+        self, db: AsyncSession, *, limit: int, lease: float, now: Optional[datetime] = None
+    ) -> List[RowMapping]:
+        """
+        Take up to ``limit`` due messages, oldest first, and commit the claim.
+
+        Claimed messages are due again ``lease`` seconds later, which keeps
+        other workers off them while this one sends and brings them back
+        should it die first. The claim counts as an attempt. On PostgreSQL
+        concurrent claims skip each other's rows rather than wait for them.
+        """
+        now = now or datetime.utcnow()
+        due = (
+            select(outbox_table.c.id)
+            .where(outbox_table.c.status == PENDING, outbox_table.c.next_attempt_at <= now)
+            .order_by(outbox_table.c.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(due), outbox_table.c.next_attempt_at <= now)
+            .values(
+                next_attempt_at=now + timedelta(seconds=lease),
+                attempts=outbox_table.c.attempts + 1,
+            )
+            .returning(
+                outbox_table.c.id,
+                outbox_table.c.recipient,
+                outbox_table.c.subject,
+                outbox_table.c.body,
+                outbox_table.c.attempts,
+            )
+        )
+        rows = result.mappings().all()
+        await db.commit()
+        return rows
+
+    async def record_results(
+        self,
+        db: AsyncSession,
+        *,
+        sent: Iterable[Any] = (),
+        retries: Iterable[Dict[str, Any]] = (),
+        failures: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """
+        Settle one batch in one transaction: delete the sent messages,
+        reschedule ``retries`` ({email_id, retry_at, error}) and give up on
+        ``failures`` ({email_id, error}).
+        """
+        sent, retries, failures = list(sent), list(retries), list(failures)
+        if sent:
+            await db.execute(delete(outbox_table).where(outbox_table.c.id.in_(sent)))
+        if retries:
+            await db.execute(_reschedule, retries)
+        if failures:
+            await db.execute(_fail, failures)
+        await db.commit()
+
+    async def count(self, db: AsyncSession, *, status: str = PENDING) -> int:
+        return await db.scalar(
+            select(func.count()).select_from(outbox_table).where(outbox_table.c.status == status)
+        )
+
+
+outbox_crud = CRUDEmailOutbox()
@@ -1,13 +1,25 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 import uuid
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.change_feed import change_broker, change_event
+from app.core.redis_config import bump_namespace
+from app.crud.analytics import analytics_crud
 from app.crud.base import CRUDBase
+from app.crud.search import search_crud
+from app.crud.versions import versions_crud
 from app.models.project import Project
 from app.models.task import Task, TaskStatus
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from app.utils.pagination import keyset_after
+
+# Stable listing order; the id makes it total
+SORT_KEYS = ("created_at", "id")
+
+# Columns of a project row as the API returns it, in the schema's field order
+PROJECT_FIELDS = tuple(ProjectSchema.model_fields)
 
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
@@ -26,12 +38,72 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
             
         db_obj = Project(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
+        await db.flush()
+        await search_crud.index_project(db, db_obj)
+        await versions_crud.touch(db, owner_ids=[owner_id])
         await db.commit()
         await db.refresh(db_obj)
+
+        await bump_namespace(f"user:{owner_id}")
+        await change_broker.publish(
+            owner_id, db_obj.id, change_event("project.created", db_obj.id)
+        )
         return db_obj
 
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Project,
+        obj_in: Union[ProjectUpdate, Dict[str, Any]],
+    ) -> Project:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            if hasattr(type(db_obj), field):
+                setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        # Reindexed in the same transaction as the rename
+        await search_crud.index_project(db, db_obj)
+        await versions_crud.touch(db, project_ids=[db_obj.id])
+        await db.commit()
+        await db.refresh(db_obj)
+
+        await bump_namespace(f"user:{db_obj.owner_id}")
+        await change_broker.publish(
+            db_obj.owner_id, db_obj.id, change_event("project.updated", db_obj.id)
+        )
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Project:
+        result = await db.execute(select(Project).where(Project.id == id))
+        obj = result.scalars().first()
+        if obj:
+            # Tasks go with the project (ORM cascade), and so do their
+            # documents and their share of the analytics counters
+            await search_crud.remove_project(db, project_id=obj.id)
+            await analytics_crud.remove_project(db, project_id=obj.id)
+            await versions_crud.touch(db, owner_ids=[obj.owner_id])
+            await db.delete(obj)
+            await db.commit()
+            await bump_namespace(f"project:{obj.id}")
+            await bump_namespace(f"user:{obj.owner_id}")
+            await change_broker.publish(
+                obj.owner_id, obj.id, change_event("project.deleted", obj.id)
+            )
+        return obj
+
     async def get_multi_by_owner(
-        self, db: AsyncSession, *, owner_id: str, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Project]:
         # Convert string to UUID if needed
         if isinstance(owner_id, str):
@@ -40,67 +112,65 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         query = (
             select(Project)
             .where(Project.owner_id == owner_id)
-            .offset(skip)
+            .order_by(*(getattr(Project, key) for key in SORT_KEYS))
             .limit(limit)
         )
+        if cursor:
+            query = query.where(keyset_after(Project, SORT_KEYS, cursor))
+        else:
+            query = query.offset(skip)
         result = await db.execute(query)
         return result.scalars().all()
 
     async def get_projects_with_task_counts(
-        self, db: AsyncSession, *, owner_id: str, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[dict]:
         # Convert string to UUID if needed
         if isinstance(owner_id, str):
             owner_id = uuid.UUID(owner_id)
             
+        # One query: the page of projects is read in index order and each
+        # count is a correlated subquery answered from the
+        # (project_id, status, order) index, so no GROUP BY or sort is needed.
+        # Rows come back in the shape of ProjectWithTaskCount, ready to send
+        # with ORJSONResponse.
+        total_tasks = (
+            select(func.count())
+            .where(Task.project_id == Project.id)
+            .correlate(Project)
+            .scalar_subquery()
+            .label("total_tasks")
+        )
+        completed_tasks = (
+            select(func.count())
+            .where(Task.project_id == Project.id, Task.status == TaskStatus.DONE)
+            .correlate(Project)
+            .scalar_subquery()
+            .label("completed_tasks")
+        )
+        projects = Project.__table__
         query = (
-            select(Project)
+            select(
+                *(projects.c[field] for field in PROJECT_FIELDS),
+                total_tasks,
+                completed_tasks,
+            )
             .where(Project.owner_id == owner_id)
-            .offset(skip)
+            .order_by(*(getattr(Project, key) for key in SORT_KEYS))
             .limit(limit)
         )
+        if cursor:
+            query = query.where(keyset_after(Project, SORT_KEYS, cursor))
+        else:
+            query = query.offset(skip)
         result = await db.execute(query)
-        projects = result.scalars().all()
-
-        result = []
-        for project in projects:
-            # Get total tasks count
-            total_query = (
-                select(func.count())
-                .select_from(Task)
-                .where(Task.project_id == project.id)
-            )
-            total_result = await db.execute(total_query)
-            total_tasks = total_result.scalar() or 0
-            
-            # Get completed tasks count
-            completed_query = (
-                select(func.count())
-                .select_from(Task)
-                .where(
-                    Task.project_id == project.id, 
-                    Task.status == TaskStatus.DONE
-                )
-            )
-            completed_result = await db.execute(completed_query)
-            completed_tasks = completed_result.scalar() or 0
-
-            # Make sure the dict keys match your Pydantic model attributes exactly
-            project_data = {
-                "id": project.id,
-                "name": project.name,
-                "description": project.description,
-                "deadline": getattr(project, "deadline", None),
-                "owner_id": project.owner_id,
-                "created_at": project.created_at,
-                "updated_at": project.updated_at,
-                "total_tasks": total_tasks,
-                "completed_tasks": completed_tasks,
-            }
-            
-            result.append(project_data)
-
-        return result
+        return [dict(row) for row in result.mappings()]
 
 
 project_crud = CRUDProject(Project)
\ No newline at end of file
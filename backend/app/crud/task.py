@@ -1,107 +1,635 @@
 # app/crud/task.py
-from typing import List, Optional, Union, Dict, Any
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, List, Mapping, Optional, Sequence, Union, Dict, Any, Tuple
+import uuid
 
+from app.crud.analytics import analytics_crud, change, contribution, task_facts
 from app.crud.base import CRUDBase
-from app.models.task import Task
+from app.crud.search import search_crud
+from app.crud.versions import versions_crud
+from app.models.task import Task, TaskStatus
 from app.models.project import Project
-from app.schemas.task import TaskCreate, TaskUpdate
-from app.core.redis_config import cache_with_timeout, invalidate_cache, clear_cache_by_pattern
+from app.schemas.task import (
+    Task as TaskSchema,
+    TaskCreate,
+    TaskReorderItem,
+    TaskUpdate,
+)
+from app.core.cache_serializer import RowSerializer, SchemaSerializer
+from app.core.change_feed import change_broker, change_event
+from app.core.redis_config import (
+    bump_namespace,
+    cache_with_timeout,
+    invalidate_cache,
+    is_cache_enabled,
+)
+from app.utils.pagination import keyset_after
+from app.utils.priority import calculate_priority_score
+from app.utils.ranking import RANK_STEP, rank_between, spaced_ranks
 
-from sqlalchemy import select
+from sqlalchemy import RowMapping, case, delete, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+
+class NeighbourNotInColumn(LookupError):
+    """A move named a neighbour that isn't another card of the target column."""
+
+
+def _project_namespaces(args: Dict[str, Any]) -> List[str]:
+    # Writes bump "project:<uuid>", so any spelling of the id a caller
+    # passes (no dashes, upper case) must name the same namespace
+    return [f"project:{uuid.UUID(str(args['project_id']))}"]
+
+
+# Stable listing order (board order, then creation); the id makes it total
+SORT_KEYS = ("order", "created_at", "id")
+
+# Fields copied into the task's search document
+SEARCH_FIELDS = {"title", "description", "project_id"}
+
+# Columns of a task row as the API returns it, in the schema's field order
+TASK_FIELDS = tuple(TaskSchema.model_fields)
+
+# Deepest subtask level the hierarchy loader will follow; also stops the
+# recursion should parent links ever form a cycle
+HIERARCHY_MAX_DEPTH = 64
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
-    @cache_with_timeout(prefix="task", timeout=3600)
+    async def _invalidate_project_caches(
+        self, db: AsyncSession, project_id: Any, owner_id: Any = None
+    ) -> None:
+        """Bump the project's and its owner's cache namespaces (one INCR each)."""
+        if not is_cache_enabled():
+            return
+        await bump_namespace(f"project:{project_id}")
+        if owner_id is None:
+            owner_id = await self._owner_id(db, project_id)
+        if owner_id:
+            await bump_namespace(f"user:{owner_id}")
+
+    @cache_with_timeout(
+        prefix="task", timeout=3600, serializer=SchemaSerializer(TaskSchema, model=Task)
+    )
     async def get(self, db: AsyncSession, id: str) -> Optional[Task]:
         result = await db.execute(select(self.model).where(self.model.id == id))
         return result.scalars().first()
     
-    @cache_with_timeout(prefix="tasks_by_project", timeout=1800)
+    def _rows(self, result) -> List[Dict[str, Any]]:
+        return [dict(row) for row in result.mappings()]
+
+    @cache_with_timeout(
+        prefix="tasks_by_project",
+        timeout=1800,
+        serializer=RowSerializer(),
+        namespaces=_project_namespaces,
+    )
     async def get_multi_by_project(
         self, 
         db: AsyncSession, 
         project_id: str, 
         skip: int = 0, 
-        limit: int = 100
-    ) -> List[Task]:
-        result = await db.execute(
-            select(self.model)
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of a project's tasks as rows of ``TASK_FIELDS``.
+
+        Rows are ready to send with ``ORJSONResponse``; cached pages come
+        back with their values already in JSON form.
+        """
+        tasks = self.model.__table__
+        query = (
+            select(*(tasks.c[field] for field in TASK_FIELDS))
             .where(self.model.project_id == project_id)
-            .offset(skip)
+            .order_by(*(getattr(self.model, key) for key in SORT_KEYS))
             .limit(limit)
         )
-        return result.scalars().all()
+        if cursor:
+            query = query.where(keyset_after(self.model, SORT_KEYS, cursor))
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query)
+        return self._rows(result)
     
     async def get_multi_by_owner(
         self,
         db: AsyncSession,
         owner_id: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Task]:
-        # This would join with projects to filter by owner
-        # For example:
-        result = await db.execute(
-            select(self.model)
-            .join(self.model.project)  # Assuming there's a relationship defined
-            .where(Project.owner_id == owner_id)  # You'll need to import Project
-            .offset(skip)
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """One page of the owner's tasks as rows of ``TASK_FIELDS``."""
+        tasks = self.model.__table__
+        query = (
+            select(*(tasks.c[field] for field in TASK_FIELDS))
+            .join(self.model.project)
+            .where(Project.owner_id == owner_id)
+            .order_by(*(getattr(self.model, key) for key in SORT_KEYS))
             .limit(limit)
         )
-        return result.scalars().all()
+        if cursor:
+            query = query.where(keyset_after(self.model, SORT_KEYS, cursor))
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query)
+        return self._rows(result)
     
+    async def _owner_id(self, db: AsyncSession, project_id: Any) -> Any:
+        return await db.scalar(select(Project.owner_id).where(Project.id == project_id))
+
+    @staticmethod
+    def _track_completion(task: Task, previous_status: Optional[TaskStatus]) -> None:
+        """Stamp completed_at when a task becomes DONE; clear it if reopened."""
+        if task.status == TaskStatus.DONE and previous_status != TaskStatus.DONE:
+            task.completed_at = datetime.utcnow()
+        elif task.status != TaskStatus.DONE:
+            task.completed_at = None
+
+    def _score(self, task: Task) -> float:
+        return calculate_priority_score(
+            task.priority, task.due_date, task.created_at, now=datetime.utcnow()
+        )
+
     async def create(self, db: AsyncSession, *, obj_in: TaskCreate) -> Task:
         db_obj = self.model(**obj_in.dict())
+        owner_id = await self._owner_id(db, db_obj.project_id)
+        db_obj.owner_id = owner_id
+        db_obj.priority_score = self._score(db_obj)
+        self._track_completion(db_obj, None)
         db.add(db_obj)
+        await db.flush()
+        await search_crud.index_task(db, db_obj)
+        if owner_id:
+            await analytics_crud.record(db, owner_id=owner_id, after=task_facts(db_obj))
+        await versions_crud.touch(db, project_ids=[db_obj.project_id])
         await db.commit()
         await db.refresh(db_obj)
         
         # Invalidate project tasks cache
-        await clear_cache_by_pattern(f"tasks_by_project:{db_obj.project_id}*")
+        await self._invalidate_project_caches(db, db_obj.project_id)
+        await change_broker.publish(
+            owner_id,
+            db_obj.project_id,
+            change_event("task.created", db_obj.project_id, [db_obj.id]),
+        )
         return db_obj
     
-    async def update(self, db: AsyncSession, *, db_obj: Task, obj_in: Union[TaskUpdate, Dict[str, Any]]) -> Task:
+    async def create_many(
+        self, db: AsyncSession, *, owner_id: Any, tasks: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert task rows (complete column dicts, ids included) of one owner's
+        projects with a single executemany and commit them.
+
+        Parents must precede their subtasks in ``tasks``.
+        """
+        if not tasks:
+            return
+        await db.execute(insert(self.model.__table__), tasks)
+        await search_crud.add_tasks(db, owner_id=owner_id, tasks=tasks)
+        deltas = Counter()
+        for task in tasks:
+            deltas.update(contribution(task_facts(task)))
+        await analytics_crud.apply(db, owner_id=owner_id, deltas=deltas)
+        await versions_crud.touch(db, project_ids=[task["project_id"] for task in tasks])
+        await db.commit()
+
+        created: Dict[Any, List[Any]] = {}
+        for task in tasks:
+            created.setdefault(task["project_id"], []).append(task["id"])
+        for project_id, task_ids in created.items():
+            await self._invalidate_project_caches(db, project_id)
+            await change_broker.publish(
+                owner_id, project_id, change_event("task.created", project_id, task_ids)
+            )
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Task, obj_in: Union[TaskUpdate, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        update_owned on behalf of the task's own owner, for callers that
+        hold a Task rather than a request's principal.
+
+        Returns the updated row, or None if the task is gone or is being
+        moved to a project of someone else's.
+        """
+        task = await self.get_with_owner(db, id=db_obj.id)
+        if task is None:
+            return None
+        return await self.update_owned(db, task=task, owner_id=task["owner_id"], obj_in=obj_in)
+
+    @staticmethod
+    def _owned_projects(owner_id: Any):
+        return select(Project.id).where(Project.owner_id == owner_id)
+
+    async def get_with_owner(self, db: AsyncSession, *, id: Any) -> Optional[RowMapping]:
+        """
+        A task's columns (owner_id among them) plus its project's version
+        and changed_at, in one query; None if there is no such task.
+
+        Callers compare owner_id themselves, so a task of someone else's
+        (403) is told apart from a missing one (404) by the same query.
+        """
+        tasks = self.model.__table__
+        result = await db.execute(
+            select(tasks, Project.version, Project.changed_at)
+            .join(Project, Project.id == tasks.c.project_id)
+            .where(tasks.c.id == id)
+        )
+        return result.mappings().first()
+
+    async def update_owned(
+        self,
+        db: AsyncSession,
+        *,
+        task: Mapping[str, Any],
+        owner_id: Any,
+        obj_in: Union[TaskUpdate, Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply ``obj_in`` to a row from get_with_owner with a single
+        UPDATE ... RETURNING that only matches a task of ``owner_id``'s
+        projects (and, when it changes project, only if the new one is
+        theirs too).
+
+        Returns the updated row, or None if nothing matched: the task was
+        deleted or moved since it was read, or the new project isn't the
+        owner's. Readers see the update through the returned row; nothing
+        is loaded back after the commit.
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        
-        # Rest of your update logic
-        for field in update_data:
-            setattr(db_obj, field, update_data[field])
-        
-        db.add(db_obj)
+
+        now = datetime.utcnow()
+        changed = {**task, **update_data}
+        values = dict(update_data)
+        values["priority_score"] = calculate_priority_score(
+            changed["priority"], changed["due_date"], changed["created_at"], now=now
+        )
+        if changed["status"] != TaskStatus.DONE:
+            values["completed_at"] = None
+        elif task["status"] != TaskStatus.DONE:
+            values["completed_at"] = now
+
+        tasks = self.model.__table__
+        query = update(tasks).where(
+            tasks.c.id == task["id"],
+            tasks.c.project_id.in_(self._owned_projects(owner_id)),
+        )
+        moved = changed["project_id"] != task["project_id"]
+        if moved:
+            query = query.where(
+                self._owned_projects(owner_id)
+                .where(Project.id == changed["project_id"])
+                .exists()
+            )
+        result = await db.execute(query.values(**values).returning(*tasks.c))
+        row = result.mappings().first()
+        if row is None:
+            return None
+
+        if SEARCH_FIELDS.intersection(update_data):
+            await search_crud.index_task(db, row, owner_id=owner_id)
+        # Both projects are the owner's, so a move alone changes no counts
+        before, after = task_facts(task), task_facts(row)
+        if after != before:
+            await analytics_crud.record(db, owner_id=owner_id, before=before, after=after)
+        await versions_crud.touch(db, project_ids=[task["project_id"], row["project_id"]])
         await db.commit()
-        await db.refresh(db_obj)
-        
+
+        await invalidate_cache("task", str(row["id"]))
+        await self._invalidate_project_caches(db, row["project_id"], owner_id)
+        await change_broker.publish(
+            owner_id,
+            row["project_id"],
+            change_event("task.updated", row["project_id"], [row["id"]]),
+        )
+        if moved:
+            await self._invalidate_project_caches(db, task["project_id"], owner_id)
+            # Gone as far as the old project's board is concerned
+            await change_broker.publish(
+                owner_id,
+                task["project_id"],
+                change_event("task.deleted", task["project_id"], [row["id"]]),
+            )
+        return dict(row)
+
+    async def remove_owned(
+        self, db: AsyncSession, *, id: Any, owner_id: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Delete one of ``owner_id``'s tasks with a single DELETE ... RETURNING.
+
+        Returns the deleted row, or None if the owner has no such task;
+        callers that need to say whether it exists at all ask afterwards,
+        so only a refused delete pays for a second query.
+        """
+        tasks = self.model.__table__
+        result = await db.execute(
+            delete(tasks)
+            .where(tasks.c.id == id, tasks.c.project_id.in_(self._owned_projects(owner_id)))
+            .returning(*tasks.c)
+        )
+        row = result.mappings().first()
+        if row is None:
+            return None
+
+        # Subtasks become roots, as the ORM delete would have made them;
+        # ON DELETE SET NULL isn't enforced on SQLite
+        await db.execute(
+            update(tasks).where(tasks.c.parent_task_id == row["id"]).values(parent_task_id=None)
+        )
+        await search_crud.remove(db, ref_id=row["id"])
+        await analytics_crud.record(db, owner_id=owner_id, before=task_facts(row))
+        await versions_crud.touch(db, project_ids=[row["project_id"]])
+        await db.commit()
+
+        await invalidate_cache("task", str(row["id"]))
+        await self._invalidate_project_caches(db, row["project_id"], owner_id)
+        await change_broker.publish(
+            owner_id,
+            row["project_id"],
+            change_event("task.deleted", row["project_id"], [row["id"]]),
+        )
+        return dict(row)
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[Dict[str, Any]]:
+        """remove_owned on behalf of the task's own owner; None if there's no such task."""
+        owner_id = await db.scalar(select(self.model.owner_id).where(self.model.id == id))
+        if owner_id is None:
+            return None
+        return await self.remove_owned(db, id=id, owner_id=owner_id)
+
+    async def get_owners(
+        self, db: AsyncSession, ids: List[Any]
+    ) -> Dict[Any, Tuple[Any, Any]]:
+        """Map task ids to (project_id, owner_id) with a single query."""
+        result = await db.execute(
+            select(self.model.id, self.model.project_id, Project.owner_id)
+            .join(self.model.project)
+            .where(self.model.id.in_(ids))
+        )
+        return {
+            task_id: (project_id, owner_id)
+            for task_id, project_id, owner_id in result.all()
+        }
+
+    async def reorder(
+        self, db: AsyncSession, *, moves: List[TaskReorderItem], owner_id: Any
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Apply a batch of (task_id, status, order) moves in one transaction.
+
+        The moves are written by one UPDATE ... RETURNING that only matches
+        tasks of ``owner_id``'s projects. Returns the updated rows, or None
+        (with nothing written) unless every task matched: a task is missing
+        or someone else's, or was deleted or moved since it was read.
+        """
+        if not moves:
+            return []
+
+        tasks = self.model.__table__
+        ids = list({move.task_id for move in moves})
+        owned = tasks.c.id.in_(ids), tasks.c.project_id.in_(self._owned_projects(owner_id))
+        # Moves across columns can complete or reopen tasks
+        result = await db.execute(select(tasks).where(*owned))
+        current = {row["id"]: row for row in result.mappings()}
+        if len(current) != len(ids):
+            return None
+
+        now = datetime.utcnow()
+        deltas: Counter = Counter()
+        for move in moves:
+            row = current[move.task_id]
+            completed_at = row["completed_at"]
+            if move.status != TaskStatus.DONE:
+                completed_at = None
+            elif row["status"] != TaskStatus.DONE:
+                completed_at = now
+            moved = {**row, "status": move.status, "order": move.order, "completed_at": completed_at}
+            deltas.update(change(task_facts(row), task_facts(moved)))
+            # A task moved twice in one batch starts its second move here
+            current[move.task_id] = moved
+
+        def per_task(column: str):
+            return case(
+                {task_id: literal(row[column], tasks.c[column].type) for task_id, row in current.items()},
+                value=tasks.c.id,
+            )
+
+        result = await db.execute(
+            update(tasks)
+            .where(*owned)
+            .values(
+                status=per_task("status"),
+                order=per_task("order"),
+                completed_at=per_task("completed_at"),
+            )
+            .returning(*tasks.c)
+        )
+        rows = [dict(row) for row in result.mappings()]
+        if len(rows) != len(ids):
+            await db.rollback()
+            return None
+
+        await analytics_crud.apply(db, owner_id=owner_id, deltas=deltas)
+        await versions_crud.touch(db, project_ids=[row["project_id"] for row in rows])
+        await db.commit()
+
         # Invalidate caches
-        await invalidate_cache("task", str(db_obj.id))
-        await clear_cache_by_pattern(f"tasks_by_project:{db_obj.project_id}*")
-        return db_obj
-    
-    async def remove(self, db: AsyncSession, *, id: str) -> Task:
-        result = await db.execute(select(self.model).where(self.model.id == id))
-        task = result.scalars().first()
-        if task:
-            # Invalidate caches before deletion
-            await invalidate_cache("task", str(task.id))
-            await clear_cache_by_pattern(f"tasks_by_project:{task.project_id}*")
-            await db.delete(task)
-            await db.commit()
-        return task
-    
-    @cache_with_timeout(prefix="tasks_hierarchy", timeout=1800)
-    async def get_tasks_with_subtasks(self, db: AsyncSession, project_id: str) -> List[Task]:
+        for row in rows:
+            await invalidate_cache("task", str(row["id"]))
+        by_project: Dict[Any, List[Any]] = {}
+        for row in rows:
+            by_project.setdefault(row["project_id"], []).append(row["id"])
+        for project_id, task_ids in by_project.items():
+            await self._invalidate_project_caches(db, project_id)
+            await change_broker.publish(
+                owner_id, project_id, change_event("task.updated", project_id, task_ids)
+            )
+        return rows
+
+    async def _rebalance(
+        self, db: AsyncSession, *, project_id: Any, status: TaskStatus, exclude_id: Any
+    ) -> Dict[Any, int]:
+        """Respace the ranks of one board column, returning the new ranks."""
         result = await db.execute(
-            select(self.model)
+            select(self.model.id)
             .where(
                 self.model.project_id == project_id,
-                self.model.parent_task_id.is_(None)
+                self.model.status == status,
+                self.model.id != exclude_id,
+            )
+            .order_by(self.model.order, self.model.created_at, self.model.id)
+        )
+        ids = result.scalars().all()
+        ranks = dict(zip(ids, spaced_ranks(len(ids))))
+        if ranks:
+            await db.execute(
+                update(self.model),
+                [{"id": task_id, "order": rank} for task_id, rank in ranks.items()],
+            )
+        return ranks
+
+    async def move(
+        self,
+        db: AsyncSession,
+        *,
+        task: Mapping[str, Any],
+        owner_id: Any,
+        status: TaskStatus,
+        after_task_id: Optional[Any] = None,
+        before_task_id: Optional[Any] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Move a task (a row from get_with_owner) between two neighbours of a
+        column, through update_owned.
+
+        The task takes a rank between its neighbours, so normally only its own
+        row changes; the column is respaced when the neighbours have no gap.
+
+        Raises NeighbourNotInColumn if a neighbour given isn't another task
+        of the project's ``status`` column: the client's view of the column
+        is out of date, and placing the card at an edge instead would
+        silently put it somewhere else.
+        """
+        neighbour_ids = [i for i in (after_task_id, before_task_id) if i]
+        ranks: Dict[Any, int] = {}
+        if neighbour_ids:
+            result = await db.execute(
+                select(self.model.id, self.model.order).where(
+                    self.model.id.in_(neighbour_ids),
+                    self.model.id != task["id"],
+                    self.model.project_id == task["project_id"],
+                    self.model.status == status,
+                )
+            )
+            ranks = dict(result.all())
+            if len(ranks) != len(neighbour_ids):
+                # Also refuses the same task given as both neighbours
+                raise NeighbourNotInColumn("Neighbour task is not in the target column")
+
+        order = rank_between(ranks.get(after_task_id), ranks.get(before_task_id))
+        if order is None:
+            ranks = await self._rebalance(
+                db, project_id=task["project_id"], status=status, exclude_id=task["id"]
+            )
+            order = rank_between(ranks.get(after_task_id), ranks.get(before_task_id))
+        if order is None:
+            # Still no gap: the neighbours aren't adjacent (the client saw the
+            # column in another order), so go right below the card above
+            order = ranks[after_task_id] + RANK_STEP // 2
+
+        return await self.update_owned(
+            db, task=task, owner_id=owner_id, obj_in={"status": status, "order": order}
+        )
+
+    def _hierarchy_cte(
+        self, project_id: Any, root_task_id: Optional[Any], max_depth: Optional[int]
+    ):
+        """Recursive CTE of (id, depth) for a project's forest or one subtree."""
+        if max_depth is None or max_depth > HIERARCHY_MAX_DEPTH:
+            max_depth = HIERARCHY_MAX_DEPTH
+
+        tasks = self.model.__table__
+        anchor = select(tasks.c.id, literal(0).label("depth")).where(
+            tasks.c.project_id == project_id
+        )
+        if root_task_id is None:
+            anchor = anchor.where(tasks.c.parent_task_id.is_(None))
+        else:
+            anchor = anchor.where(tasks.c.id == root_task_id)
+        tree = anchor.cte("task_tree", recursive=True)
+        return tree.union_all(
+            select(tasks.c.id, (tree.c.depth + 1).label("depth"))
+            .join(tree, tasks.c.parent_task_id == tree.c.id)
+            .where(tasks.c.project_id == project_id, tree.c.depth < max_depth)
+        )
+
+    async def stream_for_export(
+        self,
+        db: AsyncSession,
+        *,
+        project_id: Any,
+        fields: Sequence[str],
+        root_task_id: Optional[Any] = None,
+        max_depth: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Yield a project's task rows in batches from a server-side cursor.
+
+        Without ``root_task_id`` the whole project comes back in listing
+        order. With it, that task's subtree comes back level by level (each
+        parent before its subtasks) with an extra ``depth`` column.
+        """
+        tasks = self.model.__table__
+        columns = [tasks.c[field] for field in fields]
+        if root_task_id is None:
+            query = (
+                select(*columns)
+                .where(tasks.c.project_id == project_id)
+                .order_by(*(tasks.c[key] for key in SORT_KEYS))
+            )
+        else:
+            tree = self._hierarchy_cte(project_id, root_task_id, max_depth)
+            query = (
+                select(*columns, tree.c.depth)
+                .join(tree, tasks.c.id == tree.c.id)
+                .order_by(tree.c.depth, *(tasks.c[key] for key in SORT_KEYS))
             )
-            .options(selectinload(self.model.subtasks))
+
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            yield rows
+
+    @cache_with_timeout(
+        prefix="tasks_hierarchy",
+        timeout=1800,
+        serializer=RowSerializer(),
+        namespaces=_project_namespaces,
+    )
+    async def get_tasks_with_subtasks(
+        self,
+        db: AsyncSession,
+        project_id: str,
+        root_task_id: Optional[str] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load a project's task forest (or one task's subtree) with a single
+        recursive CTE and assemble it in memory.
+
+        ``max_depth`` counts subtask levels below the roots: 0 returns the
+        roots alone. Rows come back ordered by depth, so every parent is
+        built before its children and assembly is one pass over the rows.
+        Nodes are plain dicts in the shape of ``TaskWithSubtasks``.
+        """
+        tasks = self.model.__table__
+        tree = self._hierarchy_cte(project_id, root_task_id, max_depth)
+        result = await db.execute(
+            select(*(tasks.c[field] for field in TASK_FIELDS), tree.c.depth)
+            .join(tree, tasks.c.id == tree.c.id)
+            .order_by(tree.c.depth, tasks.c.order, tasks.c.created_at, tasks.c.id)
         )
-        return result.scalars().all()
+
+        nodes: Dict[Any, Dict[str, Any]] = {}
+        roots: List[Dict[str, Any]] = []
+        for row in result.mappings():
+            if row["id"] in nodes:
+                continue
+            node = {field: row[field] for field in TASK_FIELDS}
+            node["subtasks"] = []
+            nodes[row["id"]] = node
+            parent = nodes.get(row["parent_task_id"]) if row["depth"] else None
+            if parent is None:
+                roots.append(node)
+            else:
+                parent["subtasks"].append(node)
+        return roots
 
 # Create an instance of the CRUD class to be imported elsewhere
 task_crud = CRUDTask(Task)
\ No newline at end of file
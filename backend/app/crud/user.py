@@ -1,11 +1,15 @@
 from typing import Any, Dict, Optional, Union
 
-from app.core.security import get_password_hash, verify_password
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash, verify_and_update_password
 from app.crud.base import CRUDBase
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import Principal, UserCreate, UserUpdate
+from app.utils.blob_store import avatar_store
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -14,10 +18,40 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(select(User).where(User.email == email))
         return result.scalars().first()
 
+    async def get_principal(self, db: AsyncSession, *, id: Any) -> Optional[Principal]:
+        """Load only the columns needed for authorization."""
+        result = await db.execute(
+            select(User.id, User.email, User.name, User.is_active).where(User.id == id)
+        )
+        row = result.first()
+        return Principal.model_validate(row) if row else None
+
+    async def get_avatar(self, db: AsyncSession, *, id: Any):
+        """Avatar digest and media type without touching the legacy blob."""
+        result = await db.execute(
+            select(User.avatar_digest, User.profile_picture_type).where(User.id == id)
+        )
+        return result.first()
+
+    async def move_legacy_picture(self, db: AsyncSession, *, id: Any) -> Optional[str]:
+        """Copy an in-row profile picture to the blob store and clear the column."""
+        result = await db.execute(select(User.profile_picture).where(User.id == id))
+        data = result.scalar()
+        if not data:
+            return None
+        digest = await run_in_threadpool(avatar_store.save_bytes, data)
+        await db.execute(
+            update(User)
+            .where(User.id == id)
+            .values(avatar_digest=digest, profile_picture=None)
+        )
+        await db.commit()
+        return digest
+
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
         db_obj = User(
             email=obj_in.email,
-            password_hash=get_password_hash(obj_in.password),
+            password_hash=await get_password_hash(obj_in.password),
             name=obj_in.name,
         )
         db.add(db_obj)
@@ -34,32 +68,41 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             update_data = obj_in.dict(exclude_unset=True)
         
         if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["password_hash"] = hashed_password
         
         for field in update_data:
-            if hasattr(db_obj, field):
+            if hasattr(type(db_obj), field):
                 setattr(db_obj, field, update_data[field])
         
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+
+        await principal_cache.invalidate(db_obj.id)
         return db_obj
 
     async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        valid, new_hash = await verify_and_update_password(password, user.password_hash)
+        if not valid:
             return None
+        if new_hash:
+            # Hashed at an outdated cost; upgrade it while we have the password
+            user.password_hash = new_hash
+            await db.commit()
         return user
     
     async def update_password(self, db: AsyncSession, *, user: User, new_password: str) -> User:
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await get_password_hash(new_password)
         db.add(user)
         await db.commit()
         await db.refresh(user)
+
+        await principal_cache.invalidate(user.id)
         return user
 
 user = CRUDUser(User)
\ No newline at end of file
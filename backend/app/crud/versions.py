@@ -0,0 +1,91 @@
+# app/crud/versions.py
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+projects_table = Project.__table__
+users_table = User.__table__
+
+
+class CRUDVersions:
+    """
+    Change counters behind conditional GETs.
+
+    Every write to a project or its tasks bumps that project's ``version``
+    and its owner's ``data_version`` in the writer's own transaction, so a
+    reader never sees new data under an old validator.
+    """
+
+    async def touch(
+        self,
+        db: AsyncSession,
+        *,
+        project_ids: Iterable[Any] = (),
+        owner_ids: Iterable[Any] = (),
+    ) -> None:
+        """Bump the given projects, their owners and any extra owners."""
+        project_ids = [p for p in set(project_ids) if p is not None]
+        owner_ids = {o for o in owner_ids if o is not None}
+        if project_ids:
+            await db.execute(
+                update(projects_table)
+                .where(projects_table.c.id.in_(project_ids))
+                # Listed so the updated_at onupdate default leaves it alone
+                .values(
+                    version=projects_table.c.version + 1,
+                    changed_at=func.now(),
+                    updated_at=projects_table.c.updated_at,
+                )
+            )
+            owner_ids.update(
+                (
+                    await db.execute(
+                        select(projects_table.c.owner_id).where(
+                            projects_table.c.id.in_(project_ids)
+                        )
+                    )
+                ).scalars()
+            )
+        if owner_ids:
+            await db.execute(
+                update(users_table)
+                .where(users_table.c.id.in_(owner_ids))
+                .values(
+                    data_version=users_table.c.data_version + 1,
+                    data_changed_at=func.now(),
+                    updated_at=users_table.c.updated_at,
+                )
+            )
+
+    async def get_project(self, db: AsyncSession, *, project_id: Any) -> Optional[Row]:
+        """(owner_id, version, changed_at) of a project."""
+        result = await db.execute(
+            select(Project.owner_id, Project.version, Project.changed_at).where(
+                Project.id == project_id
+            )
+        )
+        return result.first()
+
+    async def get_task(self, db: AsyncSession, *, task_id: Any) -> Optional[Row]:
+        """(owner_id, version, changed_at) of the project holding a task."""
+        result = await db.execute(
+            select(Project.owner_id, Project.version, Project.changed_at)
+            .join(Task, Task.project_id == Project.id)
+            .where(Task.id == task_id)
+        )
+        return result.first()
+
+    async def get_owner(self, db: AsyncSession, *, owner_id: Any) -> Optional[Row]:
+        """(version, changed_at) covering all of a user's projects and tasks."""
+        result = await db.execute(
+            select(User.data_version, User.data_changed_at).where(User.id == owner_id)
+        )
+        return result.first()
+
+
+versions_crud = CRUDVersions()
@@ -0,0 +1,44 @@
+# app/jobs/analytics_rollup.py
+"""
+Rebuild the analytics rollup (task_daily_stats) from the tasks table.
+
+CRUDTask keeps the rollup current as tasks change; run this once after the
+migration that adds it, or any time the counters are suspected to have
+drifted:
+
+    python -m app.jobs.analytics_rollup
+"""
+import asyncio
+import logging
+
+from sqlalchemy import delete
+
+from app.core.database import AsyncSessionLocal
+from app.crud.analytics import analytics_crud
+from app.models.analytics import TaskDailyStats
+from app.models import project, task, user  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_task_daily_stats() -> int:
+    """
+    Replace every counter row with fresh counts, returning the owner count.
+
+    Runs as one transaction, so readers see either the old or the new
+    rollup; counts come from two GROUP BY queries over tasks.
+    """
+    async with AsyncSessionLocal() as db:
+        owners = await analytics_crud.aggregate(db)
+        await db.execute(delete(TaskDailyStats))
+        for owner_id, deltas in owners.items():
+            await analytics_crud.apply(db, owner_id=owner_id, deltas=deltas)
+        await db.commit()
+
+    logger.info(f"Rebuilt daily task stats for {len(owners)} users")
+    return len(owners)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild_task_daily_stats())
@@ -0,0 +1,252 @@
+# app/jobs/email_outbox.py
+"""
+Deliver the email outbox over SMTP sessions kept open between batches.
+
+Each round claims up to EMAIL_BATCH_SIZE due messages, sends them over
+EMAIL_SMTP_CONNECTIONS sessions at once and settles the whole batch in one
+transaction. Sessions stay open from one round to the next, so a burst of
+mail pays for the TCP and TLS handshakes and the login once per session
+rather than once per message; they're closed after EMAIL_SMTP_IDLE_TIMEOUT
+seconds without use.
+
+A failed message is retried with exponential backoff until it has had
+EMAIL_MAX_ATTEMPTS attempts; one refused outright (a 5xx reply to its
+sender, recipient or data) fails at once. Delivery is at least once: a
+worker that dies between sending and settling leaves its claimed messages
+to be sent again after EMAIL_CLAIM_TIMEOUT.
+
+Every web worker runs the loop unless EMAIL_OUTBOX_WORKER is off, in which
+case run it as a process of its own:
+
+    python -m app.jobs.email_outbox
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+import aiosmtplib
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.email_outbox import outbox_crud
+
+logger = logging.getLogger(__name__)
+
+# Refusals of the message itself, as opposed to trouble with the session
+REFUSALS = (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused, aiosmtplib.SMTPDataError)
+
+_wakeup: Optional[asyncio.Event] = None
+
+
+def build_message(email: Mapping[str, Any]) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = email["recipient"]
+    message["Subject"] = email["subject"]
+    # The same on every attempt, so a resend after a lost reply is recognisable
+    domain = settings.MAIL_FROM.rpartition("@")[2] or "localhost"
+    message["Message-ID"] = f"<outbox.{email['id']}@{domain}>"
+    message.set_content(email["body"])
+    return message
+
+
+def is_permanent(error: Exception) -> bool:
+    """Whether the server refused the message for good (a 5xx reply)."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(refused.code >= 500 for refused in error.recipients)
+    return isinstance(error, REFUSALS) and error.code >= 500
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the given number of attempts, with jitter."""
+    delay = min(
+        settings.EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.EMAIL_RETRY_MAX_DELAY
+    )
+    return random.uniform(delay / 2, delay)
+
+
+class SMTPPool:
+    """SMTP sessions kept open between batches, each sending one message at a time."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._clients: List[Optional[aiosmtplib.SMTP]] = [None] * size
+        self.last_used = time.monotonic()
+        self.stats = dict.fromkeys(("connections", "sent", "retried", "failed"), 0)
+
+    def _new_client(self) -> aiosmtplib.SMTP:
+        credentials = {}
+        if settings.MAIL_USE_CREDENTIALS:
+            credentials = {"username": settings.MAIL_USERNAME, "password": settings.MAIL_PASSWORD}
+        return aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS and not settings.MAIL_SSL_TLS,
+            validate_certs=settings.MAIL_VALIDATE_CERTS,
+            timeout=settings.EMAIL_SMTP_TIMEOUT,
+            **credentials,
+        )
+
+    async def _session(self, lane: int) -> Tuple[aiosmtplib.SMTP, bool]:
+        """The lane's open session, connecting (and logging in) if need be."""
+        client = self._clients[lane]
+        if client is not None and client.is_connected:
+            return client, False
+        client = self._new_client()
+        await client.connect()
+        self.stats["connections"] += 1
+        self._clients[lane] = client
+        return client, True
+
+    def _drop(self, lane: int) -> None:
+        client, self._clients[lane] = self._clients[lane], None
+        if client is not None:
+            client.close()
+
+    async def _send_one(self, lane: int, message: EmailMessage) -> Optional[Exception]:
+        """
+        Send over the lane's session, returning the server's refusal if any.
+
+        Anything else wrong with the session is raised, after closing it.
+        """
+        while True:
+            client, fresh = await self._session(lane)
+            try:
+                await client.send_message(message)
+                return None
+            except REFUSALS as e:
+                # The client has already reset the transaction
+                return e
+            except aiosmtplib.SMTPServerDisconnected:
+                self._drop(lane)
+                # A kept session the server has since closed: try a new one
+                if fresh:
+                    raise
+            except BaseException:
+                self._drop(lane)
+                raise
+
+    async def send(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        """
+        Send ``messages`` over up to ``size`` sessions at once, returning
+        each one's error, or None for those sent.
+
+        A lane whose session fails leaves its remaining messages to the
+        others; if every session fails, the rest share the last error.
+        """
+        self.last_used = time.monotonic()
+        errors: List[Optional[Exception]] = [None] * len(messages)
+        queue = deque(range(len(messages)))
+        session_error: Optional[Exception] = None
+
+        async def run_lane(lane: int) -> None:
+            nonlocal session_error
+            while queue:
+                n = queue.popleft()
+                try:
+                    errors[n] = await self._send_one(lane, messages[n])
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    errors[n] = session_error = e
+                    return
+
+        await asyncio.gather(*(run_lane(lane) for lane in range(min(self.size, len(messages)))))
+        for n in queue:
+            errors[n] = session_error
+        self.last_used = time.monotonic()
+        return errors
+
+    async def close(self) -> None:
+        """Say goodbye on every open session."""
+        for lane, client in enumerate(self._clients):
+            if client is not None and client.is_connected:
+                try:
+                    await client.quit()
+                except aiosmtplib.SMTPException:
+                    pass
+            self._drop(lane)
+
+    async def close_idle(self, idle_timeout: float) -> None:
+        if any(self._clients) and time.monotonic() - self.last_used > idle_timeout:
+            await self.close()
+
+
+async def deliver_batch(pool: SMTPPool, limit: Optional[int] = None) -> int:
+    """Claim, send and settle one batch, returning how many messages were claimed."""
+    async with AsyncSessionLocal() as db:
+        emails = await outbox_crud.claim(
+            db, limit=limit or settings.EMAIL_BATCH_SIZE, lease=settings.EMAIL_CLAIM_TIMEOUT
+        )
+        if not emails:
+            return 0
+        errors = await pool.send([build_message(email) for email in emails])
+
+        now = datetime.utcnow()
+        sent, retries, failures = [], [], []
+        for email, error in zip(emails, errors):
+            if error is None:
+                sent.append(email["id"])
+                continue
+            reason = f"{type(error).__name__}: {error}"
+            if is_permanent(error) or email["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+                logger.warning(f"Giving up on email {email['id']} to {email['recipient']}: {reason}")
+                failures.append({"email_id": email["id"], "error": reason})
+            else:
+                retry_at = now + timedelta(seconds=retry_delay(email["attempts"]))
+                retries.append({"email_id": email["id"], "retry_at": retry_at, "error": reason})
+        await outbox_crud.record_results(db, sent=sent, retries=retries, failures=failures)
+
+    pool.stats["sent"] += len(sent)
+    pool.stats["retried"] += len(retries)
+    pool.stats["failed"] += len(failures)
+    if retries:
+        logger.warning(f"Email delivery: {len(retries)} of {len(emails)} messages to retry")
+    return len(emails)
+
+
+async def drain(pool: SMTPPool) -> None:
+    """Deliver batches until none are due."""
+    while await deliver_batch(pool):
+        pass
+
+
+def wake() -> None:
+    """Have this worker look for new mail now rather than at its next poll."""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def run_worker() -> None:
+    global _wakeup
+    _wakeup = asyncio.Event()
+    pool = SMTPPool(settings.EMAIL_SMTP_CONNECTIONS)
+    while True:
+        _wakeup.clear()
+        try:
+            claimed = await deliver_batch(pool)
+        except Exception:
+            logger.exception("Email delivery failed")
+            claimed = 0
+        if claimed >= settings.EMAIL_BATCH_SIZE:
+            # Likely more due already
+            continue
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), settings.EMAIL_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        await pool.close_idle(settings.EMAIL_SMTP_IDLE_TIMEOUT)
+
+
+def start_worker() -> "asyncio.Task[None]":
+    return asyncio.create_task(run_worker())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
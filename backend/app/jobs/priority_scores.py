@@ -0,0 +1,171 @@
+# app/jobs/priority_scores.py
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import JobRun
+from app.models.task import Task
+from app.services.prioritization import OPEN_STATUSES
+from app.utils.priority import (
+    AGE_FACTOR_PER_DAY,
+    DEFAULT_PRIORITY_WEIGHT,
+    MAX_OVERDUE_DAYS,
+    NO_DUE_DATE_FACTOR,
+    PRIORITY_WEIGHTS,
+    as_naive_utc,
+)
+
+logger = logging.getLogger(__name__)
+
+# Workers race to insert this job's row for the day in job_runs
+JOB_NAME = "priority_scores"
+
+tasks_table = Task.__table__
+# Only if the inputs are still those scored: a task edited meanwhile keeps
+# the score its update wrote
+_update_scores = (
+    update(tasks_table)
+    .where(
+        tasks_table.c.id == bindparam("task_id", type_=tasks_table.c.id.type),
+        tasks_table.c.priority.is_not_distinct_from(
+            bindparam("read_priority", type_=tasks_table.c.priority.type)
+        ),
+        tasks_table.c.due_date.is_not_distinct_from(
+            bindparam("read_due_date", type_=tasks_table.c.due_date.type)
+        ),
+    )
+    .values(priority_score=bindparam("score"))
+)
+
+
+def score_columns(priorities, due_dates, created_ats, *, now: datetime) -> np.ndarray:
+    """
+    Vectorized ``calculate_priority_score`` over one batch of columns.
+
+    Python only converts each value to a number; the scoring itself runs as
+    NumPy array operations.
+    """
+    count = len(priorities)
+    today = now.date().toordinal()
+    weights = np.fromiter(
+        (PRIORITY_WEIGHTS.get(p, DEFAULT_PRIORITY_WEIGHT) for p in priorities),
+        dtype=np.float64,
+        count=count,
+    )
+    due = np.fromiter(
+        (d.toordinal() - today if d else np.nan for d in due_dates),
+        dtype=np.float64,
+        count=count,
+    )
+    age = np.fromiter(
+        ((now - as_naive_utc(c)).days if c else 0 for c in created_ats),
+        dtype=np.float64,
+        count=count,
+    )
+
+    with np.errstate(invalid="ignore"):
+        overdue = np.exp2(np.clip(-due, 0, MAX_OVERDUE_DAYS))
+        upcoming = 1 / (1 + np.maximum(due, 0))
+        due_factor = np.where(
+            np.isnan(due), NO_DUE_DATE_FACTOR, np.where(due < 0, overdue, upcoming)
+        )
+    return weights * due_factor * (1 + np.maximum(age, 0) * AGE_FACTOR_PER_DAY)
+
+
+async def recompute_priority_scores(
+    *, now: Optional[datetime] = None, batch_size: Optional[int] = None
+) -> int:
+    """
+    Refresh the stored score of every open task, returning how many were
+    scored.
+
+    Open tasks are walked by primary key in batches; each batch is fetched as
+    columns, scored with NumPy and written back with one executemany UPDATE
+    in its own transaction, so memory stays flat however many rows exist.
+    A task whose priority or due date changed after its batch was read is
+    left alone; the update that changed it also rescored it.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.PRIORITY_SCORE_BATCH_SIZE
+    updated = 0
+    last_id = None
+
+    async with AsyncSessionLocal() as db:
+        while True:
+            query = (
+                select(Task.id, Task.priority, Task.due_date, Task.created_at)
+                .where(Task.status.in_(OPEN_STATUSES))
+                .order_by(Task.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(Task.id > last_id)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+
+            ids, priorities, due_dates, created_ats = zip(*rows)
+            scores = score_columns(priorities, due_dates, created_ats, now=now)
+            await db.execute(
+                _update_scores,
+                [
+                    {
+                        "task_id": task_id,
+                        "read_priority": priority,
+                        "read_due_date": due_date,
+                        "score": score,
+                    }
+                    for task_id, priority, due_date, score in zip(
+                        ids, priorities, due_dates, scores.tolist()
+                    )
+                ],
+            )
+            await db.commit()
+
+            updated += len(ids)
+            last_id = ids[-1]
+
+    logger.info(f"Recomputed priority scores for {updated} open tasks")
+    return updated
+
+
+async def _claim_run(day: date) -> bool:
+    """Record the day's run, False if some worker already has."""
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(insert(JobRun).values(job=JOB_NAME, day=day))
+            await db.commit()
+        except IntegrityError:
+            return False
+    return True
+
+
+async def run_nightly():
+    """
+    Recompute scores shortly after each UTC midnight, and at startup if
+    that day's run is missing.
+
+    Only the first worker to claim a day runs it.
+    """
+    while True:
+        now = datetime.utcnow()
+        try:
+            if await _claim_run(now.date()):
+                await recompute_priority_scores(now=now)
+        except Exception:
+            logger.exception("Priority score recompute failed")
+
+        now = datetime.utcnow()
+        next_run = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        await asyncio.sleep((next_run - now).total_seconds() + 60)
+
+
+def start_scheduler() -> "asyncio.Task[None]":
+    return asyncio.create_task(run_nightly())
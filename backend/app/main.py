@@ -5,30 +5,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.v1.api import api_router
+from app.core.change_feed import change_broker
 from app.core.config import settings
-from app.core.database import engine
-from app.core.redis_config import initialize_redis
-
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from app.core.database import get_pool_stats
+from app.core.redis_config import get_cache_stats, initialize_redis
+from app.jobs import email_outbox, priority_scores
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# Create tables in the database
-async def create_tables():
-    logger.info("Creating database tables")
-    from app.core.database import Base
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables created")
-
-
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
@@ -36,11 +23,6 @@ app = FastAPI(
     redoc_url=f"{settings.API_V1_STR}/redoc",
 )
 
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
-
 # Set up CORS
 app.add_middleware(
     CORSMiddleware,
@@ -70,12 +52,35 @@ def health_check():
     """Health check endpoint for monitoring and load balancers"""
     return {"status": "healthy"}
 
+
+@app.get("/health/pool")
+def pool_health():
+    """Connection pool statistics (checked out, overflow, checkout wait time)"""
+    return get_pool_stats()
+
+
+@app.get("/health/cache")
+def cache_health():
+    """Cache statistics for this worker (L1/L2 hits, misses, coalesced loads)"""
+    return get_cache_stats()
+
+
+@app.get("/health/changes")
+def change_feed_health():
+    """Change feed statistics for this worker (open streams, events fanned out)"""
+    return change_broker.get_stats()
+
 # Startup event to initialize database
 @app.on_event("startup")
 async def startup_event():
     await initialize_redis()
+    change_broker.start_listener()
+    # The schema is managed by Alembic: run `alembic upgrade head` first
     logger.info("Initializing service")
-    await create_tables()
+    if settings.PRIORITY_SCORE_SCHEDULER:
+        priority_scores.start_scheduler()
+    if settings.EMAIL_OUTBOX_WORKER:
+        email_outbox.start_worker()
     logger.info("Service started")
 
 
@@ -0,0 +1,25 @@
+# app/models/analytics.py
+from sqlalchemy import Column, Date, Integer
+
+from app.core.database import Base, GUID
+
+
+class TaskDailyStats(Base):
+    """
+    Per-user, per-UTC-day task counters behind /dashboard/analytics.
+
+    ``created`` and the ``created_<priority>`` columns count the user's tasks
+    by the day they were created (at their current priority), ``completed``
+    by the day they were marked done. CRUDTask keeps them in step with the
+    tasks table; app/jobs/analytics_rollup.py rebuilds them from scratch.
+    """
+    __tablename__ = "task_daily_stats"
+
+    owner_id = Column(GUID(), primary_key=True)
+    day = Column(Date, primary_key=True)
+    created = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+    created_low = Column(Integer, nullable=False, default=0, server_default="0")
+    created_medium = Column(Integer, nullable=False, default=0, server_default="0")
+    created_high = Column(Integer, nullable=False, default=0, server_default="0")
+    created_urgent = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,38 @@
+# app/models/email.py
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+# Outbox statuses; sent messages are deleted rather than kept
+PENDING = "pending"
+FAILED = "failed"
+
+
+class OutboxEmail(Base):
+    """
+    A message waiting to be sent by the delivery worker (app/jobs/email_outbox.py).
+
+    Queued in the same database as everything else, so a message survives a
+    restart between the request that wrote it and its delivery. A pending
+    message is due once ``next_attempt_at`` has passed; claiming one pushes
+    it into the future, which hides it from other workers while it's sent.
+    Messages that run out of attempts, or are refused outright, stay behind
+    as ``failed``.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default=PENDING, server_default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # The worker's claim: due pending messages, oldest first
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,20 @@
+# app/models/job.py
+from sqlalchemy import Column, Date, DateTime, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class JobRun(Base):
+    """
+    One row per scheduled job and day it has run (or is running).
+
+    Workers claim a day by inserting its row; the primary key lets only one
+    of them succeed, and the row tells a worker started later in the day
+    that the run has already happened.
+    """
+    __tablename__ = "job_runs"
+
+    job = Column(String(64), primary_key=True)
+    day = Column(Date, primary_key=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
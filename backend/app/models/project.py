@@ -1,10 +1,11 @@
 # app/models/project.py
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base, GUID
+from app.utils.db_types import SortableTimestamp
 
 
 class Project(Base):
@@ -14,8 +15,12 @@ class Project(Base):
     name = Column(String, nullable=False)
     description = Column(Text)
     deadline = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(SortableTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped on every write to the project or its tasks (crud/versions.py);
+    # validators for conditional GETs
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Foreign keys
     owner_id = Column(GUID(), ForeignKey("users.id"))
@@ -23,3 +28,8 @@ class Project(Base):
     # Relationships
     owner = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination of a user's projects (crud/project.py SORT_KEYS)
+        Index("ix_projects_owner_created", "owner_id", "created_at", "id"),
+    )
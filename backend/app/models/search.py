@@ -0,0 +1,23 @@
+# app/models/search.py
+from sqlalchemy import Column, Integer, String, Text
+
+from app.core.database import Base, GUID
+
+
+class SearchDocument(Base):
+    """
+    Searchable text of one task or project, kept in sync by the CRUD layer.
+
+    The text index itself is dialect specific and lives in the migrations:
+    an FTS5 table (``search_index``) fed by triggers on SQLite, a generated
+    ``document`` tsvector column with a GIN index on PostgreSQL.
+    """
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(16), nullable=False)  # "task" or "project"
+    ref_id = Column(GUID(), nullable=False, unique=True)
+    owner_id = Column(GUID(), nullable=False, index=True)
+    project_id = Column(GUID(), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    body = Column(Text)
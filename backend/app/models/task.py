@@ -1,12 +1,12 @@
 # app/models/task.py
 import uuid
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, Integer, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base, GUID
-from app.utils.db_types import CustomDate
+from app.utils.db_types import CustomDate, SortableTimestamp
 
 class TaskStatus(str, PyEnum):
     TODO = "todo"
@@ -30,15 +30,46 @@ class Task(Base):
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
     due_date = Column(CustomDate, nullable=True)
-    order = Column(Integer, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    order = Column(Integer, nullable=False, default=0, server_default="0")
+    # Stored priority score (app/utils/priority.py), refreshed nightly
+    priority_score = Column(Float, nullable=False, default=0, server_default="0")
+    created_at = Column(SortableTimestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set when the task moves to DONE, cleared if it is reopened
+    completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Foreign keys
     project_id = Column(GUID(), ForeignKey("projects.id", ondelete="CASCADE"))
-    parent_task_id = Column(GUID(), ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
+    # The project's owner, copied so per-owner queries need no join; projects
+    # never change owner and tasks only move between one owner's projects
+    owner_id = Column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    parent_task_id = Column(GUID(), ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     project = relationship("Project", back_populates="tasks")
     # Self-referential relationship for subtasks
-    parent_task = relationship("Task", remote_side=[id], backref="subtasks", passive_deletes=True)
\ No newline at end of file
+    parent_task = relationship("Task", remote_side=[id], backref="subtasks", passive_deletes=True)
+
+    __table_args__ = (
+        # Serves an owner's prioritized open tasks as an ORDER BY ... LIMIT
+        Index(
+            "ix_tasks_owner_open_priority",
+            "owner_id",
+            "priority_score",
+            sqlite_where=text("status != 'DONE'"),
+            postgresql_where=text("status != 'DONE'"),
+        ),
+        # Serves an owner's open tasks due up to a date (the dashboard), in
+        # due date order
+        Index(
+            "ix_tasks_owner_open_due",
+            "owner_id",
+            "due_date",
+            sqlite_where=text("status != 'DONE'"),
+            postgresql_where=text("status != 'DONE'"),
+        ),
+        # Keyset pagination of a project's tasks (crud/task.py SORT_KEYS)
+        Index("ix_tasks_project_order", "project_id", "order", "created_at", "id"),
+        # Board columns: one status of a project in rank order
+        Index("ix_tasks_project_status_order", "project_id", "status", "order"),
+    )
@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Boolean, LargeBinary
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Boolean, LargeBinary, Integer
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base, GUID
@@ -13,11 +13,17 @@ class User(Base):
     password_hash = Column(String, nullable=False)
     name = Column(String)
     bio = Column(String, nullable=True)
-    profile_picture = Column(LargeBinary, nullable=True)
+    # Legacy in-row avatar; never loaded unless explicitly undeferred
+    profile_picture = deferred(Column(LargeBinary, nullable=True))
     profile_picture_type = Column(String, nullable=True)
+    # sha256 of the avatar in the blob store
+    avatar_digest = Column(String(64), nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped on every write to the user's projects or tasks (crud/versions.py)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    data_changed_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     projects = relationship("Project", back_populates="owner", cascade="all, delete-orphan")
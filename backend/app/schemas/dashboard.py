@@ -0,0 +1,59 @@
+# app/schemas/dashboard.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.task import TaskStatus, TaskPriority
+
+
+class TaskResponse(BaseModel):
+    id: Union[str, UUID]
+    title: str
+    description: Optional[str] = None
+    status: TaskStatus
+    priority: TaskPriority
+    due_date: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class ProjectWithTaskCounts(BaseModel):
+    id: Union[str, UUID]
+    name: str
+    task_count: int
+
+    class Config:
+        from_attributes = True
+        arbitrary_types_allowed = True
+
+
+class DashboardResponse(BaseModel):
+    recent_projects: List[ProjectWithTaskCounts]
+    today_tasks: List[TaskResponse]
+    overdue_tasks: List[TaskResponse]
+    upcoming_tasks: List[TaskResponse]
+    stats: Dict[str, Any]
+
+
+class PriorityDistribution(BaseModel):
+    urgent: int
+    high: int
+    medium: int
+    low: int
+
+
+class AnalyticsResponse(BaseModel):
+    period_days: int
+    completed_tasks: int
+    created_tasks: int
+    # Completed per 100 created in the period; can exceed 100 when older
+    # tasks get finished
+    completion_rate: float
+    # Tasks created in the period, by their current priority
+    priority_distribution: PriorityDistribution
@@ -0,0 +1,14 @@
+# app/schemas/search.py
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    kind: Literal["task", "project"]
+    id: UUID
+    project_id: UUID
+    title: str
+    # Higher is more relevant; only comparable within one response
+    score: float
@@ -14,6 +14,11 @@ class TaskBase(BaseModel):
     due_date: Optional[date] = None
     order: Optional[int] = 0
 
+    @validator("order", pre=True)
+    def default_order(cls, value):
+        # The column is NOT NULL; null means the default rank
+        return 0 if value is None else value
+
     # Add a validator to convert string dates to date objects
     @validator("due_date", pre=True)
     def parse_due_date(cls, value):
@@ -51,6 +56,8 @@ class TaskInDBBase(TaskBase):
     parent_task_id: Optional[UUID4] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    priority_score: Optional[float] = None
 
     class Config:
         from_attributes = True  # Updated from orm_mode = True
@@ -65,3 +72,37 @@ class TaskWithSubtasks(Task):
 
 
 TaskWithSubtasks.update_forward_refs()
+
+
+class TaskReorderItem(BaseModel):
+    task_id: UUID4
+    status: TaskStatus
+    order: int
+
+
+class TaskReorder(BaseModel):
+    moves: List[TaskReorderItem]
+
+
+class TaskMove(BaseModel):
+    status: TaskStatus
+    # Neighbours at the drop position; omit one (or both) at a column edge
+    after_task_id: Optional[UUID4] = None
+    before_task_id: Optional[UUID4] = None
+
+
+class TaskImportError(BaseModel):
+    # Line of the file the rejected record ends on (the CSV header is line 1)
+    row: int
+    # Set when the error covers the rows on lines row to last_row, such as
+    # a chunk the database rejected
+    last_row: Optional[int] = None
+    ref: Optional[str] = None
+    errors: List[str]
+
+
+class TaskImportResult(BaseModel):
+    created: int
+    failed: int
+    # The first TASK_IMPORT_MAX_ERRORS failures, in file order
+    errors: List[TaskImportError]
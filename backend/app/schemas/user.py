@@ -1,4 +1,5 @@
 # app/schemas/user.py
+import uuid
 from typing import Optional
 from pydantic import BaseModel, EmailStr, UUID4, Field
 from datetime import datetime
@@ -26,7 +27,7 @@ class UserProfileUpdate(BaseModel):
 class UserInDBBase(UserBase):
     id: UUID4
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
     profile_picture_url: Optional[str] = None
 
     class Config:
@@ -37,3 +38,13 @@ class UserOut(UserInDBBase):
 
 class UserInDB(UserInDBBase):
     password_hash: str
+
+class Principal(BaseModel):
+    """The columns authorization needs; cached per user by get_current_user."""
+    id: uuid.UUID
+    email: str
+    name: Optional[str] = None
+    is_active: Optional[bool] = True
+
+    class Config:
+        from_attributes = True
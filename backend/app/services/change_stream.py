@@ -0,0 +1,41 @@
+# app/services/change_stream.py
+from typing import Any, AsyncIterator, Optional
+
+from app.core.change_feed import KEEPALIVE, change_broker
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+EVENT_STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stops nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+# Milliseconds a disconnected EventSource waits before reconnecting
+RECONNECT_DELAY_MS = 3000
+PROJECT_DELETED = '"type":"project.deleted"'
+
+
+async def stream_changes(
+    owner_id: Any, project_id: Optional[Any] = None
+) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for one project, or for all of an owner's projects.
+
+    The caller has already checked that the owner may see the project; the
+    stream only ever carries events published for that owner, plus a
+    keep-alive comment every CHANGE_FEED_KEEPALIVE seconds. A project
+    stream ends after reporting the project's deletion.
+    """
+    subscription = change_broker.subscribe(owner_id, project_id)
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n".encode()
+        while True:
+            payload = await subscription.get()
+            if payload == KEEPALIVE:
+                yield b": keep-alive\n\n"
+                continue
+            yield f"data: {payload}\n\n".encode()
+            # Events carry only types and ids, never user text
+            if project_id is not None and PROJECT_DELETED in payload:
+                return
+    finally:
+        change_broker.unsubscribe(subscription)
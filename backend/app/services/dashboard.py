@@ -0,0 +1,205 @@
+# app/services/dashboard.py
+import json
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional, Union
+
+from redis.exceptions import RedisError
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_config import (
+    get_cached_value,
+    get_namespace_versions,
+    is_cache_enabled,
+    set_cached_value,
+    single_flight,
+)
+from app.crud.analytics import analytics_crud
+from app.crud.project import project_crud
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.schemas.dashboard import (
+    AnalyticsResponse,
+    DashboardResponse,
+    PriorityDistribution,
+    ProjectWithTaskCounts,
+    TaskResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+# Snapshots live under the owner's "user:<owner_id>" namespace, which
+# CRUDTask/CRUDProject bump on every write
+CACHE_PREFIX = "dashboard"
+RECENT_PROJECTS_LIMIT = 5
+UPCOMING_DAYS = 7
+
+
+def _seconds_until_midnight(now: datetime) -> int:
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+async def build_dashboard(
+    db: AsyncSession, *, owner_id: Union[str, uuid.UUID], today: date
+) -> DashboardResponse:
+    """
+    Build the dashboard with three queries: recent projects with counts,
+    open tasks due within the upcoming window, and the overall stats.
+    """
+    if isinstance(owner_id, str):
+        owner_id = uuid.UUID(owner_id)
+
+    projects = await project_crud.get_projects_with_task_counts(
+        db=db, owner_id=owner_id, limit=RECENT_PROJECTS_LIMIT
+    )
+
+    # One pass over open tasks due up to the end of the upcoming window;
+    # overdue, today and upcoming are bucketed in Python.
+    tomorrow = today + timedelta(days=1)
+    next_week = today + timedelta(days=UPCOMING_DAYS)
+    open_tasks_query = (
+        select(Task)
+        # Tasks carry their owner; with the status predicate this is a
+        # range of the partial ix_tasks_owner_open_due index
+        .where(
+            Task.owner_id == owner_id,
+            Task.status != TaskStatus.DONE,
+            Task.due_date.is_not(None),
+            Task.due_date <= next_week,
+        )
+        .order_by(Task.due_date)
+    )
+    result = await db.execute(open_tasks_query)
+
+    today_tasks, overdue_tasks, upcoming_tasks = [], [], []
+    for task in result.scalars():
+        if task.due_date < today:
+            overdue_tasks.append(TaskResponse.model_validate(task))
+        elif task.due_date < tomorrow:
+            today_tasks.append(TaskResponse.model_validate(task))
+        else:
+            upcoming_tasks.append(TaskResponse.model_validate(task))
+
+    total_projects = (
+        select(func.count())
+        .select_from(Project)
+        .where(Project.owner_id == owner_id)
+        .scalar_subquery()
+    )
+    stats_query = (
+        select(
+            total_projects,
+            func.count(Task.id),
+            func.count(case((Task.status == TaskStatus.DONE, Task.id))),
+        )
+        .select_from(Task)
+        .join(Task.project)
+        .where(Project.owner_id == owner_id)
+    )
+    result = await db.execute(stats_query)
+    total_projects, total_tasks, completed_tasks = result.one()
+
+    return DashboardResponse(
+        recent_projects=[
+            ProjectWithTaskCounts(
+                id=project["id"],
+                name=project["name"],
+                task_count=project["total_tasks"],  # Use total_tasks as the task_count
+            )
+            for project in projects
+        ],
+        today_tasks=today_tasks,
+        overdue_tasks=overdue_tasks,
+        upcoming_tasks=upcoming_tasks,
+        stats={
+            "total_projects": total_projects,
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "completion_rate": round(completed_tasks / total_tasks * 100, 1)
+            if total_tasks > 0
+            else 0,
+        },
+    )
+
+
+async def get_dashboard(
+    db: AsyncSession, *, owner_id: Union[str, uuid.UUID]
+) -> DashboardResponse:
+    """
+    Return the user's dashboard snapshot, rebuilding it on a cache miss.
+
+    Snapshots are tagged with the UTC day they were built for, so the date
+    buckets roll over at midnight even if no write invalidated them.
+    """
+    now = datetime.utcnow()
+    today = now.date()
+    if not is_cache_enabled():
+        return await build_dashboard(db, owner_id=owner_id, today=today)
+
+    try:
+        [version] = await get_namespace_versions([f"user:{owner_id}"])
+    except RedisError as e:
+        logger.error(f"Redis namespace lookup error: {e}")
+        return await build_dashboard(db, owner_id=owner_id, today=today)
+    cache_key = f"{CACHE_PREFIX}:v{version}:{owner_id}"
+
+    cached = await get_cached_value(cache_key)
+    if cached:
+        try:
+            snapshot = json.loads(cached)
+            if snapshot.get("day") == today.isoformat():
+                return DashboardResponse.model_validate(snapshot["data"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Discarding unreadable dashboard snapshot: {e}")
+
+    async def load() -> DashboardResponse:
+        dashboard = await build_dashboard(db, owner_id=owner_id, today=today)
+        snapshot = {"day": today.isoformat(), "data": dashboard.model_dump(mode="json")}
+        await set_cached_value(
+            cache_key,
+            json.dumps(snapshot),
+            min(settings.DASHBOARD_CACHE_TTL, _seconds_until_midnight(now)),
+        )
+        return dashboard
+
+    # Concurrent misses share one build; the response holds no ORM state
+    dashboard, _ = await single_flight.do(cache_key, load)
+    return dashboard
+
+
+async def get_analytics(
+    db: AsyncSession,
+    *,
+    owner_id: Union[str, uuid.UUID],
+    days: int,
+    today: Optional[date] = None,
+) -> AnalyticsResponse:
+    """
+    Summarize the last ``days`` UTC days, today included.
+
+    Reads the owner's daily rollup rows (one per active day), so the cost
+    follows the window length, not the number of tasks.
+    """
+    if isinstance(owner_id, str):
+        owner_id = uuid.UUID(owner_id)
+    today = today or datetime.utcnow().date()
+    totals = await analytics_crud.get_totals(
+        db, owner_id=owner_id, since=today - timedelta(days=days - 1)
+    )
+    created, completed = totals["created"], totals["completed"]
+    return AnalyticsResponse(
+        period_days=days,
+        created_tasks=created,
+        completed_tasks=completed,
+        completion_rate=round(completed / created * 100, 1) if created > 0 else 0,
+        priority_distribution=PriorityDistribution(
+            urgent=totals["created_urgent"],
+            high=totals["created_high"],
+            medium=totals["created_medium"],
+            low=totals["created_low"],
+        ),
+    )
@@ -0,0 +1,39 @@
+# app/services/prioritization.py
+import uuid
+from typing import List, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus
+
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+
+async def get_prioritized_tasks(
+    db: AsyncSession,
+    *,
+    owner_id: Union[str, uuid.UUID],
+    limit: int = 10,
+) -> List[Task]:
+    """
+    Return the owner's ``limit`` highest-scoring open tasks.
+
+    Scores are stored on the row (see app/utils/priority.py) and tasks carry
+    their owner, so this reads the top ``limit`` entries of the partial
+    (owner_id, priority_score) index over open tasks instead of scoring or
+    sorting every open task.
+    """
+    if isinstance(owner_id, str):
+        owner_id = uuid.UUID(owner_id)
+    if limit <= 0:
+        return []
+
+    result = await db.execute(
+        select(Task)
+        # Matches the index's predicate, so the index can serve the query
+        .where(Task.owner_id == owner_id, Task.status != TaskStatus.DONE)
+        .order_by(Task.priority_score.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
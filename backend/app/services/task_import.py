@@ -0,0 +1,299 @@
+# app/services/task_import.py
+import csv
+import io
+import logging
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.task import task_crud
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportResult
+from app.utils.priority import calculate_priority_score
+
+logger = logging.getLogger(__name__)
+
+# Optional column naming a row so later rows can use it as parent_task_id
+REF_FIELD = "ref"
+
+# (line, record) pairs; a record that could not be parsed is an error message
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+        "application/x-ndjson",
+        "application/jsonl",
+    ):
+        return "ndjson"
+    raise ImportFormatError("Unsupported import format; upload CSV or NDJSON")
+
+
+def _csv_records(stream: BinaryIO) -> Iterator[Record]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, "Row has more fields than the header"
+            continue
+        # Empty cells mean "not given", so the schema defaults apply
+        yield reader.line_num, {k: v for k, v in row.items() if v not in ("", None)}
+
+
+def _ndjson_records(stream: BinaryIO) -> Iterator[Record]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield line_number, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Each line must be a JSON object"
+            continue
+        yield line_number, {k: v for k, v in record.items() if v is not None}
+
+
+def _next_chunk(records: Iterator[Record], size: int) -> List[Record]:
+    return list(islice(records, size))
+
+
+def _format_validation_error(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    ]
+
+
+class TaskImporter:
+    """
+    Stream CSV or NDJSON task records into the database, one chunk at a time.
+
+    Each chunk is parsed off the event loop, validated with ``TaskCreate``,
+    checked against the owner's projects and existing parents with one query
+    each, then inserted with a single executemany in its own transaction.
+    Bad rows are reported and skipped; they never abort the import.
+
+    ``parent_task_id`` may name an existing task or the ``ref`` of an earlier
+    row in the same file.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: Union[str, uuid.UUID],
+        default_project_id: Optional[uuid.UUID] = None,
+        chunk_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+    ):
+        if isinstance(owner_id, str):
+            owner_id = uuid.UUID(owner_id)
+        self.db = db
+        self.owner_id = owner_id
+        self.default_project_id = default_project_id
+        self.chunk_size = chunk_size or settings.TASK_IMPORT_CHUNK_SIZE
+        self.max_errors = max_errors or settings.TASK_IMPORT_MAX_ERRORS
+        # ref -> (task id, project id) of rows imported so far
+        self.refs: Dict[str, Tuple[uuid.UUID, uuid.UUID]] = {}
+        # project id -> whether the owner may import into it
+        self.projects: Dict[uuid.UUID, Optional[bool]] = {}
+        self.created = 0
+        self.last_line = 0
+        self.failed = 0
+        self.errors: List[TaskImportError] = []
+
+    async def run(self, stream: BinaryIO, fmt: str) -> TaskImportResult:
+        records = _csv_records(stream) if fmt == "csv" else _ndjson_records(stream)
+        while True:
+            try:
+                chunk = await run_in_threadpool(_next_chunk, records, self.chunk_size)
+            except (UnicodeDecodeError, csv.Error) as e:
+                # The rest of the file can't be read; keep what was imported
+                self._reject(self.last_line + 1, None, [f"Unreadable file: {e}"])
+                break
+            if not chunk:
+                break
+            self.last_line = chunk[-1][0]
+            reported = len(self.errors)
+            await self._import_chunk(chunk)
+            # Rows fail at different stages of a chunk; list them as in the file
+            self.errors[reported:] = sorted(self.errors[reported:], key=lambda e: e.row)
+
+        return TaskImportResult(
+            created=self.created, failed=self.failed, errors=self.errors
+        )
+
+    def _reject(
+        self,
+        line: int,
+        ref: Optional[str],
+        errors: List[str],
+        *,
+        last_row: Optional[int] = None,
+        failed: int = 1,
+    ) -> None:
+        """Record ``failed`` rows as not imported, under one reported error."""
+        self.failed += failed
+        if len(self.errors) < self.max_errors:
+            self.errors.append(
+                TaskImportError(row=line, last_row=last_row, ref=ref, errors=errors)
+            )
+
+    async def _import_chunk(self, chunk: List[Record]) -> None:
+        candidates = []
+        for line, record in chunk:
+            if isinstance(record, str):
+                self._reject(line, None, [record])
+                continue
+            ref = record.pop(REF_FIELD, None)
+            ref = str(ref) if ref is not None else None
+            parent = record.pop("parent_task_id", None)
+            if self.default_project_id and "project_id" not in record:
+                record["project_id"] = self.default_project_id
+            try:
+                task_in = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                self._reject(line, ref, _format_validation_error(e))
+                continue
+            parent = str(parent) if parent is not None else None
+            candidates.append((line, ref, parent, task_in))
+
+        await self._load_projects({task_in.project_id for *_, task_in in candidates})
+        existing_parents = await self._load_parents(
+            {parent for _, _, parent, _ in candidates if parent and parent not in self.refs}
+        )
+
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        lines: List[int] = []
+        chunk_refs: List[str] = []
+        for line, ref, parent, task_in in candidates:
+            errors = []
+            allowed = self.projects.get(task_in.project_id)
+            if allowed is None:
+                errors.append("Project not found")
+            elif not allowed:
+                errors.append("Not enough permissions")
+
+            parent_id = None
+            if parent is not None:
+                # References to rows of this file win over task ids
+                parent_id, parent_project_id = (
+                    self.refs.get(parent) or existing_parents.get(parent) or (None, None)
+                )
+                if parent_id is None:
+                    errors.append("Parent task not found")
+                elif parent_project_id != task_in.project_id:
+                    errors.append("Parent task belongs to another project")
+
+            if ref is not None and ref in self.refs:
+                errors.append(f"Duplicate ref {ref!r}")
+            if errors:
+                self._reject(line, ref, errors)
+                continue
+
+            row = self._row(task_in, parent_id, now)
+            rows.append(row)
+            lines.append(line)
+            if ref is not None:
+                self.refs[ref] = (row["id"], row["project_id"])
+                chunk_refs.append(ref)
+
+        if not rows:
+            return
+        try:
+            await task_crud.create_many(self.db, owner_id=self.owner_id, tasks=rows)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.warning(f"Task import chunk failed: {e}")
+            for ref in chunk_refs:
+                del self.refs[ref]
+            # The whole chunk was rolled back; report it once, not per row
+            self._reject(
+                lines[0],
+                None,
+                [
+                    f"Database error: none of the {len(rows)} valid rows on lines "
+                    f"{lines[0]}-{lines[-1]} were imported"
+                ],
+                last_row=lines[-1],
+                failed=len(rows),
+            )
+            return
+        self.created += len(rows)
+
+    def _row(
+        self, task_in: TaskCreate, parent_id: Optional[uuid.UUID], now: datetime
+    ) -> Dict[str, Any]:
+        priority = task_in.priority or TaskPriority.MEDIUM
+        status = task_in.status or TaskStatus.TODO
+        return {
+            "id": uuid.uuid4(),
+            "project_id": task_in.project_id,
+            "owner_id": self.owner_id,
+            "parent_task_id": parent_id,
+            "title": task_in.title,
+            "description": task_in.description,
+            "status": status,
+            "priority": priority,
+            "due_date": task_in.due_date,
+            "order": task_in.order or 0,
+            "completed_at": now if status == TaskStatus.DONE else None,
+            "priority_score": calculate_priority_score(
+                priority, task_in.due_date, now, now=now
+            ),
+        }
+
+    async def _load_projects(self, project_ids: set) -> None:
+        missing = [p for p in project_ids if p not in self.projects]
+        if not missing:
+            return
+        result = await self.db.execute(
+            select(Project.id, Project.owner_id).where(Project.id.in_(missing))
+        )
+        owners = dict(result.all())
+        for project_id in missing:
+            owner_id = owners.get(project_id)
+            # None marks a project that doesn't exist
+            self.projects[project_id] = None if owner_id is None else owner_id == self.owner_id
+
+    async def _load_parents(
+        self, parents: set
+    ) -> Dict[str, Tuple[uuid.UUID, uuid.UUID]]:
+        """Map parent ids given as text to (id, project_id) of the owner's tasks."""
+        ids = {}
+        for parent in parents:
+            try:
+                ids[uuid.UUID(parent)] = parent
+            except ValueError:
+                continue
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Task.id, Task.project_id)
+            .join(Task.project)
+            .where(Task.id.in_(list(ids)), Project.owner_id == self.owner_id)
+        )
+        return {
+            ids[task_id]: (task_id, project_id) for task_id, project_id in result.all()
+        }
@@ -0,0 +1,127 @@
+# app/utils/blob_store.py
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails are skipped without Pillow
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Variant name -> longest edge in pixels; "original" is the upload itself
+AVATAR_VARIANTS: Dict[str, int] = {"small": 64, "medium": 256}
+VARIANT_MEDIA_TYPE = "image/png"
+
+
+class BlobTooLarge(Exception):
+    pass
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class BlobStore:
+    """
+    Content-addressed files on disk.
+
+    A blob is stored once under ``<root>/<aa>/<bb>/<sha256>`` no matter how
+    many times it is uploaded; derived variants sit next to it as
+    ``<sha256>.<variant>``.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, digest: str, variant: str = "original") -> str:
+        name = digest if variant == "original" else f"{digest}.{variant}"
+        return os.path.join(self.root, digest[:2], digest[2:4], name)
+
+    def exists(self, digest: str, variant: str = "original") -> bool:
+        return os.path.exists(self.path(digest, variant))
+
+    def save_stream(self, source: BinaryIO, max_bytes: Optional[int] = None) -> str:
+        """Copy a file object into the store chunk by chunk; return its digest."""
+        os.makedirs(self.root, exist_ok=True)
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"Blob exceeds {max_bytes} bytes")
+                    sha.update(chunk)
+                    tmp.write(chunk)
+            digest = sha.hexdigest()
+            self._place(tmp_path, digest)
+            return digest
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save_bytes(self, data: bytes) -> str:
+        return self.save_stream(io.BytesIO(data))
+
+    def make_variants(
+        self, digest: str, sizes: Dict[str, int], max_pixels: Optional[int] = None
+    ) -> Tuple[str, ...]:
+        """
+        Write resized PNG variants once; returns the variants available.
+
+        Raises ImageTooLarge, before decoding, for an image of more than
+        ``max_pixels`` pixels or one Pillow flags as a decompression bomb: a
+        small file can declare dimensions that take gigabytes to decode.
+        """
+        if Image is None:
+            return ()
+        made = []
+        try:
+            with Image.open(self.path(digest)) as image:
+                width, height = image.size
+                if max_pixels is not None and width * height > max_pixels:
+                    raise ImageTooLarge(f"Image is {width}x{height}, over {max_pixels} pixels")
+                image.load()
+                for variant, edge in sizes.items():
+                    target = self.path(digest, variant)
+                    if not os.path.exists(target):
+                        thumb = image.copy()
+                        thumb.thumbnail((edge, edge))
+                        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".variant-")
+                        try:
+                            with os.fdopen(fd, "wb") as tmp:
+                                thumb.save(tmp, format="PNG", optimize=True)
+                            self._place(tmp_path, digest, variant)
+                        finally:
+                            if os.path.exists(tmp_path):
+                                os.remove(tmp_path)
+                    made.append(variant)
+        except Image.DecompressionBombError as e:
+            raise ImageTooLarge(str(e)) from e
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not build variants for blob {digest}: {e}")
+        return tuple(made)
+
+    def _place(self, tmp_path: str, digest: str, variant: str = "original") -> None:
+        target = self.path(digest, variant)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, target)
+
+
+avatar_store = BlobStore(settings.AVATAR_STORAGE_DIR)
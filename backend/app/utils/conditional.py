@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+# Clients may keep a copy but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag over the parts that determine a representation.
+
+    Callers pass a change counter plus whatever else shapes the body (the
+    resource, the query string), never the body itself.
+    """
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            # SQLite hands back naive UTC timestamps
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """
+    Whether the client's copy is current (RFC 9110, 13.1.2 and 13.1.3).
+
+    If-None-Match is compared weakly. If-Modified-Since is only honoured for
+    a representation without an ETag: Last-Modified has one-second
+    precision, so a change within the second of the client's copy would be
+    answered with 304. A client holding only a date gets the full response
+    and, with it, the ETag to revalidate with.
+    """
+    etag = headers.get("ETag")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return etag is not None and any(
+            _opaque(tag) == _opaque(etag) for tag in if_none_match.split(",")
+        )
+    if etag is not None:
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+                if_modified_since
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,6 +1,14 @@
-from sqlalchemy import TypeDecorator, Date
+from sqlalchemy import TypeDecorator, Date, DateTime
+from sqlalchemy.dialects import sqlite
 from datetime import datetime, date
 
+# Timestamp that keyset cursors compare against. SQLite stores the server
+# default (CURRENT_TIMESTAMP) as "YYYY-MM-DD HH:MM:SS" text, so values bound
+# from Python leave out microseconds there too and compare equal to it
+SortableTimestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
 class CustomDate(TypeDecorator):
     """Custom Date type for SQLAlchemy that ensures proper date conversion"""
 
@@ -0,0 +1,87 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import DateTime, Integer, literal, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.database import GUID
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor pointing just past a row with these sort-key values."""
+    payload = orjson.dumps({"after": list(values)})
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def _from_json(column: Any, value: Any) -> Any:
+    """A cursor value as the Python type the column binds."""
+    if value is None:
+        raise ValueError("null sort key")
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, GUID):
+        return uuid.UUID(value)
+    if isinstance(column.type, Integer):
+        return int(value)
+    return value
+
+
+def keyset_after(model: Any, sort_keys: Sequence[str], cursor: str) -> ColumnElement:
+    """
+    Filter for rows that sort strictly after the cursor's row on ``sort_keys``.
+
+    The last key must be unique (the primary key) so the order is total, and
+    none may be NULL. The cursor carries the row's values themselves, so the
+    page after it is found even if that row has since moved or been deleted.
+    """
+    columns = [getattr(model, key) for key in sort_keys]
+    values = decode_cursor(cursor)
+    if len(values) != len(columns):
+        raise InvalidCursor("Invalid cursor")
+    try:
+        anchor = [_from_json(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    return tuple_(*columns) > tuple_(
+        *(literal(value, column.type) for column, value in zip(columns, anchor))
+    )
+
+
+def split_page(
+    rows: List[Any], limit: int, sort_keys: Sequence[str]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim ``limit + 1`` fetched rows to one page and build the next cursor
+    from the last row's ``sort_keys`` values.
+
+    The extra row only signals that another page exists.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    if isinstance(last, dict):
+        values = [last[key] for key in sort_keys]
+    else:
+        values = [getattr(last, key) for key in sort_keys]
+    return page, encode_cursor(values)
@@ -0,0 +1,56 @@
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from app.models.task import TaskPriority
+
+PRIORITY_WEIGHTS = {
+    TaskPriority.URGENT: 10,
+    TaskPriority.HIGH: 8,
+    TaskPriority.MEDIUM: 5,
+    TaskPriority.LOW: 2,
+}
+DEFAULT_PRIORITY_WEIGHT = 5
+NO_DUE_DATE_FACTOR = 0.5
+AGE_FACTOR_PER_DAY = 0.1
+# The overdue factor doubles per day late up to this many days (2**30 ~ 1e9),
+# so long-overdue tasks still rank first without overflowing the float
+MAX_OVERDUE_DAYS = 30
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    # PostgreSQL returns aware timestamps, SQLite naive UTC ones
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def calculate_priority_score(
+    priority: Optional[TaskPriority],
+    due_date: Optional[date],
+    created_at: Optional[datetime],
+    *,
+    now: datetime,
+) -> float:
+    """
+    Score a task from its priority, due date and age; higher comes first.
+
+    ``now`` is naive UTC, as returned by ``datetime.utcnow()``. The due-date
+    and age factors change daily, so stored scores are refreshed by
+    app/jobs/priority_scores.py.
+    """
+    score = float(PRIORITY_WEIGHTS.get(priority, DEFAULT_PRIORITY_WEIGHT))
+
+    if due_date:
+        days_until_due = (due_date - now.date()).days
+        if days_until_due < 0:
+            score *= 2.0 ** min(-days_until_due, MAX_OVERDUE_DAYS)
+        else:
+            score /= 1 + days_until_due
+    else:
+        score *= NO_DUE_DATE_FACTOR
+
+    if created_at:
+        age_days = max((now - as_naive_utc(created_at)).days, 0)
+        score *= 1 + age_days * AGE_FACTOR_PER_DAY
+
+    return score
@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+# Gap left between neighbouring cards so a move can usually take the midpoint
+# of its new neighbours and touch a single row.
+RANK_STEP = 1024
+
+
+def rank_between(lower: Optional[int], upper: Optional[int]) -> Optional[int]:
+    """Return a rank strictly between two neighbours, or None if there is no gap.
+
+    ``lower`` is the rank of the card above the drop position and ``upper``
+    the rank of the card below it; either may be None at the column edges.
+    """
+    if lower is None and upper is None:
+        return RANK_STEP
+    if lower is None:
+        return upper - RANK_STEP
+    if upper is None:
+        return lower + RANK_STEP
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def spaced_ranks(count: int) -> List[int]:
+    """Evenly spaced ranks used when a column has to be rebalanced."""
+    return [RANK_STEP * (index + 1) for index in range(count)]
@@ -0,0 +1,93 @@
+"""
+Cost of invalidating one project's cached pages among many cached keys.
+
+Fills the cache with ``--keys`` task-list entries spread over
+``--projects`` projects, then times invalidating one project's entries
+two ways:
+
+* pattern: ``clear_cache_by_pattern`` (KEYS + DEL), which every task
+  write used to run and which scans the whole keyspace
+* namespace: ``bump_namespace``, one INCR however many keys exist
+
+Run from backend/. Without REDIS_URL it runs against an in-process
+fakeredis (``pip install fakeredis``); with it, against that server,
+whose keys under ``bench:`` and ``ns:bench:`` are deleted afterwards:
+
+    REDIS_URL=redis://localhost:6379 python -m benchmarks.cache_invalidation
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+from app.core import redis_config
+from app.core.redis_config import (
+    NAMESPACE_PREFIX,
+    bump_namespace,
+    clear_cache_by_pattern,
+    initialize_redis,
+)
+
+PREFIX = "bench"
+
+
+async def fill(client, projects: List[str], keys: int) -> None:
+    pipe = client.pipeline(transaction=False)
+    for n in range(keys):
+        pipe.set(f"{PREFIX}:tasks_by_project:{projects[n % len(projects)]}:{n}", "[]", ex=1800)
+        if n % 10000 == 9999:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def time_each(fn: Callable[[], Awaitable[None]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def run(keys: int, projects: int, repeat: int) -> None:
+    await initialize_redis()
+    if redis_config.redis_client is None:
+        import fakeredis
+
+        redis_config.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        print("backend: fakeredis (in-process)")
+    else:
+        print("backend: REDIS_URL")
+    client = redis_config.redis_client
+
+    project_ids = [str(uuid.uuid4()) for _ in range(projects)]
+    await fill(client, project_ids, keys)
+    target = project_ids[0]
+
+    pattern = await time_each(
+        lambda: clear_cache_by_pattern(f"{PREFIX}:tasks_by_project:{target}:*"), repeat
+    )
+    namespace = await time_each(lambda: bump_namespace(f"{PREFIX}:project:{target}"), repeat)
+    print(f"{keys} keys over {projects} projects, median of {repeat}:")
+    print(f"  pattern (KEYS + DEL): {pattern:8.2f} ms per invalidation")
+    print(f"  namespace (INCR):     {namespace:8.2f} ms per invalidation")
+
+    for match in (f"{PREFIX}:*", f"{NAMESPACE_PREFIX}:{PREFIX}:*"):
+        stale = [key async for key in client.scan_iter(match, count=10000)]
+        for i in range(0, len(stale), 10000):
+            await client.delete(*stale[i : i + 10000])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.keys, args.projects, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
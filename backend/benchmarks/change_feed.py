@@ -0,0 +1,253 @@
+"""
+Load test for the change feed: idle event streams held by one worker.
+
+Starts a single uvicorn worker with the current environment, signs up a
+throwaway user, opens ``--subscribers`` streams spread over ``--projects``
+projects and then measures:
+
+* the worker's resident memory before and after opening the streams
+* the worker's CPU use while the streams sit idle
+* how long a write to one project takes to reach all of its streams
+* the latency of an ordinary request while the streams are held
+
+``--projects 1`` is the worst case: every write goes to every stream.
+
+Run from backend/ against a migrated database (Linux only: memory is read
+from /proc). Set REDIS_URL to go through Redis pub/sub. The open file limit
+must allow the streams on both ends (ulimit -n).
+
+    DATABASE_URL=sqlite+aiosqlite:///./load.db python -m benchmarks.change_feed
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import List, Optional
+
+import httpx
+
+HOST = "127.0.0.1"
+# Streams opened at a time, kept under the listen backlog
+CONNECT_BATCH = 500
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    # utime and stime, in clock ticks
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class Stream:
+    """A raw-socket SSE reader, far lighter per stream than an HTTP client."""
+
+    def __init__(self):
+        self.received: List[float] = []
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def open(self, port: int, path: str, token: str) -> None:
+        self.reader, self.writer = await asyncio.open_connection(HOST, port)
+        self.writer.write(
+            (
+                f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+                f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n"
+            ).encode()
+        )
+        status = await self.reader.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(f"Stream refused: {status!r}")
+        while await self.reader.readline() not in (b"\r\n", b""):
+            pass
+
+    async def read(self) -> None:
+        # Chunked body: only the event lines matter here
+        while line := await self.reader.readline():
+            if line.startswith(b"data: ") and b"task." in line:
+                self.received.append(time.perf_counter())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def wait_until(predicate, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+async def create_projects(owner_id: str, count: int) -> List[str]:
+    # Straight through the CRUD layer: project creation is rate limited per IP
+    from app.core.database import AsyncSessionLocal
+    from app.crud.project import project_crud
+    from app.schemas.project import ProjectCreate
+
+    # Importing the app sets up request logging for the client too
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async with AsyncSessionLocal() as db:
+        return [
+            str(
+                (
+                    await project_crud.create_with_owner(
+                        db, obj_in=ProjectCreate(name=f"Load {n}"), owner_id=owner_id
+                    )
+                ).id
+            )
+            for n in range(count)
+        ]
+
+
+async def run(
+    port: int, pid: int, subscribers: int, projects: int, events: int, idle: float
+) -> None:
+    base = f"http://{HOST}:{port}"
+    async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+        for _ in range(100):
+            try:
+                await client.get("/health")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+        email = f"load-{uuid.uuid4().hex[:8]}@example.com"
+        signup = await client.post(
+            "/api/v1/auth/signup",
+            json={"email": email, "password": "load-test-1", "name": "Load"},
+        )
+        token = signup.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        owner_id = (await client.get("/api/v1/auth/me", headers=headers)).json()["id"]
+        project_ids = await create_projects(owner_id, projects)
+
+        baseline = rss_mb(pid)
+        streams = [Stream() for _ in range(subscribers)]
+        paths = [
+            f"/api/v1/projects/{project_ids[i % projects]}/changes"
+            for i in range(subscribers)
+        ]
+        start = time.perf_counter()
+        for i in range(0, subscribers, CONNECT_BATCH):
+            await asyncio.gather(
+                *(
+                    stream.open(port, path, token)
+                    for stream, path in zip(
+                        streams[i : i + CONNECT_BATCH], paths[i : i + CONNECT_BATCH]
+                    )
+                )
+            )
+        connect_s = time.perf_counter() - start
+        readers = [asyncio.create_task(s.read()) for s in streams]
+        await asyncio.sleep(1)
+        held = rss_mb(pid)
+        print(
+            f"streams:        {subscribers} on {projects} projects, "
+            f"opened in {connect_s:.1f} s"
+        )
+        print(
+            f"worker RSS:     {baseline:.0f} MB -> {held:.0f} MB "
+            f"({(held - baseline) * 1024 / subscribers:.1f} KB per stream)"
+        )
+
+        cpu = cpu_seconds(pid)
+        await asyncio.sleep(idle)
+        cpu = cpu_seconds(pid) - cpu
+        print(f"idle CPU:       {cpu / idle * 100:.1f}% of a core over {idle:.0f} s")
+
+        # Streams on the first project, which every write goes to
+        watching = streams[::projects]
+        fanout = []
+        for n in range(events):
+            sent = time.perf_counter()
+            await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Event {n}", "project_id": project_ids[0]},
+                headers=headers,
+            )
+            if not await wait_until(
+                lambda: all(len(s.received) > n for s in watching), timeout=60
+            ):
+                print("timed out waiting for fan-out")
+                break
+            fanout.append((max(s.received[n] for s in watching) - sent) * 1000)
+        if fanout:
+            print(
+                f"write -> {len(watching)} streams: median "
+                f"{statistics.median(fanout):.0f} ms, max {max(fanout):.0f} ms "
+                f"over {len(fanout)} writes"
+            )
+
+        # Long enough to span a keep-alive round
+        timings = []
+        deadline = time.perf_counter() + idle
+        while time.perf_counter() < deadline:
+            sent = time.perf_counter()
+            await client.get(f"/api/v1/projects/{project_ids[0]}", headers=headers)
+            timings.append((time.perf_counter() - sent) * 1000)
+            await asyncio.sleep(0.05)
+        timings.sort()
+        print(
+            f"GET project:    median {statistics.median(timings):.1f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99)]:.1f} ms, "
+            f"max {timings[-1]:.1f} ms while held"
+        )
+        print(f"feed stats:     {(await client.get('/health/changes')).json()}")
+
+        for reader in readers:
+            reader.cancel()
+        for stream in streams:
+            stream.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--idle", type=float, default=30, help="seconds to sample idle CPU and request latency")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    env = {**os.environ, "PRIORITY_SCORE_SCHEDULER": "false"}
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", HOST, "--port", str(args.port), "--log-level", "warning",
+            "--backlog", "4096",
+        ],
+        env=env,
+    )
+    try:
+        asyncio.run(
+            run(
+                args.port,
+                worker.pid,
+                args.subscribers,
+                args.projects,
+                args.events,
+                args.idle,
+            )
+        )
+    finally:
+        worker.terminate()
+        worker.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Email delivery throughput against a local SMTP stand-in.
+
+Starts an aiosmtpd server in this process (``pip install aiosmtpd``) and
+sends ``--messages`` messages three ways:
+
+* per_message: a new SMTP session per message, ``--connections`` at a
+  time, as when each request's background task sent its own email
+* outbox: queued in email_outbox and delivered by the outbox worker's
+  batches over ``--connections`` kept sessions
+* outbox_1: the same over a single session
+
+``--tls`` has the server require STARTTLS with a throwaway self-signed
+certificate, so every new session pays for a TLS handshake. ``--delay``
+makes the server wait that many milliseconds before accepting each
+message, like a remote relay would.
+
+Run from backend/ against a migrated database:
+
+    DATABASE_URL=sqlite+aiosqlite:///./load.db python -m benchmarks.email_outbox --tls
+"""
+import argparse
+import asyncio
+import datetime
+import ssl
+import tempfile
+import time
+import uuid
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Optional
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.email_outbox import outbox_crud, outbox_table
+from app.jobs.email_outbox import SMTPPool, drain
+
+HOST = "127.0.0.1"
+
+
+class CountingHandler:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        return "250 OK"
+
+
+def self_signed_context(directory: Path) -> ssl.SSLContext:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, HOST)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file, key_file = directory / "cert.pem", directory / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+def make_message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = f"user{n}@example.com"
+    message["Subject"] = "Password Reset Request"
+    message.set_content("Hello,\n\n" + "x" * 400 + "\n")
+    return message
+
+
+async def per_message(messages: int, connections: int) -> None:
+    semaphore = asyncio.Semaphore(connections)
+
+    async def send(n: int) -> None:
+        async with semaphore:
+            await aiosmtplib.send(
+                make_message(n),
+                hostname=settings.MAIL_SERVER,
+                port=settings.MAIL_PORT,
+                start_tls=settings.MAIL_STARTTLS,
+                validate_certs=settings.MAIL_VALIDATE_CERTS,
+            )
+
+    await asyncio.gather(*(send(n) for n in range(messages)))
+
+
+async def fill_outbox(messages: int) -> None:
+    now = datetime.datetime.utcnow()
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(outbox_table),
+            [
+                {
+                    "recipient": f"user{n}-{run_id}@example.com",
+                    "subject": "Password Reset Request",
+                    "body": "Hello,\n\n" + "x" * 400 + "\n",
+                    "next_attempt_at": now,
+                }
+                for n in range(messages)
+            ],
+        )
+        await db.commit()
+
+
+async def outbox(messages: int, connections: int) -> SMTPPool:
+    await fill_outbox(messages)
+    pool = SMTPPool(connections)
+    await drain(pool)
+    await pool.close()
+    return pool
+
+
+async def time_enqueue(count: int) -> float:
+    """Per-message cost of queueing from a request, one commit each."""
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for n in range(count):
+            await outbox_crud.enqueue(
+                db, recipient=f"enqueue{n}@example.com", subject="Enqueue", body="Hello"
+            )
+    elapsed = (time.perf_counter() - start) / count * 1000
+    pool = SMTPPool(settings.EMAIL_SMTP_CONNECTIONS)
+    await drain(pool)
+    await pool.close()
+    return elapsed
+
+
+async def run(args: argparse.Namespace, handler: CountingHandler) -> None:
+    async with AsyncSessionLocal() as db:
+        if await outbox_crud.count(db):
+            raise SystemExit("email_outbox already has pending mail; use an empty database")
+
+    print(f"enqueue:     {await time_enqueue(200):.2f} ms per message")
+    cases = {
+        "per_message": lambda: per_message(args.messages, args.connections),
+        "outbox": lambda: outbox(args.messages, args.connections),
+        "outbox_1": lambda: outbox(args.messages, 1),
+    }
+    for name, case in cases.items():
+        received = handler.received
+        start = time.perf_counter()
+        pool: Optional[SMTPPool] = await case()
+        elapsed = time.perf_counter() - start
+        assert handler.received - received == args.messages, "messages went missing"
+        sessions = pool.stats["connections"] if pool else args.messages
+        print(
+            f"{name:12} {args.messages / elapsed:8.0f} messages/s "
+            f"({elapsed:.2f} s, {sessions} SMTP sessions)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=settings.EMAIL_SMTP_CONNECTIONS)
+    parser.add_argument("--tls", action="store_true", help="require STARTTLS")
+    parser.add_argument("--delay", type=float, default=0, help="ms before each message is accepted")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    handler = CountingHandler(args.delay / 1000)
+    server_options = {}
+    with tempfile.TemporaryDirectory() as directory:
+        if args.tls:
+            server_options.update(
+                tls_context=self_signed_context(Path(directory)), require_starttls=True
+            )
+        controller = Controller(handler, hostname=HOST, port=args.port, **server_options)
+        controller.start()
+        settings.MAIL_SERVER, settings.MAIL_PORT = HOST, args.port
+        settings.MAIL_STARTTLS, settings.MAIL_SSL_TLS = args.tls, False
+        settings.MAIL_USE_CREDENTIALS, settings.MAIL_VALIDATE_CERTS = False, False
+        try:
+            asyncio.run(run(args, handler))
+        finally:
+            controller.stop()
+
+
+if __name__ == "__main__":
+    main()
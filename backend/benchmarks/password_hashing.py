@@ -0,0 +1,147 @@
+"""
+Latency of unrelated requests while a worker handles a burst of logins.
+
+Starts a single uvicorn worker with the current environment, creates
+``--concurrency`` users, then times ``GET /api/v1/projects/`` on its own and
+again while ``--logins`` logins run ``--concurrency`` at a time. Every login
+comes from its own address (``X-Forwarded-For``, which uvicorn trusts from
+localhost) so the per-address login limit doesn't cut the burst short.
+
+Run from backend/ against a migrated database; BCRYPT_ROUNDS and
+PASSWORD_HASH_THREADS are read from the environment as usual:
+
+    DATABASE_URL=sqlite+aiosqlite:///./load.db python -m benchmarks.password_hashing
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import List
+
+import httpx
+
+HOST = "127.0.0.1"
+PASSWORD = "load-test-1"
+
+
+def summarize(timings: List[float]) -> str:
+    timings = sorted(timings)
+    return (
+        f"p50 {statistics.median(timings):6.1f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99)]:6.1f} ms, "
+        f"max {timings[-1]:6.1f} ms ({len(timings)} requests)"
+    )
+
+
+async def create_users(count: int) -> List[str]:
+    # Straight through the CRUD layer: signup is rate limited per address
+    from app.core.database import AsyncSessionLocal
+    from app.crud import user as user_crud
+    from app.models import analytics, project, search, task  # noqa: F401
+    from app.schemas.user import UserCreate
+
+    # Importing the app sets up request logging for the client too
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"login-{run_id}-{n}@example.com" for n in range(count + 1)]
+    async with AsyncSessionLocal() as db:
+        for email in emails:
+            await user_crud.user.create(
+                db, obj_in=UserCreate(email=email, password=PASSWORD, name="Load")
+            )
+    return emails
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, until) -> List[float]:
+    timings = []
+    while not until():
+        sent = time.perf_counter()
+        response = await client.get("/api/v1/projects/", headers=headers)
+        response.raise_for_status()
+        timings.append((time.perf_counter() - sent) * 1000)
+        await asyncio.sleep(0.01)
+    return timings
+
+
+async def run(port: int, logins: int, concurrency: int) -> None:
+    base = f"http://{HOST}:{port}"
+    emails = await create_users(concurrency)
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base, timeout=60, limits=limits) as client:
+        for _ in range(100):
+            try:
+                await client.get("/health")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+        async def login(n: int, email: str) -> float:
+            sent = time.perf_counter()
+            response = await client.post(
+                "/api/v1/auth/login",
+                data={"username": email, "password": PASSWORD},
+                headers={"X-Forwarded-For": f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"},
+            )
+            response.raise_for_status()
+            return (time.perf_counter() - sent) * 1000
+
+        token = (await client.post(
+            "/api/v1/auth/login",
+            data={"username": emails[-1], "password": PASSWORD},
+            headers={"X-Forwarded-For": "10.255.255.255"},
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        started = time.perf_counter()
+        idle = await probe(client, headers, lambda: time.perf_counter() - started > 5)
+        print(f"GET /projects/ idle:         {summarize(idle)}")
+
+        pending = list(range(logins))
+        login_timings: List[float] = []
+
+        async def login_loop(email: str) -> None:
+            while pending:
+                login_timings.append(await login(pending.pop(), email))
+
+        started = time.perf_counter()
+        burst = asyncio.gather(*(login_loop(email) for email in emails[:concurrency]))
+        busy = await probe(client, headers, burst.done)
+        await burst
+        elapsed = time.perf_counter() - started
+        print(f"GET /projects/ during burst: {summarize(busy)}")
+        print(
+            f"logins:                      {summarize(login_timings)}, "
+            f"{logins / elapsed:.1f}/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8098)
+    args = parser.parse_args()
+
+    env = {**os.environ, "PRIORITY_SCORE_SCHEDULER": "false"}
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", HOST, "--port", str(args.port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    try:
+        asyncio.run(run(args.port, args.logins, args.concurrency))
+    finally:
+        worker.terminate()
+        worker.wait()
+
+
+if __name__ == "__main__":
+    main()
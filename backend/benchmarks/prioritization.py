@@ -0,0 +1,188 @@
+"""
+Top-k prioritized tasks: time and peak Python memory per strategy.
+
+Seeds a throwaway user with ``--open`` open and ``--done`` done tasks over
+``--projects`` projects, then fetches their ``--limit`` highest-scoring
+open tasks three ways:
+
+* load_sort: every open task loaded as an ORM object, scored and fully
+  sorted, as the endpoint did before
+* stream_heap: only the scored columns streamed in batches of 1000 into a
+  min-heap of ``--limit`` entries, then the winners loaded by id
+* service: ``get_prioritized_tasks``, which reads the score stored on the
+  row (seeded here as the nightly job would write it)
+
+Peak memory is what tracemalloc sees allocated by Python during one
+more, untimed call.
+
+Run from backend/ against a scratch migrated database; seeded rows are
+left in place:
+
+    DATABASE_URL=sqlite+aiosqlite:///./load.db python -m benchmarks.prioritization
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models import analytics, search  # noqa: F401
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.user import User
+from app.services.prioritization import OPEN_STATUSES, get_prioritized_tasks
+from app.utils.priority import calculate_priority_score
+
+
+async def seed(projects: int, open_tasks: int, done_tasks: int) -> uuid.UUID:
+    owner_id = uuid.uuid4()
+    project_ids = [uuid.uuid4() for _ in range(projects)]
+    now = datetime.utcnow()
+    rng = random.Random(11)
+    priorities = list(TaskPriority)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(User).values(
+                id=owner_id, email=f"priority-{owner_id}@example.com", password_hash="x", name="Load"
+            )
+        )
+        await db.execute(
+            insert(Project),
+            [{"id": p, "name": f"Project {n}", "owner_id": owner_id} for n, p in enumerate(project_ids)],
+        )
+        rows = []
+        for n in range(open_tasks + done_tasks):
+            priority = rng.choice(priorities)
+            due_date = (now + timedelta(days=rng.randint(-60, 60))).date() if n % 4 else None
+            created_at = now - timedelta(days=rng.randint(0, 365))
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "title": f"Task {n}",
+                    "project_id": project_ids[n % projects],
+                    "owner_id": owner_id,
+                    "status": rng.choice(OPEN_STATUSES) if n < open_tasks else TaskStatus.DONE,
+                    "priority": priority,
+                    "due_date": due_date,
+                    "created_at": created_at,
+                    "priority_score": calculate_priority_score(
+                        priority, due_date, created_at, now=now
+                    ),
+                }
+            )
+        for i in range(0, len(rows), 5000):
+            await db.execute(insert(Task), rows[i : i + 5000])
+        await db.commit()
+    return owner_id
+
+
+async def load_sort(db: AsyncSession, owner_id: uuid.UUID, limit: int) -> List[Any]:
+    """What the endpoint did before user-011: load, score and sort everything."""
+    now = datetime.utcnow()
+    tasks = (
+        await db.execute(
+            select(Task)
+            .join(Task.project)
+            .where(Project.owner_id == owner_id, Task.status != TaskStatus.DONE)
+        )
+    ).scalars().all()
+    scored = [
+        (calculate_priority_score(t.priority, t.due_date, t.created_at, now=now), t)
+        for t in tasks
+    ]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [task for _, task in scored[:limit]]
+
+
+async def stream_heap(db: AsyncSession, owner_id: uuid.UUID, limit: int) -> List[Any]:
+    """The service as user-011 first shipped it, before scores were stored."""
+    now = datetime.utcnow()
+    query = (
+        select(Task.id, Task.priority, Task.due_date, Task.created_at)
+        .join(Task.project)
+        .where(Project.owner_id == owner_id, Task.status != TaskStatus.DONE)
+        .execution_options(yield_per=1000)
+    )
+    heap: List[Tuple[float, int, Any]] = []
+    counter = itertools.count()
+    result = await db.stream(query)
+    async for batch in result.partitions():
+        for task_id, priority, due_date, created_at in batch:
+            entry = (
+                calculate_priority_score(priority, due_date, created_at, now=now),
+                -next(counter),
+                task_id,
+            )
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+    ranked_ids = [task_id for _, _, task_id in sorted(heap, reverse=True)]
+    tasks = {
+        task.id: task
+        for task in (await db.execute(select(Task).where(Task.id.in_(ranked_ids)))).scalars()
+    }
+    return [tasks[task_id] for task_id in ranked_ids]
+
+
+async def service(db: AsyncSession, owner_id: uuid.UUID, limit: int) -> List[Any]:
+    return await get_prioritized_tasks(db, owner_id=owner_id, limit=limit)
+
+
+async def measure(
+    fn: Callable[[AsyncSession, uuid.UUID, int], Awaitable[List[Any]]],
+    owner_id: uuid.UUID,
+    limit: int,
+    repeat: int,
+) -> Tuple[float, float, List[Any]]:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            tasks = await fn(db, owner_id, limit)
+            timings.append((time.perf_counter() - start) * 1000)
+    # Traced separately: tracemalloc slows every allocation down
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        await fn(db, owner_id, limit)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return statistics.median(timings), peak, [task.id for task in tasks]
+
+
+async def run(args: argparse.Namespace) -> None:
+    owner_id = await seed(args.projects, args.open, args.done)
+    print(
+        f"{args.open} open (+{args.done} done) tasks over {args.projects} projects, "
+        f"top {args.limit}, median of {args.repeat}:"
+    )
+    rankings = {}
+    for name, fn in (("load_sort", load_sort), ("stream_heap", stream_heap), ("service", service)):
+        ms, peak, rankings[name] = await measure(fn, owner_id, args.limit, args.repeat)
+        print(f"  {name:12} {ms:9.1f} ms  peak {peak:7.1f} MB")
+    if len({frozenset(ids) for ids in rankings.values()}) > 1:
+        print("  note: the strategies disagree on the top tasks (ties on the score)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--open", type=int, default=100000)
+    parser.add_argument("--done", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
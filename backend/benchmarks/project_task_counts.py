@@ -0,0 +1,125 @@
+"""
+Project listing with task counts: one grouped query against two per project.
+
+Seeds a throwaway user per size with ``--tasks`` tasks in each project,
+then times ``get_projects_with_task_counts`` against the loop it replaced
+(per_project: the projects, then a total and a completed count() query
+for each), counting the SQL statements (stmts) each issues.
+
+Run from backend/ against a scratch migrated database; seeded rows are
+left in place:
+
+    DATABASE_URL=sqlite+aiosqlite:///./load.db python -m benchmarks.project_task_counts
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, engine
+from app.crud.project import project_crud
+from app.models import analytics, search  # noqa: F401
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def seed(projects: int, tasks: int) -> uuid.UUID:
+    owner_id = uuid.uuid4()
+    project_ids = [uuid.uuid4() for _ in range(projects)]
+    statuses = list(TaskStatus)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(User).values(
+                id=owner_id, email=f"counts-{owner_id}@example.com", password_hash="x", name="Load"
+            )
+        )
+        await db.execute(
+            insert(Project),
+            [{"id": p, "name": f"Project {n}", "owner_id": owner_id} for n, p in enumerate(project_ids)],
+        )
+        rows = [
+            {"id": uuid.uuid4(), "title": f"Task {n}", "project_id": p, "status": statuses[n % 3]}
+            for p in project_ids
+            for n in range(tasks)
+        ]
+        for i in range(0, len(rows), 5000):
+            await db.execute(insert(Task), rows[i : i + 5000])
+        await db.commit()
+    return owner_id
+
+
+async def per_project(db: AsyncSession, owner_id: uuid.UUID) -> List[dict]:
+    """What get_projects_with_task_counts did before: 1 + 2N queries."""
+    projects = (
+        await db.execute(select(Project).where(Project.owner_id == owner_id).limit(100000))
+    ).scalars().all()
+    result = []
+    for project in projects:
+        total = await db.scalar(
+            select(func.count()).select_from(Task).where(Task.project_id == project.id)
+        )
+        completed = await db.scalar(
+            select(func.count())
+            .select_from(Task)
+            .where(Task.project_id == project.id, Task.status == TaskStatus.DONE)
+        )
+        result.append({"id": project.id, "total_tasks": total, "completed_tasks": completed})
+    return result
+
+
+async def grouped(db: AsyncSession, owner_id: uuid.UUID) -> List[dict]:
+    return await project_crud.get_projects_with_task_counts(db, owner_id=owner_id, limit=100000)
+
+
+async def measure(
+    fn: Callable[[AsyncSession, uuid.UUID], Awaitable[List[dict]]],
+    owner_id: uuid.UUID,
+    counter: StatementCounter,
+    repeat: int,
+) -> str:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            counter.count = 0
+            start = time.perf_counter()
+            await fn(db, owner_id)
+            timings.append((time.perf_counter() - start) * 1000)
+    return f"{counter.count:>5} stmts {statistics.median(timings):>9.1f} ms"
+
+
+async def run(sizes: List[int], tasks: int, repeat: int) -> None:
+    counter = StatementCounter()
+    print(f"{'projects':>8}  {'per_project':>26}  {'grouped':>26}")
+    for size in sizes:
+        owner_id = await seed(size, tasks)
+        before = await measure(per_project, owner_id, counter, repeat)
+        after = await measure(grouped, owner_id, counter, repeat)
+        print(f"{size:>8}  {before:>26}  {after:>26}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--tasks", type=int, default=10, help="tasks per project")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.tasks, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Per-check overhead of the rate limiter.
+
+Times each part of a rate-limited request in isolation:
+
+* ip_key / user_key: building the client key (user_key verifies the JWT)
+* local_allowed / local_rejected: the in-process sliding window
+* redis_allowed / redis_rejected: one sliding-window script call, awaited
+  one at a time (only when REDIS_URL is set)
+* redis_concurrent: the same calls, --concurrency at a time, as a worker
+  under load would make them
+
+Run from backend/; point REDIS_URL at a server with nothing else on it:
+
+    REDIS_URL=redis://localhost:6379 python -m benchmarks.rate_limiting
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable, Dict
+
+from starlette.requests import Request
+
+from app.core import rate_limiting, redis_config
+from app.core.redis_config import initialize_redis
+from app.core.security import create_access_token
+
+LIMIT = rate_limiting.parse_limit("60/minute")
+
+
+def make_request() -> Request:
+    token = create_access_token(uuid.uuid4())
+    return Request(
+        {
+            "type": "http",
+            "method": "PUT",
+            "path": "/api/v1/tasks/1",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "client": ("203.0.113.7", 40000),
+        }
+    )
+
+
+def time_sync(fn: Callable[[int], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def time_async(
+    fn: Callable[[int], Awaitable[object]], iterations: int, concurrency: int = 1
+) -> float:
+    start = time.perf_counter()
+    for i in range(0, iterations, concurrency):
+        await asyncio.gather(*(fn(n) for n in range(i, min(i + concurrency, iterations))))
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def fill(key: str) -> None:
+    rate_limiting.local_windows.clear()
+    for _ in range(LIMIT.amount):
+        rate_limiting.local_windows.hit(key, LIMIT)
+
+
+async def run(iterations: int, repeat: int, concurrency: int) -> Dict[str, float]:
+    request = make_request()
+    prefix = f"bench:{uuid.uuid4().hex[:8]}"
+    cases: Dict[str, Callable[[], Awaitable[float]]] = {}
+
+    async def ip_key() -> float:
+        return time_sync(lambda i: rate_limiting.get_ip_identifier(request), iterations)
+
+    async def user_key() -> float:
+        return time_sync(lambda i: rate_limiting.get_user_identifier(request), iterations)
+
+    async def local_allowed() -> float:
+        rate_limiting.local_windows.clear()
+        return time_sync(
+            lambda i: rate_limiting.local_windows.hit(f"{prefix}:{i}", LIMIT), iterations
+        )
+
+    async def local_rejected() -> float:
+        fill(f"{prefix}:full")
+        return time_sync(
+            lambda i: rate_limiting.local_windows.hit(f"{prefix}:full", LIMIT), iterations
+        )
+
+    cases.update(
+        ip_key=ip_key,
+        user_key=user_key,
+        local_allowed=local_allowed,
+        local_rejected=local_rejected,
+    )
+
+    if redis_config.redis_client is not None:
+        async def redis_allowed() -> float:
+            run_id = uuid.uuid4().hex[:8]
+            return await time_async(
+                lambda i: rate_limiting.hit(f"{prefix}:{run_id}:{i}", LIMIT), iterations
+            )
+
+        async def redis_rejected() -> float:
+            for _ in range(LIMIT.amount):
+                await rate_limiting.hit(f"{prefix}:full", LIMIT)
+            return await time_async(
+                lambda i: rate_limiting.hit(f"{prefix}:full", LIMIT), iterations
+            )
+
+        async def redis_concurrent() -> float:
+            run_id = uuid.uuid4().hex[:8]
+            return await time_async(
+                lambda i: rate_limiting.hit(f"{prefix}:{run_id}:{i % 1000}", LIMIT),
+                iterations,
+                concurrency,
+            )
+
+        cases.update(
+            redis_allowed=redis_allowed,
+            redis_rejected=redis_rejected,
+            redis_concurrent=redis_concurrent,
+        )
+
+    results = {}
+    for name, case in cases.items():
+        results[name] = statistics.median([await case() for _ in range(repeat)])
+
+    if redis_config.redis_client is not None:
+        keys = [key async for key in redis_config.redis_client.scan_iter(
+            f"{rate_limiting.KEY_PREFIX}:*:{prefix}:*"
+        )]
+        for i in range(0, len(keys), 1000):
+            await redis_config.redis_client.delete(*keys[i : i + 1000])
+    return results
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    await initialize_redis()
+    results = await run(args.iterations, args.repeat, args.concurrency)
+    for name, us in results.items():
+        print(f"{name:>18} {us:>9.1f} us per check")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
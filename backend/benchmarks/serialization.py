@@ -0,0 +1,133 @@
+"""
+Micro-benchmarks for turning task rows into JSON responses.
+
+The first cases mirror what FastAPI does for a ``List[Task]`` response
+model: validate the endpoint's return value against the response type,
+then dump it to JSON bytes. They differ in what the endpoint returns:
+
+* orm: ORM instances, validated with ``from_attributes`` (what the task
+  list endpoints used to return)
+* construct: schemas built from column rows with ``model_construct``,
+  which FastAPI's validation passes through untouched
+* dicts: plain dicts, validated field by field
+
+The rest skip the response model:
+
+* orjson_class: what FastAPI does for a response model when the route (or
+  the app) has an orjson ``response_class``: validate, dump to Python in
+  JSON mode, then encode with orjson
+* rows: column rows sent as they are with ``ORJSONResponse`` (what the
+  task list endpoints return now)
+
+Run from backend/ (no database needed):
+
+    python -m benchmarks.serialization [--sizes 1000 10000 100000]
+"""
+import argparse
+import gc
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from app.core.responses import ORJSONResponse, dump_json
+from app.models import project, search, user  # noqa: F401
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.schemas.task import Task as TaskSchema
+
+TASK_FIELDS = tuple(TaskSchema.model_fields)
+response_type = TypeAdapter(List[TaskSchema])
+
+
+def make_rows(count: int) -> List[dict]:
+    now = datetime.utcnow()
+    project_id = uuid.uuid4()
+    statuses, priorities = list(TaskStatus), list(TaskPriority)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "title": f"Task {i}",
+            "description": "Imported from the old tracker" if i % 2 else None,
+            "status": statuses[i % len(statuses)],
+            "priority": priorities[i % len(priorities)],
+            "due_date": date.today() + timedelta(days=i % 30) if i % 3 else None,
+            "order": i * 1024,
+            "project_id": project_id,
+            "parent_task_id": None,
+            "created_at": now,
+            "updated_at": None,
+            "completed_at": None,
+            "priority_score": float(i % 97),
+        }
+        for i in range(count)
+    ]
+
+
+def serialize(value) -> bytes:
+    return response_type.dump_json(response_type.validate_python(value, from_attributes=True))
+
+
+def case_orm(rows: List[dict]) -> Callable[[], bytes]:
+    tasks = [Task(**row) for row in rows]
+    return lambda: serialize(tasks)
+
+
+def case_construct(rows: List[dict]) -> Callable[[], bytes]:
+    return lambda: serialize([TaskSchema.model_construct(**row) for row in rows])
+
+
+def case_dicts(rows: List[dict]) -> Callable[[], bytes]:
+    return lambda: serialize(rows)
+
+
+def case_orjson_class(rows: List[dict]) -> Callable[[], bytes]:
+    tasks = [Task(**row) for row in rows]
+
+    def run() -> bytes:
+        value = response_type.validate_python(tasks, from_attributes=True)
+        return ORJSONResponse(response_type.dump_python(value, mode="json")).body
+
+    return run
+
+
+def case_rows(rows: List[dict]) -> Callable[[], bytes]:
+    return lambda: dump_json(rows)
+
+
+CASES = {
+    "orm": case_orm,
+    "construct": case_construct,
+    "dicts": case_dicts,
+    "orjson_class": case_orjson_class,
+    "rows": case_rows,
+}
+
+
+def bench(fn: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} " + " ".join(f"{name:>12}" for name in CASES))
+    for size in args.sizes:
+        rows = make_rows(size)
+        results = [bench(case(rows), args.repeat) for case in CASES.values()]
+        print(f"{size:>8} " + " ".join(f"{ms:>9.1f} ms" for ms in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+# app.core.database builds its engine at import; tests that use a database
+# take the migrated_db fixture's instead
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import redis_config
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def fake_redis(monkeypatch):
+    """
+    An in-process fakeredis as the cache's Redis, with this worker
+    subscribed to invalidations; the L1 tier starts empty.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_config, "redis_client", client)
+    redis_config.local_cache.clear()
+
+    listener = asyncio.create_task(redis_config.listen_for_invalidations(client))
+    while (await client.pubsub_numsub(redis_config.INVALIDATION_CHANNEL))[0][1] == 0:
+        await asyncio.sleep(0.01)
+    yield server
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    redis_config.local_cache.clear()
+
+
+@pytest.fixture(scope="module")
+def migrated_db(tmp_path_factory):
+    """URL of a scratch SQLite database upgraded to the latest migration."""
+    url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    # No ini file, so the migrations leave the test run's logging alone
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+    return url
+
+
+@pytest.fixture
+async def db(migrated_db):
+    """A session on the migrated database; what it commits stays for the module."""
+    engine = create_async_engine(migrated_db)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
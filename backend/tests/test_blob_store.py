@@ -0,0 +1,57 @@
+import io
+import struct
+import zlib
+
+import pytest
+
+from app.utils.blob_store import BlobStore, ImageTooLarge
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png_header(width: int, height: int) -> bytes:
+    """A PNG that declares its dimensions but carries no pixel data."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = struct.pack(">I", zlib.crc32(kind + data))
+        return struct.pack(">I", len(data)) + kind + data + crc
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IEND", b"")
+
+
+def png(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_variants_are_written_once(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.save_bytes(png(300, 200))
+    assert store.make_variants(digest, {"small": 64}, max_pixels=100_000) == ("small",)
+    with Image.open(store.path(digest, "small")) as thumb:
+        assert thumb.size == (64, 43)
+    assert [p.name for p in tmp_path.rglob(".*")] == []
+
+
+def test_image_over_the_pixel_cap_is_refused_before_decoding(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path))
+    digest = store.save_bytes(png(300, 200))
+    monkeypatch.setattr(Image.Image, "load", lambda self: pytest.fail("image was decoded"))
+    with pytest.raises(ImageTooLarge):
+        store.make_variants(digest, {"small": 64}, max_pixels=50_000)
+    assert not store.exists(digest, "small")
+
+
+def test_decompression_bomb_is_refused(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.save_bytes(png_header(20000, 20000))
+    with pytest.raises(ImageTooLarge):
+        store.make_variants(digest, {"small": 64})
+
+
+def test_undecodable_image_has_no_variants(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.save_bytes(b"not an image")
+    assert store.make_variants(digest, {"small": 64}, max_pixels=100_000) == ()
@@ -0,0 +1,151 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.core import redis_config
+from app.core.principal_cache import PrincipalCache
+from app.core.redis_config import (
+    INVALIDATION_CHANNEL,
+    bump_namespace,
+    get_cached_value,
+    get_namespace_versions,
+    invalidate_cache,
+    local_cache,
+    set_cached_value,
+)
+from app.crud.task import task_crud
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.task import TaskCreate
+from app.schemas.user import Principal
+
+pytestmark = pytest.mark.anyio
+
+
+async def eventually(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def test_read_fills_l1(fake_redis):
+    await redis_config.redis_client.set("tasks:1", "payload")
+    assert await get_cached_value("tasks:1") == "payload"
+    assert local_cache.get("tasks:1") == "payload"
+
+
+async def test_invalidation_from_another_worker_drops_l1(fake_redis):
+    await set_cached_value("tasks:1", "payload", 60)
+    assert local_cache.get("tasks:1") == "payload"
+
+    other_worker = redis_config.redis_client.__class__(server=fake_redis, decode_responses=True)
+    await other_worker.publish(INVALIDATION_CHANNEL, "tasks:1")
+
+    await eventually(lambda: local_cache.get("tasks:1") is None)
+
+
+async def test_invalidate_cache_drops_both_tiers(fake_redis):
+    await set_cached_value("tasks:1", "payload", 60)
+    await invalidate_cache("tasks", "1")
+    assert local_cache.get("tasks:1") is None
+    assert await redis_config.redis_client.get("tasks:1") is None
+
+
+async def test_invalidation_during_read_does_not_refill_l1(fake_redis, monkeypatch):
+    await redis_config.redis_client.set("tasks:1", "old")
+    client = redis_config.redis_client
+    get = client.get
+    fetched = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def slow_get(key):
+        value = await get(key)
+        fetched.set()
+        await resume.wait()
+        return value
+
+    monkeypatch.setattr(client, "get", slow_get)
+    reader = asyncio.create_task(get_cached_value("tasks:1"))
+    await fetched.wait()
+    await invalidate_cache("tasks", "1")
+    resume.set()
+
+    assert await reader == "old"
+    assert local_cache.get("tasks:1") is None
+
+
+async def test_bump_namespace_stores_the_new_generation(fake_redis):
+    name = f"project:{uuid.uuid4()}"
+    assert await get_namespace_versions([name]) == [0]
+    await bump_namespace(name)
+    assert local_cache.get(f"ns:{name}") == "1"
+    assert await get_namespace_versions([name]) == [1]
+
+    # Another worker's bump reaches this one's L1 through the broadcast
+    other_worker = redis_config.redis_client.__class__(server=fake_redis, decode_responses=True)
+    version = await other_worker.incr(f"ns:{name}")
+    await other_worker.publish(INVALIDATION_CHANNEL, f"ns:{name}={version}")
+    await eventually(lambda: local_cache.get(f"ns:{name}") == "2")
+    assert await get_namespace_versions([name]) == [2]
+
+
+async def test_bump_during_version_read_does_not_refill_old_generation(fake_redis, monkeypatch):
+    name = f"project:{uuid.uuid4()}"
+    client = redis_config.redis_client
+    mget = client.mget
+    fetched = asyncio.Event()
+    resume = asyncio.Event()
+
+    async def slow_mget(keys):
+        values = await mget(keys)
+        fetched.set()
+        await resume.wait()
+        return values
+
+    monkeypatch.setattr(client, "mget", slow_mget)
+    reader = asyncio.create_task(get_namespace_versions([name]))
+    await fetched.wait()
+    await bump_namespace(name)
+    resume.set()
+
+    assert await reader == [0]
+    assert local_cache.get(f"ns:{name}") == "1"
+
+
+async def test_principal_cache_drops_principal_on_broadcast(fake_redis):
+    cache = PrincipalCache(ttl=60, max_size=10)
+    principal = Principal(id=uuid.uuid4(), email="a@example.com", is_active=True)
+    await cache.set(principal)
+    assert await cache.get(principal.id) == principal
+
+    other_worker = redis_config.redis_client.__class__(server=fake_redis, decode_responses=True)
+    await other_worker.delete(f"principal:{principal.id}")
+    await other_worker.publish(INVALIDATION_CHANNEL, f"principal:{principal.id}")
+
+    await eventually(lambda: cache._local.get(str(principal.id)) is None)
+    assert await cache.get(principal.id) is None
+
+
+async def test_task_write_invalidates_pages_read_under_any_spelling_of_the_id(
+    fake_redis, db
+):
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id, email=f"{owner_id}@example.com", password_hash="x", name="Cache"
+        )
+    )
+    await db.execute(insert(Project).values(id=project_id, name="Cache", owner_id=owner_id))
+    await db.commit()
+    spellings = [project_id, str(project_id), project_id.hex.upper()]
+    for spelling in spellings:
+        assert await task_crud.get_multi_by_project(db, project_id=spelling) == []
+
+    await task_crud.create(db, obj_in=TaskCreate(title="New", project_id=project_id))
+    await db.commit()
+    for spelling in spellings:
+        rows = await task_crud.get_multi_by_project(db, project_id=spelling)
+        assert [row["title"] for row in rows] == ["New"]
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from starlette.requests import Request
+
+from app.utils.conditional import is_not_modified, make_etag, validator_headers
+
+LAST_MODIFIED = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_if_none_match_is_compared_weakly():
+    headers = validator_headers(make_etag("task", 1), LAST_MODIFIED)
+    strong = headers["ETag"][2:]
+    assert is_not_modified(request(if_none_match=f'"other", {strong}'), headers)
+    assert is_not_modified(request(if_none_match="*"), headers)
+    assert not is_not_modified(request(if_none_match='W/"other"'), headers)
+
+
+def test_if_modified_since_is_ignored_when_an_etag_is_sent():
+    headers = validator_headers(make_etag("task", 2), LAST_MODIFIED)
+    # The same second as the client's copy, which may predate a later change
+    assert not is_not_modified(request(if_modified_since=headers["Last-Modified"]), headers)
+    assert not is_not_modified(
+        request(if_none_match='W/"other"', if_modified_since=headers["Last-Modified"]), headers
+    )
+
+
+def test_if_modified_since_without_an_etag():
+    headers = validator_headers(make_etag("task", 3), LAST_MODIFIED)
+    del headers["ETag"]
+    assert is_not_modified(request(if_modified_since="Mon, 01 Jan 2024 12:00:00 GMT"), headers)
+    assert not is_not_modified(request(if_modified_since="Mon, 01 Jan 2024 11:59:59 GMT"), headers)
+    assert not is_not_modified(request(if_modified_since="yesterday"), headers)
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.core.local_cache import LocalCache, SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.local_cache.time.monotonic", lambda: now[0])
+    cache = LocalCache(max_size=10, ttl=30)
+    cache.set("long", 1)
+    cache.set("short", 2, ttl=5)
+    now[0] += 10
+    assert (cache.get("long"), cache.get("short")) == (1, None)
+    now[0] += 30
+    assert cache.get("long") is None
+    assert len(cache) == 0
+
+
+def test_fill_refused_after_delete_of_its_key():
+    cache = LocalCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.delete("a")
+    cache.set("a", "stale", generation=generation)
+    cache.set("b", "fresh", generation=generation)
+    assert (cache.get("a"), cache.get("b")) == (None, "fresh")
+    cache.set("a", "fresh", generation=cache.generation)
+    assert cache.get("a") == "fresh"
+
+
+def test_fill_refused_after_clear_or_forgotten_delete():
+    cache = LocalCache(max_size=1, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+    generation = cache.generation
+    cache.delete("a")
+    # Only max_size deletes are remembered; older fills are refused for any key
+    cache.delete("b")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+
+async def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    tasks = [asyncio.create_task(flight.do("key", loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert sorted(shared for _, shared in results) == [False, True, True]
+    assert {value for value, _ in results} == {"value"}
+    assert len(flight) == 0
+
+
+async def test_single_flight_shares_the_leaders_error():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        raise ValueError("boom")
+
+    tasks = [asyncio.create_task(flight.do("key", loader)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+async def test_single_flight_leader_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    calls = []
+
+    async def loader():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            started.set()
+            await asyncio.Event().wait()
+        return "value"
+
+    leader = asyncio.create_task(flight.do("key", loader))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    # The follower wasn't cancelled itself, so it takes over the call
+    assert await follower == ("value", False)
+    assert leader.cancelled()
+    assert calls == [0, 1]
+    assert len(flight) == 0
+
+
+async def test_single_flight_follower_cancelled():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(flight.do("key", loader))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", loader))
+    await asyncio.sleep(0)
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    release.set()
+    assert await leader == ("value", False)
+    assert len(flight) == 0
@@ -0,0 +1,106 @@
+import base64
+import uuid
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy import delete, insert
+
+from app.crud.task import SORT_KEYS, task_crud
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.utils.pagination import InvalidCursor, encode_cursor, keyset_after, split_page
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_project(db, tasks: int) -> uuid.UUID:
+    """A project whose tasks tie on order and, in pairs, on created_at."""
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id, email=f"{owner_id}@example.com", password_hash="x", name="Pager"
+        )
+    )
+    await db.execute(insert(Project).values(id=project_id, name="Pages", owner_id=owner_id))
+    await db.execute(
+        insert(Task),
+        [
+            {
+                "title": f"Task {n}",
+                "project_id": project_id,
+                "owner_id": owner_id,
+                "order": n % 3,
+                "created_at": datetime(2024, 1, 1, 12, 0, n // 2),
+            }
+            for n in range(tasks)
+        ],
+    )
+    await db.commit()
+    return project_id
+
+
+async def walk(db, project_id, limit):
+    pages, cursor = [], None
+    while True:
+        rows = await task_crud.get_multi_by_project(
+            db, project_id=project_id, limit=limit + 1, cursor=cursor
+        )
+        page, cursor = split_page(rows, limit, SORT_KEYS)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+async def test_pages_cover_every_task_once_in_order(db):
+    project_id = await seed_project(db, 23)
+    pages = await walk(db, project_id, limit=5)
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert len({row["id"] for row in rows}) == 23
+    keys = [tuple(row[key] for key in SORT_KEYS) for row in rows]
+    assert keys == sorted(keys)
+
+
+async def test_next_page_survives_its_anchor_being_deleted(db):
+    project_id = await seed_project(db, 12)
+    rows = await task_crud.get_multi_by_project(db, project_id=project_id, limit=6)
+    first, cursor = split_page(rows, 5, SORT_KEYS)
+    await db.execute(delete(Task).where(Task.id == first[-1]["id"]))
+    await db.commit()
+
+    rows = await task_crud.get_multi_by_project(
+        db, project_id=project_id, limit=6, cursor=cursor
+    )
+    second, _ = split_page(rows, 5, SORT_KEYS)
+    everything = await task_crud.get_multi_by_project(db, project_id=project_id, limit=100)
+    assert [row["id"] for row in second] == [row["id"] for row in everything[4:9]]
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage",
+        raw_cursor({"after": str(uuid.uuid4())}),
+        raw_cursor({"after": [1, "2024-01-01T00:00:00"]}),
+        raw_cursor({"after": [1, "not a date", str(uuid.uuid4())]}),
+        raw_cursor({"after": [None, "2024-01-01T00:00:00", str(uuid.uuid4())]}),
+    ],
+)
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        keyset_after(Task, SORT_KEYS, cursor)
+
+
+def test_cursor_round_trips_the_last_row():
+    task_id = uuid.uuid4()
+    rows = [{"order": 1, "created_at": datetime(2024, 1, 1), "id": task_id}] * 3
+    page, cursor = split_page(rows, 2, SORT_KEYS)
+    assert len(page) == 2
+    assert cursor == encode_cursor([1, datetime(2024, 1, 1), task_id])
+    keyset_after(Task, SORT_KEYS, cursor)
@@ -0,0 +1,66 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.jobs import priority_scores
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.user import User
+from app.utils.priority import calculate_priority_score
+
+pytestmark = pytest.mark.anyio
+
+CREATED = datetime(2024, 1, 1, 9, 0, 0)
+NOW = CREATED + timedelta(days=10)
+
+
+@pytest.fixture
+async def tasks(db, monkeypatch):
+    """Open tasks with stale scores, one of them with no priority."""
+    monkeypatch.setattr(
+        priority_scores, "AsyncSessionLocal", async_sessionmaker(db.bind, expire_on_commit=False)
+    )
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id, email=f"{owner_id}@example.com", password_hash="x", name="Scores"
+        )
+    )
+    await db.execute(insert(Project).values(id=project_id, name="Scores", owner_id=owner_id))
+    rows = {
+        "no priority": {"priority": None, "due_date": None},
+        "overdue": {"priority": TaskPriority.HIGH, "due_date": date(2024, 1, 8)},
+    }
+    ids = {}
+    for title, values in rows.items():
+        ids[title] = uuid.uuid4()
+        await db.execute(
+            insert(Task).values(
+                id=ids[title],
+                title=title,
+                project_id=project_id,
+                owner_id=owner_id,
+                status=TaskStatus.TODO,
+                created_at=CREATED,
+                priority_score=0,
+                **values,
+            )
+        )
+    await db.commit()
+    return ids, rows
+
+
+async def test_recompute_rescores_every_open_task(db, tasks):
+    ids, rows = tasks
+    await priority_scores.recompute_priority_scores(now=NOW)
+
+    for title, task_id in ids.items():
+        score = await db.scalar(select(Task.priority_score).where(Task.id == task_id))
+        expected = calculate_priority_score(
+            rows[title]["priority"], rows[title]["due_date"], CREATED, now=NOW
+        )
+        assert score == pytest.approx(expected), title
+        assert score > 0
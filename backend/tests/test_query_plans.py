@@ -0,0 +1,154 @@
+"""
+The hot-path queries, as the app builds them, against their indexes.
+
+Each test runs the real CRUD or service call on a migrated SQLite
+database, records the SELECTs it issues and asks SQLite for their plans.
+"""
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.crud.project import project_crud
+from app.crud.task import task_crud
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.services.dashboard import build_dashboard
+from app.services.prioritization import get_prioritized_tasks
+from app.utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+FULL_SCAN = re.compile(r"\bSCAN (tasks|projects)\b")
+
+
+@contextmanager
+def recorded_selects(db):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+async def plans(db, call) -> list:
+    """The EXPLAIN QUERY PLAN of every SELECT ``call()`` issues, one string each."""
+    with recorded_selects(db) as statements:
+        await call()
+    connection = await db.connection()
+    result = []
+    for statement, parameters in statements:
+        rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        result.append("\n".join(row[3] for row in rows))
+    return result
+
+
+@pytest.fixture
+async def owner(db):
+    """An owner with one project holding open, done and nested tasks."""
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id, email=f"{owner_id}@example.com", password_hash="x", name="Plans"
+        )
+    )
+    await db.execute(insert(Project).values(id=project_id, name="Plans", owner_id=owner_id))
+    parent_id = uuid.uuid4()
+    await db.execute(
+        insert(Task),
+        [
+            {
+                "id": parent_id if n == 0 else uuid.uuid4(),
+                "title": f"Task {n}",
+                "project_id": project_id,
+                "owner_id": owner_id,
+                "parent_task_id": parent_id if n % 5 == 1 else None,
+                "status": list(TaskStatus)[n % 3],
+                "order": n,
+                "due_date": date(2024, 1, 1 + n % 28),
+            }
+            for n in range(30)
+        ],
+    )
+    await db.commit()
+    return owner_id, project_id
+
+
+def only_plan(found: list) -> str:
+    assert len(found) == 1, found
+    return found[0]
+
+
+async def test_project_task_page_seeks_the_listing_index(db, owner):
+    _, project_id = owner
+    cursor = encode_cursor([3, datetime(2024, 1, 1), uuid.uuid4()])
+    plan = only_plan(
+        await plans(
+            db,
+            lambda: task_crud.get_multi_by_project(
+                db, project_id=project_id, limit=10, cursor=cursor
+            ),
+        )
+    )
+    assert "USING INDEX ix_tasks_project_order (project_id=? AND (order,created_at,id)>" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_project_page_seeks_the_owner_index(db, owner):
+    owner_id, _ = owner
+    cursor = encode_cursor([datetime(2024, 1, 1), uuid.uuid4()])
+    plan = only_plan(
+        await plans(
+            db,
+            lambda: project_crud.get_multi_by_owner(db, owner_id=owner_id, limit=10, cursor=cursor),
+        )
+    )
+    assert "USING INDEX ix_projects_owner_created (owner_id=? AND (created_at,id)>" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_prioritized_tasks_read_the_partial_index(db, owner):
+    owner_id, _ = owner
+    plan = only_plan(await plans(db, lambda: get_prioritized_tasks(db, owner_id=owner_id)))
+    assert "USING INDEX ix_tasks_owner_open_priority (owner_id=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_dashboard_upcoming_tasks_are_one_index_range(db, owner):
+    owner_id, _ = owner
+    found = await plans(db, lambda: build_dashboard(db, owner_id=owner_id, today=date(2024, 1, 10)))
+    upcoming = [plan for plan in found if "ix_tasks_owner_open_due" in plan]
+    assert len(upcoming) == 1, found
+    assert "(owner_id=? AND due_date>? AND due_date<?)" in upcoming[0]
+    assert "TEMP B-TREE" not in upcoming[0]
+    assert not [plan for plan in found if FULL_SCAN.search(plan)], found
+
+
+async def test_task_counts_use_the_board_index(db, owner):
+    owner_id, _ = owner
+    plan = only_plan(
+        await plans(db, lambda: project_crud.get_projects_with_task_counts(db, owner_id=owner_id))
+    )
+    assert "COVERING INDEX ix_tasks_project_status_order (project_id=? AND status=?)" in plan
+    assert not FULL_SCAN.search(plan)
+
+
+async def test_hierarchy_follows_the_parent_index(db, owner):
+    _, project_id = owner
+    plan = only_plan(
+        await plans(db, lambda: task_crud.get_tasks_with_subtasks(db, project_id=project_id))
+    )
+    recursive_step = plan.split("RECURSIVE STEP", 1)[1]
+    assert "USING INDEX ix_tasks_parent_task_id (parent_task_id=?)" in recursive_step
+    assert not FULL_SCAN.search(plan)
@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.project import project_crud
+from app.crud.search import search_crud
+from app.crud.task import task_crud
+from app.models.user import User
+from app.schemas.project import ProjectCreate
+from app.schemas.task import TaskCreate
+
+pytestmark = pytest.mark.anyio
+
+
+def word() -> str:
+    """A term no other test's documents contain."""
+    return f"term{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+async def owners(db):
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    await db.execute(
+        insert(User),
+        [
+            {"id": user_id, "email": f"{user_id}@example.com", "password_hash": "x", "name": "S"}
+            for user_id in ids
+        ],
+    )
+    await db.commit()
+    return ids
+
+
+@pytest.fixture
+async def project(db, owners):
+    """A project of the first owner, named with a word of its own."""
+    name = word()
+    project = await project_crud.create_with_owner(
+        db, obj_in=ProjectCreate(name=f"Project {name}"), owner_id=owners[0]
+    )
+    return project, name
+
+
+async def found(db, owner_id, q):
+    results = await search_crud.search(db, owner_id=owner_id, q=q)
+    return [(result.kind, result.id) for result in results]
+
+
+async def test_results_are_limited_to_the_owner(db, owners, project):
+    owner_id, other_id = owners
+    project, name = project
+    task = await task_crud.create(
+        db, obj_in=TaskCreate(title=f"Task {name}", project_id=project.id)
+    )
+
+    assert sorted(await found(db, owner_id, name)) == sorted(
+        [("project", project.id), ("task", task.id)]
+    )
+    assert await found(db, other_id, name) == []
+
+
+async def test_renamed_task_stops_matching_its_old_title(db, owners, project):
+    owner_id = owners[0]
+    project, _ = project
+    old, new = word(), word()
+    task = await task_crud.create(db, obj_in=TaskCreate(title=old, project_id=project.id))
+    assert await found(db, owner_id, old) == [("task", task.id)]
+
+    row = await task_crud.get_with_owner(db, id=task.id)
+    await task_crud.update_owned(db, task=row, owner_id=owner_id, obj_in={"title": new})
+    assert await found(db, owner_id, old) == []
+    assert await found(db, owner_id, new) == [("task", task.id)]
+
+
+async def test_removed_task_stops_matching(db, owners, project):
+    owner_id = owners[0]
+    project, _ = project
+    title = word()
+    task = await task_crud.create(db, obj_in=TaskCreate(title=title, project_id=project.id))
+    assert await found(db, owner_id, title) == [("task", task.id)]
+
+    await task_crud.remove_owned(db, id=task.id, owner_id=owner_id)
+    assert await found(db, owner_id, title) == []
+
+
+async def test_removed_project_takes_its_tasks_out_of_the_index(db, owners, project):
+    owner_id = owners[0]
+    project, name = project
+    task_word = word()
+    await task_crud.create(db, obj_in=TaskCreate(title=task_word, project_id=project.id))
+    assert len(await found(db, owner_id, name)) == 1
+    assert len(await found(db, owner_id, task_word)) == 1
+
+    await project_crud.remove(db, id=project.id)
+    assert await found(db, owner_id, name) == []
+    assert await found(db, owner_id, task_word) == []
@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.crud.task import NeighbourNotInColumn, task_crud
+from app.crud.versions import versions_crud
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskUpdate
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def projects(db):
+    """Two projects of one owner and one of someone else's."""
+    owner_id, other_id = uuid.uuid4(), uuid.uuid4()
+    ids = [uuid.uuid4() for _ in range(3)]
+    await db.execute(
+        insert(User),
+        [
+            {"id": user_id, "email": f"{user_id}@example.com", "password_hash": "x", "name": "C"}
+            for user_id in (owner_id, other_id)
+        ],
+    )
+    await db.execute(
+        insert(Project),
+        [
+            {"id": ids[0], "name": "Mine", "owner_id": owner_id},
+            {"id": ids[1], "name": "Also mine", "owner_id": owner_id},
+            {"id": ids[2], "name": "Theirs", "owner_id": other_id},
+        ],
+    )
+    await db.commit()
+    return ids
+
+
+async def test_update_goes_through_update_owned(db, projects):
+    mine, also_mine, theirs = projects
+    task = await task_crud.create(db, obj_in=TaskCreate(title="Old", project_id=mine))
+    version = (await versions_crud.get_project(db, project_id=mine)).version
+
+    row = await task_crud.update(
+        db, db_obj=task, obj_in=TaskUpdate(title="New", status=TaskStatus.DONE)
+    )
+    assert (row["title"], row["status"]) == ("New", TaskStatus.DONE)
+    assert row["completed_at"] is not None
+    assert (await versions_crud.get_project(db, project_id=mine)).version > version
+
+    assert await task_crud.update(db, db_obj=task, obj_in={"project_id": theirs}) is None
+    row = await task_crud.update(db, db_obj=task, obj_in={"project_id": also_mine})
+    assert row["project_id"] == also_mine
+
+
+async def test_remove_goes_through_remove_owned(db, projects):
+    mine = projects[0]
+    parent = await task_crud.create(db, obj_in=TaskCreate(title="Parent", project_id=mine))
+    child = await task_crud.create(
+        db, obj_in=TaskCreate(title="Child", project_id=mine, parent_task_id=parent.id)
+    )
+
+    assert (await task_crud.remove(db, id=parent.id))["id"] == parent.id
+    assert await task_crud.remove(db, id=parent.id) is None
+    assert await db.scalar(select(Task.parent_task_id).where(Task.id == child.id)) is None
+
+
+async def test_move_refuses_a_neighbour_outside_the_column(db, projects):
+    mine = projects[0]
+    done = [
+        await task_crud.create(
+            db,
+            obj_in=TaskCreate(
+                title=f"Done {n}", project_id=mine, status=TaskStatus.DONE, order=1024 * n
+            ),
+        )
+        for n in (1, 2)
+    ]
+    todo = await task_crud.create(db, obj_in=TaskCreate(title="Todo", project_id=mine))
+    card = await task_crud.create(db, obj_in=TaskCreate(title="Card", project_id=mine))
+    row = await task_crud.get_with_owner(db, id=card.id)
+    owner_id = row["owner_id"]
+
+    for after, before in [
+        (done[0].id, todo.id),  # another column
+        (uuid.uuid4(), None),  # gone
+        (card.id, None),  # itself
+        (done[0].id, done[0].id),
+    ]:
+        with pytest.raises(NeighbourNotInColumn):
+            await task_crud.move(
+                db,
+                task=row,
+                owner_id=owner_id,
+                status=TaskStatus.DONE,
+                after_task_id=after,
+                before_task_id=before,
+            )
+
+    moved = await task_crud.move(
+        db,
+        task=row,
+        owner_id=owner_id,
+        status=TaskStatus.DONE,
+        after_task_id=done[0].id,
+        before_task_id=done[1].id,
+    )
+    assert (moved["status"], moved["order"]) == (TaskStatus.DONE, 1536)
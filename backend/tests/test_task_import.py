@@ -0,0 +1,63 @@
+import io
+import uuid
+
+import orjson
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.crud.task import task_crud
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_import import TaskImporter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def project(db):
+    owner_id, project_id = uuid.uuid4(), uuid.uuid4()
+    await db.execute(
+        insert(User).values(
+            id=owner_id, email=f"{owner_id}@example.com", password_hash="x", name="Importer"
+        )
+    )
+    await db.execute(insert(Project).values(id=project_id, name="Import", owner_id=owner_id))
+    await db.commit()
+    return owner_id, project_id
+
+
+def ndjson(*records) -> io.BytesIO:
+    return io.BytesIO(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+
+async def test_failed_chunk_is_reported_over_its_own_rows(db, project, monkeypatch):
+    owner_id, project_id = project
+    create_many = task_crud.create_many
+    calls = []
+
+    async def fail_first_chunk(*args, **kwargs):
+        calls.append(kwargs["tasks"])
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("disk I/O error"))
+        return await create_many(*args, **kwargs)
+
+    monkeypatch.setattr(task_crud, "create_many", fail_first_chunk)
+    stream = ndjson(
+        {"title": "Elsewhere", "project_id": str(uuid.uuid4())},
+        {"title": "First"},
+        {"title": "Second"},
+        {"title": "Third"},
+        {"title": "Fourth"},
+    )
+    importer = TaskImporter(db, owner_id=owner_id, default_project_id=project_id, chunk_size=4)
+    result = await importer.run(stream, "ndjson")
+
+    assert (result.created, result.failed) == (1, 4)
+    missing, chunk = result.errors
+    assert (missing.row, missing.last_row, missing.errors) == (1, None, ["Project not found"])
+    assert (chunk.row, chunk.last_row) == (2, 4)
+    assert chunk.errors == ["Database error: none of the 3 valid rows on lines 2-4 were imported"]
+    titles = (await db.execute(select(Task.title).where(Task.project_id == project_id))).scalars()
+    assert list(titles) == ["Fourth"]
@@ -307,23 +307,26 @@ export default function ProjectTasksPage() {
 		// Update task on server
 		try {
 			const token = Cookies.get("token");
-			const overItems = tasks[overContainer];
-			const overIndex = overItems.findIndex((item) => item.id === overId);
-
-			let newIndex: number;
-			if (overId in tasks) {
-				// We're at the root droppable of a container
-				newIndex = overItems.length;
-			} else {
-				// We're directly over another item
-				newIndex = overIndex >= 0 ? overIndex : overItems.length;
+			let column = tasks[overContainer];
+			if (activeContainer === overContainer) {
+				const activeIndex = column.findIndex((item) => item.id === activeId);
+				const overIndex = column.findIndex((item) => item.id === overId);
+				if (activeIndex >= 0 && overIndex >= 0 && activeIndex !== overIndex) {
+					column = arrayMove(column, activeIndex, overIndex);
+				}
 			}
 
-			await axios.put(
-				`${process.env.NEXT_PUBLIC_API_URL}/tasks/${activeId}`,
+			// Send only the new neighbours; the server ranks the task between them
+			const position = column.findIndex((item) => item.id === activeId);
+			await axios.post(
+				`${process.env.NEXT_PUBLIC_API_URL}/tasks/${activeId}/move`,
 				{
 					status: overContainer,
-					order: newIndex,
+					after_task_id: position > 0 ? column[position - 1].id : null,
+					before_task_id:
+						position >= 0 && position < column.length - 1
+							? column[position + 1].id
+							: null,
 				},
 				{
 					headers: {
@@ -331,22 +334,6 @@ export default function ProjectTasksPage() {
 					},
 				}
 			);
-
-			// Update all task orders in the affected columns
-			const updatedTasks = { ...tasks };
-			updatedTasks[overContainer].forEach(async (task, index) => {
-				await axios.put(
-					`${process.env.NEXT_PUBLIC_API_URL}/tasks/${task.id}`,
-					{
-						order: index,
-					},
-					{
-						headers: {
-							Authorization: `Bearer ${token}`,
-						},
-					}
-				);
-			});
 		} catch (error) {
 			console.error("Failed to update task status:", error);
 			toast("Failed to update task status. Please try again.");